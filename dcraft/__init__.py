@@ -1,12 +1,25 @@
 from dcraft.domain.layer.raw import RawLayerData
 from dcraft.domain.layer.refined import RefinedLayerData
 from dcraft.domain.layer.trusted import TrustedLayerData
-from dcraft.domain.loader import read_layer_data
+from dcraft.domain.loader import (
+    read_layer_data,
+    read_layer_data_async,
+    read_layer_data_iter,
+    read_layer_data_many,
+    save_many,
+)
 from dcraft.domain.loader.raw import create_raw
 from dcraft.domain.loader.refined import create_refined
 from dcraft.domain.loader.trusted import create_trusted
-from dcraft.interface.data.local import LocalDataRepository
-from dcraft.interface.metadata.local import LocalMetadataRepository
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.data.cache import CachedDataRepository
+from dcraft.interface.data.local import AsyncLocalDataRepository, LocalDataRepository
+from dcraft.interface.metadata.cache import CachedMetadataRepository
+from dcraft.interface.metadata.local import (
+    AsyncLocalMetadataRepository,
+    LocalMetadataRepository,
+)
+from dcraft.interface.metadata.sqlite import SqliteMetadataRepository
 
 try:
     from dcraft.interface.data.gcs import GcsDataRepository
@@ -24,18 +37,40 @@ try:
 except ImportError:
     pass
 
+try:
+    from dcraft.interface.data.async_gcs import AsyncGcsDataRepository
+except ImportError:
+    pass
+
+try:
+    from dcraft.interface.data.async_minio import AsyncMinioRepository
+except ImportError:
+    pass
+
 __all__ = [
     "RawLayerData",
     "TrustedLayerData",
     "RefinedLayerData",
     "read_layer_data",
+    "read_layer_data_async",
+    "read_layer_data_iter",
+    "read_layer_data_many",
+    "save_many",
     "create_raw",
     "create_trusted",
     "create_refined",
+    "ContentType",
     "LocalDataRepository",
+    "CachedDataRepository",
     "LocalMetadataRepository",
+    "CachedMetadataRepository",
+    "SqliteMetadataRepository",
     "GcsDataRepository",
     "BqMetadataRepository",
     "MongoMetadataRepository",
     "MinioRepository",
+    "AsyncLocalDataRepository",
+    "AsyncLocalMetadataRepository",
+    "AsyncGcsDataRepository",
+    "AsyncMinioRepository",
 ]
@@ -12,3 +12,11 @@ class ContentExtensionMismatch(Exception):
 
 class NoMetadataFound(Exception):
     pass
+
+
+class MetadataSaveFailed(Exception):
+    pass
+
+
+class NotCoveredCompression(Exception):
+    pass
@@ -1,14 +1,30 @@
+import itertools
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional, Union
 from uuid import uuid4
 
 import pandas as pd
+import pyarrow as pa
 
-from dcraft.domain.error import NotCoveredContentType, NotCoveredFormat
+from dcraft.domain.error import (
+    NotCoveredCompression,
+    NotCoveredContentType,
+    NotCoveredFormat,
+)
+from dcraft.domain.layer.lazy import LazyContent
 from dcraft.domain.metadata import Metadata
-from dcraft.domain.type.content import CoveredContentType
-from dcraft.domain.type.enum import ContentType
+from dcraft.domain.type.content import (
+    CoveredContentType,
+    DataFrameStream,
+    is_polars_dataframe,
+)
+from dcraft.domain.type.enum import (
+    TABULAR_CONTENT_TYPES,
+    Compression,
+    ContentType,
+    Extension,
+)
 from dcraft.interface.data.base import DataRepository
 from dcraft.interface.metadata.base import MetadataRepository
 
@@ -18,13 +34,30 @@ class BaseLayerData(ABC):
         self,
         id: Optional[str],
         project_name: str,
-        content: CoveredContentType,
+        content: Union[CoveredContentType, DataFrameStream, LazyContent],
         author: Optional[str],
         created_at: datetime,
         description: Optional[str],
         extra_info: Optional[dict],
+        content_type: Optional[ContentType] = None,
+        validation_sample_size: Optional[int] = None,
     ):
-        self._get_content_type(content)
+        if validation_sample_size is not None and validation_sample_size < 1:
+            raise ValueError("validation_sample_size must be positive.")
+        if isinstance(content, Iterator) and not isinstance(
+            content, pa.RecordBatchReader
+        ):
+            content = self._peek_dataframes(content)
+        # The content type is determined once, as checking a list of dicts takes a pass over the list.
+        if isinstance(content, LazyContent):
+            if content_type is None:
+                raise ValueError("The content type of a lazy content must be given.")
+            self._content_type = content_type
+        elif content_type is None:
+            self._content_type = self._get_content_type(content, validation_sample_size)
+        else:
+            self._validate_content_type(content, content_type)
+            self._content_type = content_type
         self._id = id
         self._project_name = project_name
         self._content = content
@@ -35,11 +68,17 @@ class BaseLayerData(ABC):
 
     @property
     def content(self) -> Any:
+        if isinstance(self._content, LazyContent):
+            self._content = self._content.get()
         return self._content
 
+    @property
+    def is_content_loaded(self) -> bool:
+        return not isinstance(self._content, LazyContent) or self._content.is_loaded
+
     @property
     def content_type(self) -> ContentType:
-        return self._get_content_type(self._content)
+        return self._content_type
 
     @property
     def id(self) -> Optional[str]:
@@ -51,6 +90,8 @@ class BaseLayerData(ABC):
         format: str,
         data_repository: DataRepository,
         metadata_repository: MetadataRepository,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
     ):
         """Save the content in the specified format using the provided data repository.
 
@@ -58,38 +99,176 @@ class BaseLayerData(ABC):
             format (str): The format in which the content will be saved.
             data_repository (DataRepository): The data repository where the content will be saved.
             metadata_repository (MetadataRepository): The metadata repository where the metadata will be saved.
+            compression (str, optional): The compression codec, e.g. "zstd". Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
 
         Returns:
             None
         """
         pass
 
-    def _validate_format(self, content: Any, format: str):
-        content_type = self._get_content_type(content)
-        if content_type == ContentType.DF:
-            if format not in ["csv", "parquet"]:
+    def save_content(
+        self,
+        format: str,
+        data_repository: DataRepository,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> Metadata:
+        """Save only the content, under a new ID, and return its metadata without saving it.
+
+        The id of the object is not changed until mark_saved is called with the metadata,
+        so a failure before the metadata is saved leaves the object as it was.
+
+        Args:
+            format (str): The format in which the content will be saved.
+            data_repository (DataRepository): The data repository where the content will be saved.
+            compression (str, optional): The compression codec, e.g. "zstd". Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+        Returns:
+            Metadata: The metadata of the saved content, to be saved to a metadata repository.
+        """
+        self._validate_format(format)
+        self._validate_compression(format, compression)
+        id = self._generate_id()
+        metadata = self._compose_metadata(id, format, compression)
+        if self._is_stream(self.content):
+            data_repository.save_iter(
+                self.content,
+                metadata.project_name,
+                metadata.layer,
+                id,
+                format,
+                compression,
+                compression_level,
+            )
+        else:
+            data_repository.save(
+                self.content,
+                metadata.project_name,
+                metadata.layer,
+                id,
+                format,
+                metadata.content_type,
+                compression,
+                compression_level,
+            )
+        return metadata
+
+    def mark_saved(self, metadata: Metadata):
+        """Update the id of the object once the metadata returned by save_content is saved.
+
+        Args:
+            metadata (Metadata): The saved metadata.
+
+        Returns:
+            None
+        """
+        self._update_id(metadata.id)
+
+    def _validate_format(self, format: str):
+        content_type = self._content_type
+        if content_type in TABULAR_CONTENT_TYPES:
+            if format not in [
+                Extension.CSV.value,
+                Extension.PARQUET.value,
+                Extension.FEATHER.value,
+                Extension.ARROW.value,
+            ]:
                 raise NotCoveredFormat("This format is not covered.")
-        elif content_type in [ContentType.DICT, ContentType.DICT_LIST]:
-            if format not in ["json"]:
+        elif content_type == ContentType.DICT:
+            if format not in [Extension.JSON.value]:
+                raise NotCoveredFormat("This format is not covered.")
+        elif content_type == ContentType.DICT_LIST:
+            if format not in [Extension.JSON.value, Extension.JSONL.value]:
                 raise NotCoveredFormat("This format is not covered.")
 
+    @staticmethod
+    def _validate_compression(format: str, compression: Optional[str]):
+        if compression is None:
+            return
+        if format in [Extension.PARQUET.value]:
+            compressions = [
+                Compression.SNAPPY,
+                Compression.GZIP,
+                Compression.BROTLI,
+                Compression.LZ4,
+                Compression.ZSTD,
+            ]
+        elif format in [Extension.FEATHER.value, Extension.ARROW.value]:
+            compressions = [Compression.LZ4, Compression.ZSTD]
+        else:
+            compressions = [Compression.GZIP, Compression.LZ4, Compression.ZSTD]
+        if compression not in [c.value for c in compressions]:
+            raise NotCoveredCompression("This compression is not covered.")
+
     @abstractmethod
-    def _compose_metadata(self, id: str, format: str) -> Metadata:
+    def _compose_metadata(
+        self, id: str, format: str, compression: Optional[str] = None
+    ) -> Metadata:
         pass
 
     @staticmethod
-    def _get_content_type(content: Any) -> ContentType:
-        if isinstance(content, pd.DataFrame):
+    def _get_content_type(
+        content: Any, validation_sample_size: Optional[int] = None
+    ) -> ContentType:
+        if isinstance(content, pd.DataFrame) or BaseLayerData._is_stream(content):
             return ContentType.DF
+        elif isinstance(content, pa.Table):
+            return ContentType.ARROW_TABLE
+        elif is_polars_dataframe(content):
+            return ContentType.POLARS_DF
         elif isinstance(content, dict):
             return ContentType.DICT
         elif isinstance(content, list) and all(
-            [isinstance(item, dict) for item in content]
+            isinstance(item, dict)
+            for item in BaseLayerData._sample(content, validation_sample_size)
         ):
             return ContentType.DICT_LIST
         else:
             raise NotCoveredContentType("This content type is not covered.")
 
+    @staticmethod
+    def _sample(content: list, sample_size: Optional[int]) -> Iterable[Any]:
+        if sample_size is None or len(content) <= sample_size:
+            return content
+        # Evenly spaced items, so a wrong item at the head or the tail is still likely to be found.
+        step = (len(content) - 1) / max(sample_size - 1, 1)
+        return (content[round(i * step)] for i in range(sample_size))
+
+    @staticmethod
+    def _validate_content_type(content: Any, content_type: ContentType):
+        # Only the container is checked, so a given content type costs no pass over the content.
+        if content_type == ContentType.DF:
+            is_valid = isinstance(content, pd.DataFrame) or BaseLayerData._is_stream(
+                content
+            )
+        elif content_type == ContentType.ARROW_TABLE:
+            is_valid = isinstance(content, pa.Table)
+        elif content_type == ContentType.POLARS_DF:
+            is_valid = is_polars_dataframe(content)
+        elif content_type == ContentType.DICT:
+            is_valid = isinstance(content, dict)
+        else:
+            is_valid = isinstance(content, list)
+        if not is_valid:
+            raise NotCoveredContentType("The content doesn't match the content type.")
+
+    @staticmethod
+    def _peek_dataframes(content: Iterator[Any]) -> Iterator[pd.DataFrame]:
+        # The first item is checked and chained back, so an iterator of anything else than DataFrames
+        # is rejected here rather than failing in the middle of a save.
+        first = next(content, None)
+        if first is None:
+            return iter([])
+        if not isinstance(first, pd.DataFrame):
+            raise NotCoveredContentType("Only an iterator of DataFrames is covered.")
+        return itertools.chain([first], content)
+
+    @staticmethod
+    def _is_stream(content: Any) -> bool:
+        return isinstance(content, (Iterator, pa.RecordBatchReader))
+
     @staticmethod
     def _generate_id() -> str:
         return str(uuid4())
@@ -0,0 +1,46 @@
+import threading
+from typing import Callable, Optional
+
+from dcraft.domain.type.content import CoveredContentType
+
+
+class LazyContent:
+    def __init__(self, load: Callable[[], CoveredContentType], prefetch: bool = False):
+        """Initializes a new instance of the class.
+
+        The content is loaded on the first access, only once, and kept afterwards.
+
+        Args:
+            load (Callable[[], CoveredContentType]): The function loading the content.
+            prefetch (bool, optional): Whether the content starts loading in a background thread right away.
+                Defaults to False.
+        """
+        self._load = load
+        self._content: Optional[CoveredContentType] = None
+        self._is_loaded = False
+        self._lock = threading.Lock()
+        if prefetch:
+            threading.Thread(target=self._prefetch, daemon=True).start()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._is_loaded
+
+    def get(self) -> CoveredContentType:
+        """Get the content, loading it if it is not loaded yet. A running prefetch is waited for.
+
+        Returns:
+            CoveredContentType: The content.
+        """
+        with self._lock:
+            if not self._is_loaded:
+                self._content = self._load()
+                self._is_loaded = True
+            return self._content
+
+    def _prefetch(self):
+        try:
+            self.get()
+        except Exception:
+            # The load is tried again and the exception raised on the access.
+            pass
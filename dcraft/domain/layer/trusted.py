@@ -1,9 +1,11 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from dcraft.domain.layer.base import BaseLayerData
+from dcraft.domain.layer.lazy import LazyContent
 from dcraft.domain.metadata import Metadata
-from dcraft.domain.type.content import CoveredContentType
+from dcraft.domain.type.content import CoveredContentType, DataFrameStream
+from dcraft.domain.type.enum import ContentType
 from dcraft.interface.data.base import DataRepository
 from dcraft.interface.metadata.base import MetadataRepository
 
@@ -17,12 +19,13 @@ class TrustedLayerData(BaseLayerData):
     Attributes:
         id (str, optional): Unique id for the data and metadata
         project_name (str): Name of the project
-        content (CoveredContentType): Content of the data
+        content (Union[CoveredContentType, DataFrameStream]): Content of the data, loaded on the first access if lazy
         author (str, optional): Author of the data
         created_at (datetime): Created at
         description (str, optional): Description of the data
         extra_info (dict, optional): Extra information of the data
         source_ids (List[str], optional): List of source ids
+        content_type (ContentType): Type of the content, determined once on creation
 
     """
 
@@ -30,12 +33,14 @@ class TrustedLayerData(BaseLayerData):
         self,
         id: Optional[str],
         project_name: str,
-        content: CoveredContentType,
+        content: Union[CoveredContentType, DataFrameStream, LazyContent],
         author: Optional[str],
         created_at: datetime,
         description: Optional[str],
         extra_info: Optional[dict],
         source_ids: Optional[List[str]],
+        content_type: Optional[ContentType] = None,
+        validation_sample_size: Optional[int] = None,
     ):
         super().__init__(
             id=id,
@@ -45,21 +50,26 @@ class TrustedLayerData(BaseLayerData):
             created_at=created_at,
             description=description,
             extra_info=extra_info,
+            content_type=content_type,
+            validation_sample_size=validation_sample_size,
         )
         self._source_ids = source_ids
 
-    def _compose_metadata(self, id: str, format: str) -> Metadata:
+    def _compose_metadata(
+        self, id: str, format: str, compression: Optional[str] = None
+    ) -> Metadata:
         return Metadata(
             id=id,
             project_name=self._project_name,
             layer="trusted",
-            content_type=self._get_content_type(self._content),
+            content_type=self._content_type,
             author=self._author,
             created_at=self._created_at,
             description=self._description,
             extra_info=self._extra_info,
             source_ids=self._source_ids,
             format=format,
+            compression=compression,
         )
 
     def save(
@@ -67,6 +77,8 @@ class TrustedLayerData(BaseLayerData):
         format: str,
         data_repository: DataRepository,
         metadata_repository: MetadataRepository,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
     ):
         """Save the content of the object to the data repository and metadata repository.
         On the timing of saving, the id of the object will be updated.
@@ -75,19 +87,13 @@ class TrustedLayerData(BaseLayerData):
             format (str): The format in which the content should be saved.
             data_repository (DataRepository): The data repository where the content should be saved.
             metadata_repository (MetadataRepository): The metadata repository where the metadata should be saved.
+            compression (str, optional): The compression codec, e.g. "zstd". Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
         Returns:
             None
         """
-        self._validate_format(self._content, format)
-        id = self._generate_id()
-        self._update_id(id)
-        data_repository.save(
-            self.content,
-            self._project_name,
-            "trusted",
-            id,
-            format,
-            self._get_content_type(self._content),
+        metadata = self.save_content(
+            format, data_repository, compression, compression_level
         )
-        metadata = self._compose_metadata(id, format)
         metadata_repository.save(metadata)
+        self.mark_saved(metadata)
@@ -1,37 +1,341 @@
-from typing import Union
+import threading
+from concurrent.futures import (
+    FIRST_EXCEPTION,
+    CancelledError,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Iterator, List, Optional, Union
 
+import pandas as pd
+
+from dcraft.domain.error import NoMetadataFound, NotCoveredContentType
+from dcraft.domain.layer.lazy import LazyContent
 from dcraft.domain.layer.raw import RawLayerData
 from dcraft.domain.layer.refined import RefinedLayerData
 from dcraft.domain.layer.trusted import TrustedLayerData
-from dcraft.interface.data.base import DataRepository
-from dcraft.interface.metadata.base import MetadataRepository
+from dcraft.domain.metadata import Metadata
+from dcraft.domain.type.content import CoveredContentType, Filters
+from dcraft.domain.type.enum import TABULAR_CONTENT_TYPES, ContentType
+from dcraft.interface.data.base import AsyncDataRepository, DataRepository
+from dcraft.interface.data.query import DEFAULT_BATCH_SIZE
+from dcraft.interface.metadata.base import (
+    AsyncMetadataRepository,
+    MetadataRepository,
+)
 
 
 def read_layer_data(
-    id: str, data_repository: DataRepository, metadata_repository: MetadataRepository
+    id: str,
+    data_repository: DataRepository,
+    metadata_repository: MetadataRepository,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None,
+    content_type: Optional[ContentType] = None,
+    lazy: bool = False,
+    prefetch: bool = False,
 ) -> Union[RawLayerData, TrustedLayerData, RefinedLayerData]:
+    """Read the layer data for the ID.
+
+    For DataFrame content, the columns and the row filters are pushed down to the data repository,
+    so only the needed part of the content is read.
+    In the lazy mode only the metadata is read here, and the content is read on the first access of
+    .content, so inspecting the lineage or the description doesn't download the content.
+
+    Args:
+        id (str): The ID of the layer data to read.
+        data_repository (DataRepository): The data repository where the content is saved.
+        metadata_repository (MetadataRepository): The metadata repository where the metadata is saved.
+        columns (List[str], optional): The columns to read. Defaults to None, all the columns.
+        filters (Filters, optional): The row filters in the pyarrow form, e.g. [("year", ">=", 2020)].
+            Defaults to None.
+        content_type (ContentType, optional): The type to read tabular content as, e.g. ContentType.ARROW_TABLE,
+            without converting through pandas. Defaults to None, the type the content was saved as.
+        lazy (bool, optional): Whether the content is read on the first access instead. Defaults to False.
+        prefetch (bool, optional): Whether the lazy content starts being read in a background thread right away.
+            Defaults to False.
+
+    Returns:
+        Union[RawLayerData, TrustedLayerData, RefinedLayerData]: The read layer data.
+
+    Raises:
+        NotCoveredContentType: If the content can't be read as the content type.
+    """
+    metadata = metadata_repository.load(id)
+    content: Union[CoveredContentType, LazyContent]
+    if lazy:
+        content = LazyContent(
+            lambda: _load_content(
+                metadata, data_repository, columns, filters, content_type
+            ),
+            prefetch,
+        )
+    else:
+        content = _load_content(
+            metadata, data_repository, columns, filters, content_type
+        )
+    return _compose_layer_data(metadata, content, content_type)
+
+
+def read_layer_data_iter(
+    id: str,
+    data_repository: DataRepository,
+    metadata_repository: MetadataRepository,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None,
+) -> Iterator[pd.DataFrame]:
+    """Read the content of the layer data for the ID as DataFrame chunks.
+
+    Only one chunk is in memory at a time, so a content bigger than the memory can be processed.
+    Parquet is read row group batch by batch and CSV is parsed chunk by chunk.
+
+    Args:
+        id (str): The ID of the layer data to read.
+        data_repository (DataRepository): The data repository where the content is saved.
+        metadata_repository (MetadataRepository): The metadata repository where the metadata is saved.
+        batch_size (int, optional): The maximum number of rows in a chunk. Defaults to 65536.
+        columns (List[str], optional): The columns to read. Defaults to None, all the columns.
+        filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+
+    Returns:
+        Iterator[pd.DataFrame]: The chunks of the content.
+
+    Raises:
+        NotCoveredContentType: If the content is a single dict, which can't be split into chunks.
+    """
     metadata = metadata_repository.load(id)
-    content = data_repository.load(
+    return data_repository.load_iter(
         metadata.project_name,
         metadata.layer,
-        id,
+        metadata.id,
         metadata.format,
         metadata.content_type,
+        batch_size,
+        columns,
+        filters,
+        metadata.compression,
+    )
+
+
+async def read_layer_data_async(
+    id: str,
+    data_repository: AsyncDataRepository,
+    metadata_repository: AsyncMetadataRepository,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None,
+    content_type: Optional[ContentType] = None,
+) -> Union[RawLayerData, TrustedLayerData, RefinedLayerData]:
+    """Read the layer data for the ID without blocking the event loop.
+
+    Args:
+        id (str): The ID of the layer data to read.
+        data_repository (AsyncDataRepository): The data repository where the content is saved.
+        metadata_repository (AsyncMetadataRepository): The metadata repository where the metadata is saved.
+        columns (List[str], optional): The columns to read. Defaults to None, all the columns.
+        filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+        content_type (ContentType, optional): The type to read tabular content as, e.g. ContentType.ARROW_TABLE,
+            without converting through pandas. Defaults to None, the type the content was saved as.
+
+    Returns:
+        Union[RawLayerData, TrustedLayerData, RefinedLayerData]: The read layer data.
+
+    Raises:
+        NotCoveredContentType: If the content can't be read as the content type.
+    """
+    metadata = await metadata_repository.load(id)
+    content = await data_repository.load(
+        metadata.project_name,
+        metadata.layer,
+        metadata.id,
+        metadata.format,
+        _compose_content_type(metadata, content_type),
+        columns,
+        filters,
+        metadata.compression,
     )
+    return _compose_layer_data(metadata, content, content_type)
+
+
+def read_layer_data_many(
+    ids: List[str],
+    data_repository: DataRepository,
+    metadata_repository: MetadataRepository,
+    max_workers: int = 8,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None,
+    content_type: Optional[ContentType] = None,
+) -> List[Union[RawLayerData, TrustedLayerData, RefinedLayerData, Exception]]:
+    """Read the layer data for several IDs.
+
+    The metadata of all the IDs is fetched in one batch and the contents are downloaded concurrently.
+
+    Args:
+        ids (List[str]): The IDs of the layer data to read.
+        data_repository (DataRepository): The data repository where the contents are saved.
+        metadata_repository (MetadataRepository): The metadata repository where the metadata are saved.
+        max_workers (int, optional): The maximum number of concurrent downloads. Defaults to 8.
+        columns (List[str], optional): The columns to read. Defaults to None, all the columns.
+        filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+        content_type (ContentType, optional): The type to read tabular content as, e.g. ContentType.ARROW_TABLE,
+            without converting through pandas. Defaults to None, the type the content was saved as.
+
+    Returns:
+        List[Union[RawLayerData, TrustedLayerData, RefinedLayerData, Exception]]: The layer data in the order of
+            the given IDs. For an ID which couldn't be read, the raised exception is put instead.
+    """
+    metadata_dict = metadata_repository.load_many(ids)
+
+    def read(id: str) -> Union[RawLayerData, TrustedLayerData, RefinedLayerData]:
+        metadata = metadata_dict.get(id)
+        if metadata is None:
+            raise NoMetadataFound(f"No Metadata found for {id}")
+        content = _load_content(
+            metadata, data_repository, columns, filters, content_type
+        )
+        return _compose_layer_data(metadata, content, content_type)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {id: executor.submit(read, id) for id in dict.fromkeys(ids)}
+
+    layer_data_list: List[
+        Union[RawLayerData, TrustedLayerData, RefinedLayerData, Exception]
+    ] = []
+    for id in ids:
+        exception = futures[id].exception()
+        layer_data_list.append(
+            exception if exception is not None else futures[id].result()
+        )
+    return layer_data_list
+
+
+def save_many(
+    layer_data_list: List[Union[RawLayerData, TrustedLayerData, RefinedLayerData]],
+    format: str,
+    data_repository: DataRepository,
+    metadata_repository: MetadataRepository,
+    max_workers: int = 8,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+):
+    """Save several layer data objects in the specified format.
+
+    The contents are uploaded concurrently and the metadata of all the objects are saved with one write
+    to the metadata repository. The ids of the objects are updated only once the metadata are saved.
+
+    If saving a content or the metadata fails, no id is updated, and the contents already written stay
+    in the data repository without metadata. No metadata points to them, so they are never read,
+    and they can be removed from the data repository by their IDs, which are not in the metadata.
+    Once a content fails, the contents not started yet are skipped, while the ones already being written
+    are finished.
+
+    Args:
+        layer_data_list (List[Union[RawLayerData, TrustedLayerData, RefinedLayerData]]): The layer data to save.
+        format (str): The format in which the contents will be saved.
+        data_repository (DataRepository): The data repository where the contents will be saved.
+        metadata_repository (MetadataRepository): The metadata repository where the metadata will be saved.
+        max_workers (int, optional): The maximum number of concurrent uploads. Defaults to 8.
+        compression (str, optional): The compression codec, e.g. "zstd". Defaults to None, the default of the format.
+        compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+    Raises:
+        Exception: The exception of the first failed content in the list, in which case no metadata is saved,
+            or the exception raised while saving the metadata.
+
+    Returns:
+        None
+    """
+    has_failed = threading.Event()
+
+    def save_content(
+        layer_data: Union[RawLayerData, TrustedLayerData, RefinedLayerData]
+    ) -> Metadata:
+        # Checked by each content as it starts, as a worker picks the next content before it can be cancelled.
+        if has_failed.is_set():
+            raise CancelledError()
+        try:
+            return layer_data.save_content(
+                format, data_repository, compression, compression_level
+            )
+        except Exception:
+            has_failed.set()
+            raise
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(save_content, layer_data) for layer_data in layer_data_list
+        ]
+        wait(futures, return_when=FIRST_EXCEPTION)
+        if has_failed.is_set():
+            for future in futures:
+                future.cancel()
+    for future in futures:
+        if future.cancelled():
+            continue
+        exception = future.exception()
+        if exception is not None and not isinstance(exception, CancelledError):
+            raise exception
+    metadata_list = [future.result() for future in futures]
+    metadata_repository.save_many(metadata_list)
+    for layer_data, metadata in zip(layer_data_list, metadata_list):
+        layer_data.mark_saved(metadata)
+
+
+def _load_content(
+    metadata: Metadata,
+    data_repository: DataRepository,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None,
+    content_type: Optional[ContentType] = None,
+) -> CoveredContentType:
+    return data_repository.load(
+        metadata.project_name,
+        metadata.layer,
+        metadata.id,
+        metadata.format,
+        _compose_content_type(metadata, content_type),
+        columns,
+        filters,
+        metadata.compression,
+    )
+
+
+def _compose_content_type(
+    metadata: Metadata, content_type: Optional[ContentType]
+) -> ContentType:
+    if content_type is None or content_type == metadata.content_type:
+        return metadata.content_type
+    # Tables are saved in the same formats whatever their type, so they can be read as another table type.
+    if (
+        content_type in TABULAR_CONTENT_TYPES
+        and metadata.content_type in TABULAR_CONTENT_TYPES
+    ):
+        return content_type
+    raise NotCoveredContentType("The content can't be read as this content type.")
+
+
+def _compose_layer_data(
+    metadata: Metadata,
+    content: Union[CoveredContentType, LazyContent],
+    content_type: Optional[ContentType] = None,
+) -> Union[RawLayerData, TrustedLayerData, RefinedLayerData]:
+    # The loaded content has the type it was read as, so it doesn't have to be inspected again.
+    content_type = _compose_content_type(metadata, content_type)
     layer_data: Union[RawLayerData, TrustedLayerData, RefinedLayerData]
     if metadata.layer == "raw":
         layer_data = RawLayerData(
-            id,
+            metadata.id,
             metadata.project_name,
             content,
             metadata.author,
             metadata.created_at,
             metadata.description,
             metadata.extra_info,
+            content_type=content_type,
         )
     elif metadata.layer == "trusted":
         layer_data = TrustedLayerData(
-            id,
+            metadata.id,
             metadata.project_name,
             content,
             metadata.author,
@@ -39,10 +343,11 @@ def read_layer_data(
             metadata.description,
             metadata.extra_info,
             metadata.source_ids,
+            content_type=content_type,
         )
     else:
         layer_data = RefinedLayerData(
-            id,
+            metadata.id,
             metadata.project_name,
             content,
             metadata.author,
@@ -50,5 +355,6 @@ def read_layer_data(
             metadata.description,
             metadata.extra_info,
             metadata.source_ids,
+            content_type=content_type,
         )
     return layer_data
@@ -1,28 +1,38 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 
 from dcraft.domain.layer.raw import RawLayerData
-from dcraft.domain.type.content import CoveredContentType
+from dcraft.domain.type.content import CoveredContentType, DataFrameStream
+from dcraft.domain.type.enum import ContentType
 
 
 def create_raw(
-    content: CoveredContentType,
+    content: Union[CoveredContentType, DataFrameStream],
     project_name: str,
     author: Optional[str] = None,
     description: Optional[str] = None,
     extra_info: Optional[dict] = None,
+    content_type: Optional[ContentType] = None,
+    validation_sample_size: Optional[int] = None,
 ) -> RawLayerData:
     """Create a RawLayerData object with the given content, project name, author, description, and extra information.
 
     Args:
-        content (CoveredContentType): The content to be stored in the RawLayerData object.
+        content (Union[CoveredContentType, DataFrameStream]): The content to be stored in the RawLayerData object.
         project_name (str): The name of the project.
         author (Optional[str], optional): The author of the content. Defaults to None.
         description (Optional[str], optional): A description of the content. Defaults to None.
         extra_info (Optional[dict], optional): Extra information related to the content. Defaults to None.
+        content_type (Optional[ContentType], optional): The type of the content. When given, the content is not
+            inspected item by item. Defaults to None, detected from the content.
+        validation_sample_size (Optional[int], optional): The number of evenly spaced items checked to detect a list
+            of dicts. Defaults to None, all the items.
 
     Returns:
         RawLayerData: The created RawLayerData object.
+
+    Raises:
+        ValueError: If the validation sample size is not positive.
     """
     return RawLayerData(
         None,
@@ -32,4 +42,6 @@ def create_raw(
         datetime.now(),
         description,
         extra_info,
+        content_type,
+        validation_sample_size,
     )
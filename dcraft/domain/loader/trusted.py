@@ -1,30 +1,40 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from dcraft.domain.layer.trusted import TrustedLayerData
-from dcraft.domain.type.content import CoveredContentType
+from dcraft.domain.type.content import CoveredContentType, DataFrameStream
+from dcraft.domain.type.enum import ContentType
 
 
 def create_trusted(
-    content: CoveredContentType,
+    content: Union[CoveredContentType, DataFrameStream],
     project_name: str,
     author: Optional[str] = None,
     description: Optional[str] = None,
     extra_info: Optional[dict] = None,
     source_ids: Optional[List[str]] = None,
+    content_type: Optional[ContentType] = None,
+    validation_sample_size: Optional[int] = None,
 ) -> TrustedLayerData:
     """Creates a trusted layer data object.
 
     Args:
-        content (CoveredContentType): The content of the trusted layer.
+        content (Union[CoveredContentType, DataFrameStream]): The content of the trusted layer.
         project_name (str): The name of the project.
         author (Optional[str], optional): The author of the trusted layer. Defaults to None.
         description (Optional[str], optional): A description of the trusted layer. Defaults to None.
         extra_info (Optional[dict], optional): Any extra information associated with the trusted layer. Defaults to None.
         source_ids (Optional[List[str]], optional): The source IDs associated with the trusted layer. Defaults to None.
+        content_type (Optional[ContentType], optional): The type of the content. When given, the content is not
+            inspected item by item. Defaults to None, detected from the content.
+        validation_sample_size (Optional[int], optional): The number of evenly spaced items checked to detect a list
+            of dicts. Defaults to None, all the items.
 
     Returns:
         TrustedLayerData: The created trusted layer data object.
+
+    Raises:
+        ValueError: If the validation sample size is not positive.
     """
     return TrustedLayerData(
         None,
@@ -35,4 +45,6 @@ def create_trusted(
         description,
         extra_info,
         source_ids,
+        content_type,
+        validation_sample_size,
     )
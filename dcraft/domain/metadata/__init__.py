@@ -17,6 +17,7 @@ class Metadata:
     extra_info: Optional[dict]
     source_ids: Optional[List[str]]
     format: str
+    compression: Optional[str] = None
 
     @property
     def asdict(self):
@@ -31,4 +32,5 @@ class Metadata:
             "extra_info": self.extra_info,
             "source_ids": self.source_ids,
             "format": self.format,
+            "compression": self.compression,
         }
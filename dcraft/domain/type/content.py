@@ -1,5 +1,29 @@
-from typing import Dict, List, Union
+import sys
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Tuple, Union
 
 import pandas as pd
+import pyarrow as pa
 
-CoveredContentType = Union[pd.DataFrame, dict, List[Dict]]
+if TYPE_CHECKING:
+    import polars as pl
+
+CoveredContentType = Union[pd.DataFrame, pa.Table, "pl.DataFrame", dict, List[Dict]]
+
+# DataFrame content given batch by batch, so it can be saved without materializing it.
+DataFrameStream = Union[Iterator[pd.DataFrame], pa.RecordBatchReader]
+
+# Row filters in the disjunctive normal form of pyarrow, e.g. [("a", ">", 1)] or [[("a", "=", 1)], [("b", "in", [2, 3])]].
+Filters = Union[List[Tuple[str, str, Any]], List[List[Tuple[str, str, Any]]]]
+
+
+def is_polars_dataframe(content: Any) -> bool:
+    """Whether the content is a polars DataFrame, without importing polars.
+
+    Args:
+        content (Any): The content to be checked.
+
+    Returns:
+        bool: True if the content is a polars DataFrame.
+    """
+    polars = sys.modules.get("polars")
+    return polars is not None and isinstance(content, polars.DataFrame)
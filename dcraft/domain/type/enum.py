@@ -2,15 +2,34 @@ from enum import Enum
 from typing import List
 
 import pandas as pd
+import pyarrow as pa
 
 
 class ContentType(Enum):
     DF = pd.DataFrame
     DICT = dict
     DICT_LIST = List[dict]
+    ARROW_TABLE = pa.Table
+    # polars is optional, so the type is referred by name.
+    POLARS_DF = "polars.DataFrame"
+
+
+# Content types saved as tables. They can be read back as any of them.
+TABULAR_CONTENT_TYPES = [ContentType.DF, ContentType.ARROW_TABLE, ContentType.POLARS_DF]
 
 
 class Extension(Enum):
     JSON = "json"
+    JSONL = "jsonl"
     CSV = "csv"
     PARQUET = "parquet"
+    FEATHER = "feather"
+    ARROW = "arrow"
+
+
+class Compression(Enum):
+    SNAPPY = "snappy"
+    GZIP = "gzip"
+    BROTLI = "brotli"
+    LZ4 = "lz4"
+    ZSTD = "zstd"
@@ -0,0 +1,119 @@
+from typing import IO, List, Optional, Union
+
+from aiohttp import ClientSession
+from gcloud.aio.storage import Storage
+
+from dcraft.domain.type.content import CoveredContentType, Filters
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.data.base import AsyncDataRepository
+from dcraft.interface.data.compression import compose_file_format
+from dcraft.interface.data.serializer import deserialize, serialize
+
+
+class AsyncGcsDataRepository(AsyncDataRepository):
+    def __init__(
+        self,
+        bucket_name: str,
+        service_file: Optional[Union[str, IO]] = None,
+        session: Optional[ClientSession] = None,
+        api_root: Optional[str] = None,
+        timeout: int = 300,
+    ):
+        """Initializes a new instance of the class.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            service_file (Union[str, IO], optional): The service account file used for authentication. Defaults to None.
+            session (ClientSession, optional): The aiohttp session to use for requests. Defaults to None.
+            api_root (str, optional): The custom endpoint of the storage API. Defaults to None.
+            timeout (int, optional): The seconds a download or an upload may take. Defaults to 300,
+                as the defaults of gcloud-aio (10 and 30 seconds) are too short for large contents.
+        """
+        self._bucket_name = bucket_name
+        self._timeout = timeout
+        self._client = Storage(
+            service_file=service_file, session=session, api_root=api_root
+        )
+
+    async def load(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> CoveredContentType:
+        """Load the content from the specified project, layer, and ID, with the given format and content type.
+
+        Args:
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            content_type (ContentType): The type of the content.
+            columns (List[str], optional): The columns to load. Only used for DataFrame content. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Only used for DataFrame content. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            CoveredContentType: The loaded content.
+
+        Raises:
+            ContentExtensionMismatch: If the content can't be saved with the specified extension.
+            NotCoveredContentType: If the content type is not covered.
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        data = await self._client.download(
+            self._bucket_name, path, timeout=self._timeout
+        )
+        return deserialize(data, format, content_type, columns, filters, compression)
+
+    async def save(
+        self,
+        content: CoveredContentType,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ):
+        """Save the provided content to the specified project, layer, and ID in the given format and content type.
+
+        Args:
+            content (CoveredContentType): The content to be saved.
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format in which the content should be saved.
+            content_type (ContentType): The type of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+        Raises:
+            ContentExtensionMismatch: If the provided format is not compatible with the content type.
+            NotCoveredContentType: If the provided content type is not covered.
+
+        Returns:
+            None
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        data = serialize(content, format, content_type, compression, compression_level)
+        await self._client.upload(self._bucket_name, path, data, timeout=self._timeout)
+
+    async def close(self):
+        """Close the underlying HTTP session."""
+        await self._client.close()
+
+    def _compose_path(
+        self, project_name: str, layer_name: str, id: str, format: str
+    ) -> str:
+        return f"{project_name}/{layer_name}/{id}.{format}"
@@ -0,0 +1,133 @@
+from io import BytesIO
+from typing import List, Optional
+
+from miniopy_async import Minio
+from miniopy_async.credentials.providers import Provider
+
+from dcraft.domain.type.content import CoveredContentType, Filters
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.data.base import AsyncDataRepository
+from dcraft.interface.data.compression import compose_file_format
+from dcraft.interface.data.serializer import deserialize, serialize
+
+
+class AsyncMinioRepository(AsyncDataRepository):
+    def __init__(
+        self,
+        endpoint: str,
+        bucket: str,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        session_token: Optional[str] = None,
+        secure: bool = True,
+        region: Optional[str] = None,
+        credentials: Optional[Provider] = None,
+        cert_check: bool = True,
+    ):
+        """
+        Initializes the asynchronous Minio client object.
+
+        Args:
+            endpoint (str): The MinIO server endpoint URL.
+            bucket (str): The bucket name.
+            access_key (str, optional): The access key. Defaults to None.
+            secret_key (str, optional): The secret key. Defaults to None.
+            session_token (str, optional): The session token. Defaults to None.
+            secure (bool, optional): Whether to use secure (HTTPS) connections. Defaults to True.
+            region (str, optional): The region. Defaults to None.
+            credentials (Provider, optional): The credentials provider. Defaults to None.
+            cert_check (bool, optional): Whether to check the server's SSL certificate. Defaults to True.
+
+        Returns:
+            None
+        """
+        self._client = Minio(
+            endpoint=endpoint,
+            access_key=access_key,
+            secret_key=secret_key,
+            session_token=session_token,
+            secure=secure,
+            region=region,
+            credentials=credentials,
+            cert_check=cert_check,
+        )
+        self._bucket = bucket
+
+    async def load(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> CoveredContentType:
+        """Load the specified content from the given project, layer, and ID.
+
+        Args:
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            content_type (ContentType): The type of the content.
+            columns (List[str], optional): The columns to load. Only used for DataFrame content. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Only used for DataFrame content. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            CoveredContentType: The loaded content.
+
+        Raises:
+            ContentExtensionMismatch: If the content cannot be saved with the given extension.
+            NotCoveredContentType: If the content type is not supported.
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        response = await self._client.get_object(self._bucket, path)
+        try:
+            data = await response.read()
+        finally:
+            response.release()
+        return deserialize(data, format, content_type, columns, filters, compression)
+
+    async def save(
+        self,
+        content: CoveredContentType,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ):
+        """Save the content to a specified location in the bucket.
+
+        Args:
+            content (CoveredContentType): The content to be saved.
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The unique identifier.
+            format (str): The format of the content.
+            content_type (ContentType): The type of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+        Raises:
+            ContentExtensionMismatch: If the content cannot be saved with the given extension.
+            NotCoveredContentType: If the content type is not supported.
+
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        data = serialize(content, format, content_type, compression, compression_level)
+        await self._client.put_object(self._bucket, path, BytesIO(data), len(data))
+
+    def _compose_path(
+        self, project_name: str, layer_name: str, id: str, format: str
+    ) -> str:
+        return f"{project_name}/{layer_name}/{id}.{format}"
@@ -1,7 +1,17 @@
 from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional
 
-from dcraft.domain.type.content import CoveredContentType
-from dcraft.domain.type.enum import ContentType
+import pandas as pd
+
+from dcraft.domain.error import NotCoveredContentType
+from dcraft.domain.type.content import CoveredContentType, DataFrameStream, Filters
+from dcraft.domain.type.enum import TABULAR_CONTENT_TYPES, ContentType
+from dcraft.interface.data.query import (
+    DEFAULT_BATCH_SIZE,
+    iter_records,
+    query_dataframe,
+)
+from dcraft.interface.data.stream import iter_dataframes
 
 
 class DataRepository(ABC):
@@ -13,6 +23,9 @@ class DataRepository(ABC):
         id: str,
         format: str,
         content_type: ContentType,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
     ) -> CoveredContentType:
         """Load the specified project, layer, and content based on the given parameters.
 
@@ -22,12 +35,73 @@ class DataRepository(ABC):
             id (str): The ID of the content to load.
             format (str): The format of the content to load.
             content_type (ContentType): The type of the content to load.
+            columns (List[str], optional): The columns to load. Only used for DataFrame content. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Only used for DataFrame content. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
 
         Returns:
             CoveredContentType: The loaded content of the specified project, layer, and ID.
         """
         pass
 
+    def load_iter(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Load the content as DataFrame chunks of at most batch_size rows.
+
+        This default implementation loads the whole content first. Repositories which can read a content
+        piece by piece override it, so only one chunk is in memory at a time.
+
+        Args:
+            project_name (str): The name of the project to load.
+            layer_name (str): The name of the layer to load.
+            id (str): The ID of the content to load.
+            format (str): The format of the content to load.
+            content_type (ContentType): The type of the content to load.
+            batch_size (int, optional): The maximum number of rows in a chunk. Defaults to 65536.
+            columns (List[str], optional): The columns to load. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            Iterator[pd.DataFrame]: The chunks of the content.
+
+        Raises:
+            NotCoveredContentType: If the content type can't be split into chunks.
+        """
+        if content_type in TABULAR_CONTENT_TYPES:
+            content_type = ContentType.DF
+        elif content_type != ContentType.DICT_LIST:
+            raise NotCoveredContentType("This content type can't be read in chunks.")
+        content = self.load(
+            project_name,
+            layer_name,
+            id,
+            format,
+            content_type,
+            compression=compression,
+        )
+        if content_type == ContentType.DICT_LIST:
+            yield from iter_records(iter(content), batch_size, columns, filters)
+            return
+        for start in range(0, len(content), batch_size):
+            data = query_dataframe(
+                content.iloc[start : start + batch_size].reset_index(drop=True),
+                columns,
+                filters,
+            )
+            if len(data) > 0:
+                yield data
+
     @abstractmethod
     def save(
         self,
@@ -37,6 +111,116 @@ class DataRepository(ABC):
         id: str,
         format: str,
         content_type: ContentType,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ):
+        """Save the given content to a specified location.
+
+        Args:
+            content (CoveredContentType): The content to be saved.
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            content_type (ContentType): The type of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+        Returns:
+            None
+        """
+        pass
+
+    def save_iter(
+        self,
+        batches: DataFrameStream,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ):
+        """Save DataFrame content given batch by batch.
+
+        This default implementation concatenates the batches and saves them at once. Repositories which can
+        write a content piece by piece override it, so only one batch is in memory at a time.
+
+        Args:
+            batches (DataFrameStream): The DataFrames or the Arrow record batch reader to be saved.
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+        Returns:
+            None
+        """
+        dataframes = list(iter_dataframes(batches))
+        content = (
+            pd.concat(dataframes, ignore_index=True) if dataframes else pd.DataFrame()
+        )
+        self.save(
+            content,
+            project_name,
+            layer_name,
+            id,
+            format,
+            ContentType.DF,
+            compression,
+            compression_level,
+        )
+
+    @abstractmethod
+    def _compose_path(
+        self, project_name: str, layer_name: str, id: str, format: str
+    ) -> str:
+        pass
+
+
+class AsyncDataRepository(ABC):
+    @abstractmethod
+    async def load(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> CoveredContentType:
+        """Load the specified project, layer, and content based on the given parameters.
+
+        Args:
+            project_name (str): The name of the project to load.
+            layer_name (str): The name of the layer to load.
+            id (str): The ID of the content to load.
+            format (str): The format of the content to load.
+            content_type (ContentType): The type of the content to load.
+            columns (List[str], optional): The columns to load. Only used for DataFrame content. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Only used for DataFrame content. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            CoveredContentType: The loaded content of the specified project, layer, and ID.
+        """
+        pass
+
+    @abstractmethod
+    async def save(
+        self,
+        content: CoveredContentType,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
     ):
         """Save the given content to a specified location.
 
@@ -47,6 +231,8 @@ class DataRepository(ABC):
             id (str): The ID of the content.
             format (str): The format of the content.
             content_type (ContentType): The type of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
 
         Returns:
             None
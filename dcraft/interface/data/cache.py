@@ -0,0 +1,421 @@
+import copy
+import itertools
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from dcraft.domain.type.content import (
+    CoveredContentType,
+    DataFrameStream,
+    Filters,
+    is_polars_dataframe,
+)
+from dcraft.domain.type.enum import TABULAR_CONTENT_TYPES, ContentType
+from dcraft.interface.data.base import DataRepository
+from dcraft.interface.data.local import LocalDataRepository
+from dcraft.interface.data.query import DEFAULT_BATCH_SIZE, query_dataframe
+
+CacheKey = Tuple[str, str, str, str, ContentType]
+
+# The number of items of a dict or a list measured to estimate the size of all of them.
+SIZE_SAMPLE_SIZE = 16
+
+# The infix of the files being written to the disk cache, which are not cached contents yet.
+DISK_CACHE_TMP_INFIX = ".tmp."
+
+
+class CachedDataRepository(DataRepository):
+    def __init__(
+        self,
+        repository: DataRepository,
+        max_bytes: int = 512 * 1024 * 1024,
+        disk_cache_dir: Optional[str] = None,
+        disk_max_bytes: int = 10 * 1024 * 1024 * 1024,
+        disk_write_through: bool = False,
+    ):
+        """Initializes a new instance of the class.
+
+        Saved contents never change for an ID, so loaded contents are kept in an in-memory LRU cache
+        and, optionally, in an LRU cache in a directory on the local disk.
+
+        Args:
+            repository (DataRepository): The data repository whose contents are cached.
+            max_bytes (int, optional): The maximum size in bytes of the in-memory cache. Defaults to 512 MiB.
+            disk_cache_dir (str, optional): The directory used as the second cache tier. Defaults to None.
+            disk_max_bytes (int, optional): The maximum size in bytes of the files in the disk cache. The least
+                recently used files are deleted beyond it. Defaults to 10 GiB.
+            disk_write_through (bool, optional): Whether saved contents are also written to the disk cache.
+                Defaults to False, only the contents loaded from the wrapped repository are.
+        """
+        self._repository = repository
+        self._max_bytes = max_bytes
+        self._disk_cache = (
+            LocalDataRepository(disk_cache_dir) if disk_cache_dir is not None else None
+        )
+        self._disk_max_bytes = disk_max_bytes
+        self._disk_write_through = disk_write_through
+        # The files of the disk cache from the least recently used, with their sizes.
+        self._disk_entries: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        if disk_cache_dir is not None:
+            self._scan_disk_cache(disk_cache_dir)
+        self._cache: "OrderedDict[CacheKey, Tuple[CoveredContentType, int]]" = (
+            OrderedDict()
+        )
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+    def load(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> CoveredContentType:
+        """Load the content from the cache, or from the wrapped repository on a cache miss.
+
+        Args:
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            content_type (ContentType): The type of the content.
+            columns (List[str], optional): The columns to load. Only used for DataFrame content. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Only used for DataFrame content. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            CoveredContentType: The loaded content. It is a copy, so it can be modified safely.
+        """
+        key = (project_name, layer_name, id, format, content_type)
+        # columns and filters only apply to tabular content, other contents are always loaded whole.
+        is_partial = content_type in TABULAR_CONTENT_TYPES and (
+            columns is not None or filters is not None
+        )
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                content = self._cache[key][0]
+                if not is_partial:
+                    return self._copy(content)
+                if isinstance(content, pd.DataFrame):
+                    return query_dataframe(content, columns, filters)
+
+        if is_partial:
+            # A partial read is not cached, it is pushed down to the wrapped repository.
+            return self._repository.load(
+                project_name,
+                layer_name,
+                id,
+                format,
+                content_type,
+                columns,
+                filters,
+                compression,
+            )
+
+        content = self._load_from_disk_cache(
+            project_name, layer_name, id, format, content_type
+        )
+        if content is None:
+            content = self._repository.load(
+                project_name,
+                layer_name,
+                id,
+                format,
+                content_type,
+                compression=compression,
+            )
+            self._save_to_disk_cache(
+                content, project_name, layer_name, id, format, content_type
+            )
+        self._put(key, content)
+        return self._copy(content)
+
+    def load_iter(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Load the content chunk by chunk from the wrapped repository. Chunks are not cached.
+
+        Args:
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            content_type (ContentType): The type of the content.
+            batch_size (int, optional): The maximum number of rows in a chunk. Defaults to 65536.
+            columns (List[str], optional): The columns to load. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            Iterator[pd.DataFrame]: The chunks of the content.
+        """
+        yield from self._repository.load_iter(
+            project_name,
+            layer_name,
+            id,
+            format,
+            content_type,
+            batch_size,
+            columns,
+            filters,
+            compression,
+        )
+
+    def save(
+        self,
+        content: CoveredContentType,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ):
+        """Save the content to the wrapped repository and keep it in the in-memory cache.
+
+        The content is written to the disk cache too only if disk_write_through is set.
+
+        Args:
+            content (CoveredContentType): The content to be saved.
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            content_type (ContentType): The type of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+        Returns:
+            None
+        """
+        self._repository.save(
+            content,
+            project_name,
+            layer_name,
+            id,
+            format,
+            content_type,
+            compression,
+            compression_level,
+        )
+        if self._disk_write_through:
+            self._save_to_disk_cache(
+                content, project_name, layer_name, id, format, content_type
+            )
+        # The caller keeps the content, so it is copied, but only if it fits in the cache.
+        self._put(
+            (project_name, layer_name, id, format, content_type),
+            content,
+            copy_content=True,
+        )
+
+    def save_iter(
+        self,
+        batches: DataFrameStream,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ):
+        """Save DataFrame content batch by batch to the wrapped repository. The content is not cached.
+
+        Args:
+            batches (DataFrameStream): The DataFrames or the Arrow record batch reader to be saved.
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+        Returns:
+            None
+        """
+        self._repository.save_iter(
+            batches,
+            project_name,
+            layer_name,
+            id,
+            format,
+            compression,
+            compression_level,
+        )
+
+    def clear(self):
+        """Drop all the contents in the in-memory cache."""
+        with self._lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+
+    def _put(
+        self, key: CacheKey, content: CoveredContentType, copy_content: bool = False
+    ):
+        size = self._estimate_size(content)
+        if size > self._max_bytes:
+            return
+        if copy_content:
+            content = self._copy(content)
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = (content, size)
+            self._cached_bytes += size
+            while self._cached_bytes > self._max_bytes:
+                _, (_, evicted_size) = self._cache.popitem(last=False)
+                self._cached_bytes -= evicted_size
+
+    def _load_from_disk_cache(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+    ) -> Optional[CoveredContentType]:
+        if self._disk_cache is None:
+            return None
+        path = self._disk_cache._compose_path(project_name, layer_name, id, format)
+        if not os.path.exists(path):
+            return None
+        try:
+            content = self._disk_cache.load(
+                project_name, layer_name, id, format, content_type
+            )
+        except FileNotFoundError:
+            # Evicted by another process in the meantime.
+            return None
+        try:
+            # The modification time keeps the recency across the processes sharing the directory.
+            os.utime(path)
+            size = os.path.getsize(path)
+        except OSError:
+            return content
+        self._add_disk_entry(path, size)
+        return content
+
+    def _save_to_disk_cache(
+        self,
+        content: CoveredContentType,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+    ):
+        if self._disk_cache is None:
+            return
+        # Written under a temporary name first, so a reader never sees a partial file.
+        tmp_id = f"{id}.{os.getpid()}-{threading.get_ident()}.tmp"
+        self._disk_cache.save(
+            content, project_name, layer_name, tmp_id, format, content_type
+        )
+        path = self._disk_cache._compose_path(project_name, layer_name, id, format)
+        os.replace(
+            self._disk_cache._compose_path(project_name, layer_name, tmp_id, format),
+            path,
+        )
+        self._add_disk_entry(path, os.path.getsize(path))
+
+    def _scan_disk_cache(self, dir_path: str):
+        # The files left by previous runs are ordered by their modification time, the time of the last use.
+        entries = []
+        for root, _, file_names in os.walk(dir_path):
+            for file_name in file_names:
+                if DISK_CACHE_TMP_INFIX in file_name:
+                    continue
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(entries):
+            self._add_disk_entry(path, size)
+
+    def _add_disk_entry(self, path: str, size: int):
+        with self._disk_lock:
+            self._disk_bytes += size - self._disk_entries.pop(path, 0)
+            self._disk_entries[path] = size
+            evicted_paths = []
+            while self._disk_bytes > self._disk_max_bytes and self._disk_entries:
+                evicted_path, evicted_size = self._disk_entries.popitem(last=False)
+                self._disk_bytes -= evicted_size
+                evicted_paths.append(evicted_path)
+        for evicted_path in evicted_paths:
+            try:
+                os.remove(evicted_path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _estimate_size(content: CoveredContentType) -> int:
+        if isinstance(content, pd.DataFrame):
+            return int(content.memory_usage(index=True, deep=True).sum())
+        elif isinstance(content, pa.Table):
+            return content.nbytes
+        elif is_polars_dataframe(content):
+            return int(content.estimated_size())
+        return CachedDataRepository._estimate_object_size(content)
+
+    @staticmethod
+    def _estimate_object_size(value: Any) -> int:
+        # Only a sample of the items of each dict or list is measured and scaled up,
+        # so the estimate costs no pass over the whole content.
+        size = sys.getsizeof(value)
+        if isinstance(value, dict):
+            items: Any = value.items()
+        elif isinstance(value, list):
+            items = value
+        else:
+            return size
+        if not items:
+            return size
+        step = max(len(items) // SIZE_SAMPLE_SIZE, 1)
+        sample = list(itertools.islice(items, 0, step * SIZE_SAMPLE_SIZE, step))
+        sample_size = sum(
+            sum(map(CachedDataRepository._estimate_object_size, item))
+            if isinstance(value, dict)
+            else CachedDataRepository._estimate_object_size(item)
+            for item in sample
+        )
+        return size + sample_size * len(items) // len(sample)
+
+    @staticmethod
+    def _copy(content: CoveredContentType) -> CoveredContentType:
+        if isinstance(content, pd.DataFrame):
+            return content.copy()
+        elif isinstance(content, pa.Table):
+            # Arrow tables are immutable, so they can be shared.
+            return content
+        elif is_polars_dataframe(content):
+            return content.clone()
+        return copy.deepcopy(content)
+
+    def _compose_path(
+        self, project_name: str, layer_name: str, id: str, format: str
+    ) -> str:
+        return self._repository._compose_path(project_name, layer_name, id, format)
@@ -0,0 +1,151 @@
+from io import RawIOBase
+from typing import IO, Optional, Union
+
+import pyarrow as pa
+
+# Extensions added to the text formats, which are compressed as a whole file, e.g. "csv.gz".
+# Columnar formats are compressed inside the file, so their extension doesn't change.
+COMPRESSION_EXTENSIONS = {"gzip": "gz", "zstd": "zst", "lz4": "lz4"}
+
+COMPRESSION_FRAME_SIZE = 4 * 1024 * 1024
+
+
+def compose_file_format(format: str, compression: Optional[str]) -> str:
+    """Compose the file extension of the content in the format with the compression.
+
+    Args:
+        format (str): The format of the content.
+        compression (str, optional): The compression codec. None means no compression.
+
+    Returns:
+        str: The file extension, e.g. "csv.gz" for csv compressed with gzip.
+    """
+    if compression is None or not is_compressed_as_file(format):
+        return format
+    return f"{format}.{COMPRESSION_EXTENSIONS[compression]}"
+
+
+def is_compressed_as_file(format: str) -> bool:
+    """Whether the content in the format is compressed as a whole file, rather than inside the file.
+
+    Args:
+        format (str): The format of the content.
+
+    Returns:
+        bool: True for the text formats.
+    """
+    return format not in ["parquet", "feather", "arrow"]
+
+
+def compose_columnar_options(
+    compression: Optional[str], compression_level: Optional[int]
+) -> dict:
+    """Compose the keyword arguments of the parquet and feather writers for the compression.
+
+    Args:
+        compression (str, optional): The compression codec. None means the default of the writer.
+        compression_level (int, optional): The level of the codec. None means the default level.
+
+    Returns:
+        dict: The keyword arguments.
+    """
+    if compression is None:
+        return {}
+    return {"compression": compression, "compression_level": compression_level}
+
+
+def open_compressed_writer(
+    sink: IO[bytes], compression: Optional[str], compression_level: Optional[int]
+) -> IO[bytes]:
+    """Wrap the sink so the bytes written are compressed.
+
+    Closing the returned writer flushes the compressed bytes but doesn't close the sink.
+
+    Args:
+        sink (IO[bytes]): The binary file object the compressed bytes are written to.
+        compression (str, optional): The compression codec. None means no compression.
+        compression_level (int, optional): The level of the codec. None means the default level.
+
+    Returns:
+        IO[bytes]: The binary file object to write the uncompressed bytes to.
+    """
+    if compression is None:
+        return _UnclosedWriter(sink)
+    return _CompressedWriter(sink, pa.Codec(compression, compression_level))
+
+
+def open_decompressed_reader(
+    source: Union[str, IO[bytes], pa.NativeFile, bytes, bytearray],
+    compression: Optional[str],
+) -> Union[str, IO[bytes], pa.NativeFile]:
+    """Wrap the source so the bytes read are decompressed.
+
+    Args:
+        source (Union[str, IO[bytes], pa.NativeFile, bytes, bytearray]): The path, the binary file object or
+            the bytes of the compressed content.
+        compression (str, optional): The compression codec. None means no compression.
+
+    Returns:
+        Union[str, IO[bytes], pa.NativeFile]: The path or the binary file object to read the uncompressed bytes from.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = pa.BufferReader(source)
+    if compression is None:
+        return source
+    return pa.input_stream(source, compression=compression)
+
+
+def compress(
+    data: bytes, compression: Optional[str], compression_level: Optional[int]
+) -> bytes:
+    """Compress the bytes as one frame of the codec.
+
+    Args:
+        data (bytes): The bytes to be compressed.
+        compression (str, optional): The compression codec. None means no compression.
+        compression_level (int, optional): The level of the codec. None means the default level.
+
+    Returns:
+        bytes: The compressed bytes.
+    """
+    if compression is None:
+        return data
+    return pa.Codec(compression, compression_level).compress(data, asbytes=True)
+
+
+class _CompressedWriter(RawIOBase):
+    # The bytes are compressed in independent frames, which is valid for gzip, zstd and lz4 frame streams.
+    # Unlike pyarrow's CompressedOutputStream, this lets the compression level be chosen.
+    def __init__(self, sink: IO[bytes], codec: pa.Codec):
+        self._sink = sink
+        self._codec = codec
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        if len(self._buffer) >= COMPRESSION_FRAME_SIZE:
+            self._write_frame()
+        return len(data)
+
+    def close(self):
+        if not self.closed and self._buffer:
+            self._write_frame()
+        super().close()
+
+    def _write_frame(self):
+        self._sink.write(self._codec.compress(bytes(self._buffer), asbytes=True))
+        self._buffer = bytearray()
+
+
+class _UnclosedWriter(RawIOBase):
+    def __init__(self, sink: IO[bytes]):
+        self._sink = sink
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        return self._sink.write(data)
@@ -1,14 +1,62 @@
 import json
-from io import BytesIO, StringIO
-from typing import Any, Optional
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Callable, Iterator, List, Optional, Union
+from uuid import uuid4
 
 import pandas as pd
+import pyarrow as pa
+from google.api_core.exceptions import NotFound, RequestRangeNotSatisfiable
 from google.cloud.storage import Client
 
 from dcraft.domain.error import ContentExtensionMismatch, NotCoveredContentType
-from dcraft.domain.type.content import CoveredContentType
-from dcraft.domain.type.enum import ContentType
+from dcraft.domain.type.content import CoveredContentType, DataFrameStream, Filters
+from dcraft.domain.type.enum import TABULAR_CONTENT_TYPES, ContentType
 from dcraft.interface.data.base import DataRepository
+from dcraft.interface.data.compression import (
+    compose_columnar_options,
+    compose_file_format,
+    open_decompressed_reader,
+)
+from dcraft.interface.data.jsonl import iter_jsonl, read_jsonl, write_jsonl
+from dcraft.interface.data.query import (
+    DEFAULT_BATCH_SIZE,
+    compose_read_columns,
+    iter_csv_chunks,
+    iter_ipc_batches,
+    iter_parquet_batches,
+    iter_records,
+    query_dataframe,
+    read_ipc_table,
+)
+from dcraft.interface.data.serializer import write_ipc
+from dcraft.interface.data.stream import (
+    write_csv_stream,
+    write_ipc_stream,
+    write_parquet_stream,
+    write_text,
+)
+from dcraft.interface.data.table import (
+    from_arrow_table,
+    read_table,
+    to_arrow_table,
+    write_table,
+)
+
+PARQUET_RANGE_READ_SIZE = 1024 * 1024
+
+# The part size of the resumable uploads. It has to be a multiple of 256 KiB.
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+TRANSFER_CHUNK_SIZE = 32 * 1024 * 1024
+
+# The maximum number of source objects of a compose request.
+MAX_COMPOSE_SOURCES = 32
+
+# The prefix of the temporary parts of the composite uploads. They are deleted once composed, but a killed process
+# leaves them behind, so the bucket should have a lifecycle rule deleting the objects under this prefix.
+COMPOSITE_PART_PREFIX = "_dcraft_parts/"
 
 
 class GcsDataRepository(DataRepository):
@@ -21,6 +69,8 @@ class GcsDataRepository(DataRepository):
         client_info: Optional[Any] = None,
         client_options: Optional[Any] = None,
         use_auth_w_custom_endpoint: bool = True,
+        chunk_size: int = TRANSFER_CHUNK_SIZE,
+        max_workers: int = 8,
     ):
         """Initializes a new instance of the class.
 
@@ -32,8 +82,18 @@ class GcsDataRepository(DataRepository):
             client_info (Any, optional): The client info to include in requests. Defaults to None.
             client_options (Any, optional): The client options. Defaults to None.
             use_auth_w_custom_endpoint (bool, optional): Whether to use authentication with a custom endpoint. Defaults to True.
+            chunk_size (int, optional): The size in bytes of a slice downloaded or uploaded by one worker. Contents
+                up to this size are serialized in memory and transferred in a single request. Defaults to 32 MiB.
+            max_workers (int, optional): The number of slices transferred in parallel. Defaults to 8.
+
+        Note:
+            The slices of a bigger content are uploaded as temporary objects under ``_dcraft_parts/`` and
+            composed into the final object. A process killed in the middle leaves them there, so add a lifecycle
+            rule to the bucket deleting the objects with this prefix, e.g. after a day.
         """
         self._bucket_name = bucket_name
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers
         self._client = Client(
             project=project_id,
             credentials=credentials,
@@ -51,6 +111,9 @@ class GcsDataRepository(DataRepository):
         id: str,
         format: str,
         content_type: ContentType,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
     ) -> CoveredContentType:
         """Load the content from the specified project, layer, and ID, with the given format and content type.
 
@@ -60,6 +123,9 @@ class GcsDataRepository(DataRepository):
             id (str): The ID of the content.
             format (str): The format of the content.
             content_type (ContentType): The type of the content.
+            columns (List[str], optional): The columns to load. Only used for DataFrame content. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Only used for DataFrame content. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
 
         Returns:
             CoveredContentType: The loaded content.
@@ -68,25 +134,50 @@ class GcsDataRepository(DataRepository):
             ContentExtensionMismatch: If the content can't be saved with the specified extension.
             NotCoveredContentType: If the content type is not covered.
         """
-        path = self._compose_path(project_name, layer_name, id, format)
+        if content_type in [ContentType.ARROW_TABLE, ContentType.POLARS_DF]:
+            table = self.load_table(
+                project_name, layer_name, id, format, columns, filters, compression
+            )
+            return from_arrow_table(table, content_type)
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
         if content_type == ContentType.DF:
             if format == "csv":
-                blob = self._bucket.blob(path)
-                csv_string = StringIO(blob.download_as_text())
-                data = pd.read_csv(csv_string)
+                csv_bytes = self._download(path)
+                data = query_dataframe(
+                    pd.read_csv(
+                        open_decompressed_reader(csv_bytes, compression),
+                        usecols=compose_read_columns(columns, filters),
+                    ),
+                    columns,
+                    filters,
+                )
             elif format == "parquet":
-                blob = self._bucket.blob(path)
-                parquet_bytes = BytesIO(blob.download_as_bytes())
-                data = pd.read_parquet(parquet_bytes)
+                if columns is None and filters is None:
+                    parquet_bytes = self._download(path)
+                    data = pd.read_parquet(pa.BufferReader(parquet_bytes))
+                else:
+                    # Ranged reads fetch only the footer and the needed column chunks and row groups.
+                    blob = self._bucket.blob(path)
+                    with blob.open("rb", chunk_size=PARQUET_RANGE_READ_SIZE) as f:
+                        data = pd.read_parquet(f, columns=columns, filters=filters)
+            elif format in ["feather", "arrow"]:
+                ipc_bytes = self._download(path)
+                data = read_ipc_table(
+                    pa.BufferReader(ipc_bytes), columns, filters
+                ).to_pandas()
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
                 )
         elif content_type in [ContentType.DICT, ContentType.DICT_LIST]:
             if format == "json":
-                blob = self._bucket.blob(path)
-                dict_bytes = blob.download_as_text()
-                data = json.loads(dict_bytes)
+                dict_bytes = self._download(path)
+                data = json.load(open_decompressed_reader(dict_bytes, compression))
+            elif format == "jsonl" and content_type == ContentType.DICT_LIST:
+                jsonl_bytes = self._download(path)
+                data = read_jsonl(open_decompressed_reader(jsonl_bytes, compression))
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
@@ -95,6 +186,111 @@ class GcsDataRepository(DataRepository):
             raise NotCoveredContentType("This content type is not covered.")
         return data
 
+    def load_table(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> pa.Table:
+        """Load tabular content from the bucket as a pyarrow Table, without converting it to pandas.
+
+        Args:
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            columns (List[str], optional): The columns to load. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            pa.Table: The loaded content.
+
+        Raises:
+            ContentExtensionMismatch: If the content can't be loaded as a table with the specified extension.
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        if format == "parquet" and (columns is not None or filters is not None):
+            blob = self._bucket.blob(path)
+            with blob.open("rb", chunk_size=PARQUET_RANGE_READ_SIZE) as f:
+                return read_table(f, format, columns, filters)
+        return read_table(self._download(path), format, columns, filters, compression)
+
+    def load_iter(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream the CSV, parquet or JSON Lines content from the bucket chunk by chunk.
+
+        Args:
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            content_type (ContentType): The type of the content.
+            batch_size (int, optional): The maximum number of rows in a chunk. Defaults to 65536.
+            columns (List[str], optional): The columns to load. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            Iterator[pd.DataFrame]: The chunks of the content.
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        if content_type in TABULAR_CONTENT_TYPES and format == "csv":
+            with self._bucket.blob(path).open("rb") as f:
+                yield from iter_csv_chunks(
+                    open_decompressed_reader(f, compression),
+                    batch_size,
+                    columns,
+                    filters,
+                )
+        elif content_type in TABULAR_CONTENT_TYPES and format == "parquet":
+            blob = self._bucket.blob(path)
+            with blob.open("rb", chunk_size=PARQUET_RANGE_READ_SIZE) as f:
+                yield from iter_parquet_batches(f, batch_size, columns, filters)
+        elif content_type in TABULAR_CONTENT_TYPES and format in ["feather", "arrow"]:
+            ipc_bytes = self._download(path)
+            yield from iter_ipc_batches(
+                pa.BufferReader(ipc_bytes), batch_size, columns, filters
+            )
+        elif content_type == ContentType.DICT_LIST and format == "jsonl":
+            with self._bucket.blob(path).open("rb") as f:
+                yield from iter_records(
+                    iter_jsonl(open_decompressed_reader(f, compression)),
+                    batch_size,
+                    columns,
+                    filters,
+                )
+        else:
+            yield from super().load_iter(
+                project_name,
+                layer_name,
+                id,
+                format,
+                content_type,
+                batch_size,
+                columns,
+                filters,
+                compression,
+            )
+
     def save(
         self,
         content: CoveredContentType,
@@ -103,6 +299,8 @@ class GcsDataRepository(DataRepository):
         id: str,
         format: str,
         content_type: ContentType,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
     ):
         """Save the provided content to the specified project, layer, and ID in the given format and content type.
 
@@ -113,6 +311,8 @@ class GcsDataRepository(DataRepository):
             id (str): The ID of the content.
             format (str): The format in which the content should be saved.
             content_type (ContentType): The type of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
 
         Raises:
             ContentExtensionMismatch: If the provided format is not compatible with the content type.
@@ -121,26 +321,65 @@ class GcsDataRepository(DataRepository):
         Returns:
             None
         """
-        path = self._compose_path(project_name, layer_name, id, format)
-        blob = self._bucket.blob(path)
-        if content_type == ContentType.DF:
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        if content_type in [ContentType.ARROW_TABLE, ContentType.POLARS_DF]:
+            table = to_arrow_table(content)
+            self._upload(
+                path,
+                lambda f: write_table(table, f, format, compression, compression_level),
+            )
+        elif content_type == ContentType.DF:
             if format == "csv":
-                data = content.to_csv(index=False)
-                blob.upload_from_string(data)
+                self._upload(
+                    path,
+                    lambda f: write_text(
+                        f,
+                        lambda text: content.to_csv(text, index=False),
+                        compression,
+                        compression_level,
+                    ),
+                )
             elif format == "parquet":
-                buffer = BytesIO()
-                content.to_parquet(buffer, index=False)
-                buffer.seek(0)
-                blob.upload_from_file(buffer)
-                buffer.close()
+                self._upload(
+                    path,
+                    lambda f: content.to_parquet(
+                        f,
+                        index=False,
+                        **compose_columnar_options(compression, compression_level),
+                    ),
+                )
+            elif format in ["feather", "arrow"]:
+                self._upload(
+                    path,
+                    lambda f: write_ipc(content, f, compression, compression_level),
+                )
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
                 )
         elif content_type in [ContentType.DICT, ContentType.DICT_LIST]:
             if format == "json":
-                data = json.dumps(content)
-                blob.upload_from_string(data)
+                self._upload(
+                    path,
+                    lambda f: write_text(
+                        f,
+                        lambda text: json.dump(content, text),
+                        compression,
+                        compression_level,
+                    ),
+                )
+            elif format == "jsonl" and content_type == ContentType.DICT_LIST:
+                self._upload(
+                    path,
+                    lambda f: write_text(
+                        f,
+                        lambda text: write_jsonl(content, text),
+                        compression,
+                        compression_level,
+                    ),
+                )
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
@@ -148,6 +387,124 @@ class GcsDataRepository(DataRepository):
         else:
             raise NotCoveredContentType("This content type is not covered.")
 
+    def save_iter(
+        self,
+        batches: DataFrameStream,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ):
+        """Save DataFrame content batch by batch through a resumable upload. Parquet gets one row group per batch.
+
+        Args:
+            batches (DataFrameStream): The DataFrames or the Arrow record batch reader to be saved.
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+        Raises:
+            ContentExtensionMismatch: If the content can't be saved with the specified extension.
+
+        Returns:
+            None
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        blob = self._bucket.blob(path)
+        if format == "csv":
+            with blob.open("wb", chunk_size=UPLOAD_CHUNK_SIZE) as f:
+                write_text(
+                    f,
+                    lambda text: write_csv_stream(batches, text),
+                    compression,
+                    compression_level,
+                )
+        elif format == "parquet":
+            with blob.open("wb", chunk_size=UPLOAD_CHUNK_SIZE) as f:
+                write_parquet_stream(batches, f, compression, compression_level)
+        elif format in ["feather", "arrow"]:
+            with blob.open("wb", chunk_size=UPLOAD_CHUNK_SIZE) as f:
+                write_ipc_stream(batches, f, compression, compression_level)
+        else:
+            raise ContentExtensionMismatch(
+                "This content can't be saved with this extension."
+            )
+
+    def _download(self, path: str) -> Union[bytes, bytearray]:
+        # The first chunk is downloaded without asking the size first, so a content of one chunk costs a
+        # single request. Only a bigger content is sized, and its other byte ranges are downloaded by
+        # parallel workers into one preallocated buffer.
+        blob = self._bucket.blob(path)
+        try:
+            first_chunk = blob.download_as_bytes(start=0, end=self._chunk_size - 1)
+        except RequestRangeNotSatisfiable:
+            # An empty object has no byte to range over.
+            return b""
+        if len(first_chunk) < self._chunk_size:
+            return first_chunk
+        blob.reload()
+        size = blob.size
+        if size == len(first_chunk):
+            return first_chunk
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        view[: len(first_chunk)] = first_chunk
+
+        def fetch(start: int):
+            end = min(start + self._chunk_size, size) - 1
+            view[start : end + 1] = blob.download_as_bytes(start=start, end=end)
+
+        with ThreadPoolExecutor(max_workers=max(1, self._max_workers)) as executor:
+            list(executor.map(fetch, range(self._chunk_size, size, self._chunk_size)))
+        return buffer
+
+    def _upload(self, path: str, write: Callable[[IO[bytes]], None]):
+        # The content is serialized in memory, and spills into a temporary file only beyond a chunk. A content
+        # bigger than a chunk is uploaded as a parallel composite upload: the slices are uploaded as temporary
+        # objects by parallel workers and composed into the final object.
+        blob = self._bucket.blob(path)
+        with tempfile.SpooledTemporaryFile(max_size=self._chunk_size) as f:
+            write(f)
+            f.flush()
+            size = f.tell()
+            if size <= self._chunk_size or self._max_workers <= 1:
+                f.seek(0)
+                blob.upload_from_file(f, size=size)
+                return
+
+            chunk_size = max(self._chunk_size, -(-size // MAX_COMPOSE_SOURCES))
+            prefix = f"{COMPOSITE_PART_PREFIX}{path}.{uuid4()}.part-"
+            parts = [
+                self._bucket.blob(f"{prefix}{i}") for i in range(-(-size // chunk_size))
+            ]
+
+            # The workers share the file position, so only the reads are serialized, not the uploads.
+            read_lock = threading.Lock()
+
+            def upload_part(i: int):
+                with read_lock:
+                    f.seek(i * chunk_size)
+                    data = f.read(chunk_size)
+                parts[i].upload_from_string(data)
+
+            try:
+                with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                    list(executor.map(upload_part, range(len(parts))))
+                blob.compose(parts)
+            finally:
+                for part in parts:
+                    try:
+                        part.delete()
+                    except NotFound:
+                        pass
+
     def _compose_path(
         self, project_name: str, layer_name: str, id: str, format: str
     ) -> str:
@@ -0,0 +1,83 @@
+import json
+from typing import IO, Any, Iterable, Iterator, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONL_READ_SIZE = 1024 * 1024
+
+
+def iter_jsonl(source: IO[bytes]) -> Iterator[dict]:
+    """Parse the JSON Lines file record by record, so only one block of the file is in memory at a time.
+
+    orjson is used to parse the lines when it is installed. The lines it rejects, such as integers beyond 64 bits
+    or NaN, are parsed by the json module, so the records don't depend on whether orjson is installed.
+
+    Args:
+        source (IO[bytes]): The binary file object of the JSON Lines file.
+
+    Returns:
+        Iterator[dict]: The records. Blank lines are skipped.
+    """
+    rest = b""
+    while True:
+        block = source.read(JSONL_READ_SIZE)
+        if not block:
+            break
+        lines = (rest + block).split(b"\n")
+        rest = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield _loads(line)
+    if rest.strip():
+        yield _loads(rest)
+
+
+def read_jsonl(source: IO[bytes]) -> List[dict]:
+    """Parse the whole JSON Lines file.
+
+    Args:
+        source (IO[bytes]): The binary file object of the JSON Lines file.
+
+    Returns:
+        List[dict]: The records.
+    """
+    return list(iter_jsonl(source))
+
+
+def write_jsonl(records: Iterable[dict], sink: IO[str]):
+    """Write the records to the sink, one compact JSON object per line.
+
+    The records are always written by the json module, so the file is the same whether orjson is installed or not.
+
+    Args:
+        records (Iterable[dict]): The records to be written.
+        sink (IO[str]): The text file object the JSON Lines file is written to.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If a record contains NaN or infinity, which are not valid JSON.
+        TypeError: If a record contains a value which is not serializable to JSON.
+    """
+    for record in records:
+        sink.write(_dumps(record))
+        sink.write("\n")
+
+
+def _loads(line: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(line)
+
+
+def _dumps(record: dict) -> str:
+    return json.dumps(
+        record, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+    )
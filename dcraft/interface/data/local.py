@@ -1,17 +1,57 @@
+import asyncio
 import json
 import os
+from typing import Iterator, List, Optional
 
 import pandas as pd
+import pyarrow as pa
 
 from dcraft.domain.error import ContentExtensionMismatch, NotCoveredContentType
-from dcraft.domain.type.content import CoveredContentType
-from dcraft.domain.type.enum import ContentType
-from dcraft.interface.data.base import DataRepository
+from dcraft.domain.type.content import CoveredContentType, DataFrameStream, Filters
+from dcraft.domain.type.enum import TABULAR_CONTENT_TYPES, ContentType
+from dcraft.interface.data.base import AsyncDataRepository, DataRepository
+from dcraft.interface.data.compression import (
+    compose_columnar_options,
+    compose_file_format,
+    open_decompressed_reader,
+)
+from dcraft.interface.data.jsonl import iter_jsonl, read_jsonl, write_jsonl
+from dcraft.interface.data.query import (
+    DEFAULT_BATCH_SIZE,
+    compose_read_columns,
+    iter_csv_chunks,
+    iter_ipc_batches,
+    iter_parquet_batches,
+    iter_records,
+    query_dataframe,
+)
+from dcraft.interface.data.serializer import write_ipc
+from dcraft.interface.data.stream import (
+    write_csv_stream,
+    write_ipc_stream,
+    write_parquet_stream,
+    write_text,
+)
+from dcraft.interface.data.table import (
+    from_arrow_table,
+    read_table,
+    to_arrow_table,
+    write_table,
+)
 
 
 class LocalDataRepository(DataRepository):
-    def __init__(self, dir_path: str):
+    def __init__(self, dir_path: str, memory_map: bool = False):
+        """Initializes a new instance of the class.
+
+        Args:
+            dir_path (str): The path of the directory where the contents are saved.
+            memory_map (bool, optional): Whether parquet and Arrow IPC files are read through memory mapping.
+                The loaded DataFrames are then Arrow-backed, so the data is not copied into NumPy blocks and
+                processes on the same node share the page cache. Defaults to False.
+        """
         self._dir_path = dir_path
+        self._memory_map = memory_map
 
     def load(
         self,
@@ -20,6 +60,9 @@ class LocalDataRepository(DataRepository):
         id: str,
         format: str,
         content_type: ContentType,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
     ) -> CoveredContentType:
         """Load the content from a specified path based on the project name, layer name, id, format, and content type.
 
@@ -29,6 +72,9 @@ class LocalDataRepository(DataRepository):
             id (str): The ID of the content.
             format (str): The format of the content.
             content_type (ContentType): The type of the content.
+            columns (List[str], optional): The columns to load. Only used for DataFrame content. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Only used for DataFrame content. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
 
         Returns:
             CoveredContentType: The loaded content.
@@ -37,20 +83,58 @@ class LocalDataRepository(DataRepository):
             ContentExtensionMismatch: If the content cannot be saved with the specified extension.
             NotCoveredContentType: If the content type is not covered.
         """
-        path = self._compose_path(project_name, layer_name, id, format)
+        if content_type in [ContentType.ARROW_TABLE, ContentType.POLARS_DF]:
+            table = self.load_table(
+                project_name, layer_name, id, format, columns, filters, compression
+            )
+            return from_arrow_table(table, content_type)
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
         if content_type == ContentType.DF:
             if format == "csv":
-                data = pd.read_csv(path)
+                with open(path, "rb") as f:
+                    data = query_dataframe(
+                        pd.read_csv(
+                            open_decompressed_reader(f, compression),
+                            usecols=compose_read_columns(columns, filters),
+                        ),
+                        columns,
+                        filters,
+                    )
             elif format == "parquet":
-                data = pd.read_parquet(path)
+                if self._memory_map:
+                    data = self.load_table(
+                        project_name,
+                        layer_name,
+                        id,
+                        format,
+                        columns,
+                        filters,
+                        compression,
+                    ).to_pandas(types_mapper=pd.ArrowDtype)
+                else:
+                    data = pd.read_parquet(path, columns=columns, filters=filters)
+            elif format in ["feather", "arrow"]:
+                table = self.load_table(
+                    project_name, layer_name, id, format, columns, filters, compression
+                )
+                data = (
+                    table.to_pandas(types_mapper=pd.ArrowDtype)
+                    if self._memory_map
+                    else table.to_pandas()
+                )
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
                 )
         elif content_type in [ContentType.DICT, ContentType.DICT_LIST]:
             if format == "json":
-                with open(path, "r") as f:
-                    data = json.load(f)
+                with open(path, "rb") as f:
+                    data = json.load(open_decompressed_reader(f, compression))
+            elif format == "jsonl" and content_type == ContentType.DICT_LIST:
+                with open(path, "rb") as f:
+                    data = read_jsonl(open_decompressed_reader(f, compression))
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
@@ -59,6 +143,102 @@ class LocalDataRepository(DataRepository):
             raise NotCoveredContentType("This content type is not covered.")
         return data
 
+    def load_table(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> pa.Table:
+        """Load tabular content as a pyarrow Table, memory mapped if the repository is set up so.
+
+        Args:
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            columns (List[str], optional): The columns to load. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            pa.Table: The loaded content.
+
+        Raises:
+            ContentExtensionMismatch: If the content can't be loaded as a table with the specified extension.
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        return read_table(path, format, columns, filters, compression, self._memory_map)
+
+    def load_iter(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Load the CSV, parquet or JSON Lines content row group by row group, or chunk by chunk.
+
+        Args:
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            content_type (ContentType): The type of the content.
+            batch_size (int, optional): The maximum number of rows in a chunk. Defaults to 65536.
+            columns (List[str], optional): The columns to load. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            Iterator[pd.DataFrame]: The chunks of the content.
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        if content_type in TABULAR_CONTENT_TYPES and format == "csv":
+            with open(path, "rb") as f:
+                yield from iter_csv_chunks(
+                    open_decompressed_reader(f, compression),
+                    batch_size,
+                    columns,
+                    filters,
+                )
+        elif content_type in TABULAR_CONTENT_TYPES and format == "parquet":
+            yield from iter_parquet_batches(path, batch_size, columns, filters)
+        elif content_type in TABULAR_CONTENT_TYPES and format in ["feather", "arrow"]:
+            yield from iter_ipc_batches(path, batch_size, columns, filters)
+        elif content_type == ContentType.DICT_LIST and format == "jsonl":
+            with open(path, "rb") as f:
+                yield from iter_records(
+                    iter_jsonl(open_decompressed_reader(f, compression)),
+                    batch_size,
+                    columns,
+                    filters,
+                )
+        else:
+            yield from super().load_iter(
+                project_name,
+                layer_name,
+                id,
+                format,
+                content_type,
+                batch_size,
+                columns,
+                filters,
+                compression,
+            )
+
     def save(
         self,
         content: CoveredContentType,
@@ -67,6 +247,8 @@ class LocalDataRepository(DataRepository):
         id: str,
         format: str,
         content_type: ContentType,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
     ):
         """Saves the given content to a file with the specified project name, layer name, ID, format, and content type.
 
@@ -77,6 +259,8 @@ class LocalDataRepository(DataRepository):
             id (str): The ID of the content.
             format (str): The format of the file to be saved.
             content_type (ContentType): The type of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
 
         Raises:
             ContentExtensionMismatch: If the content can't be saved with the specified extension.
@@ -85,21 +269,53 @@ class LocalDataRepository(DataRepository):
         Returns:
             None
         """
-        path = self._compose_path(project_name, layer_name, id, format)
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
         self._mkdirs(path)
-        if content_type == ContentType.DF:
+        if content_type in [ContentType.ARROW_TABLE, ContentType.POLARS_DF]:
+            with open(path, "wb") as f:
+                write_table(
+                    to_arrow_table(content), f, format, compression, compression_level
+                )
+        elif content_type == ContentType.DF:
             if format == "csv":
-                content.to_csv(path, index=False)
+                with open(path, "wb") as f:
+                    write_text(
+                        f,
+                        lambda text: content.to_csv(text, index=False),
+                        compression,
+                        compression_level,
+                    )
             elif format == "parquet":
-                content.to_parquet(path, index=False)
+                content.to_parquet(
+                    path,
+                    index=False,
+                    **compose_columnar_options(compression, compression_level),
+                )
+            elif format in ["feather", "arrow"]:
+                write_ipc(content, path, compression, compression_level)
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
                 )
         elif content_type in [ContentType.DICT, ContentType.DICT_LIST]:
             if format == "json":
-                with open(path, "w") as f:
-                    json.dump(content, f)
+                with open(path, "wb") as f:
+                    write_text(
+                        f,
+                        lambda text: json.dump(content, text),
+                        compression,
+                        compression_level,
+                    )
+            elif format == "jsonl" and content_type == ContentType.DICT_LIST:
+                with open(path, "wb") as f:
+                    write_text(
+                        f,
+                        lambda text: write_jsonl(content, text),
+                        compression,
+                        compression_level,
+                    )
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
@@ -107,6 +323,56 @@ class LocalDataRepository(DataRepository):
         else:
             raise NotCoveredContentType("This content type is not covered.")
 
+    def save_iter(
+        self,
+        batches: DataFrameStream,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ):
+        """Save DataFrame content batch by batch. Parquet gets one row group per batch.
+
+        Args:
+            batches (DataFrameStream): The DataFrames or the Arrow record batch reader to be saved.
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+        Raises:
+            ContentExtensionMismatch: If the content can't be saved with the specified extension.
+
+        Returns:
+            None
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        self._mkdirs(path)
+        if format == "csv":
+            with open(path, "wb") as f:
+                write_text(
+                    f,
+                    lambda text: write_csv_stream(batches, text),
+                    compression,
+                    compression_level,
+                )
+        elif format == "parquet":
+            with open(path, "wb") as f:
+                write_parquet_stream(batches, f, compression, compression_level)
+        elif format in ["feather", "arrow"]:
+            with open(path, "wb") as f:
+                write_ipc_stream(batches, f, compression, compression_level)
+        else:
+            raise ContentExtensionMismatch(
+                "This content can't be saved with this extension."
+            )
+
     def _mkdirs(self, path: str):
         os.makedirs(os.path.dirname(path), exist_ok=True)
 
@@ -117,3 +383,106 @@ class LocalDataRepository(DataRepository):
             f"{os.path.join(self._dir_path, project_name, layer_name, id)}.{format}"
         )
         return file_path
+
+
+class AsyncLocalDataRepository(AsyncDataRepository):
+    def __init__(self, dir_path: str, memory_map: bool = False):
+        """Initializes a new instance of the class.
+
+        Local files have no non-blocking API, so the file I/O runs on the default executor of the event loop.
+
+        Args:
+            dir_path (str): The path of the directory where the contents are saved.
+            memory_map (bool, optional): Whether parquet and Arrow IPC files are read through memory mapping. Defaults to False.
+        """
+        self._dir_path = dir_path
+        self._repository = LocalDataRepository(dir_path, memory_map)
+
+    async def load(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> CoveredContentType:
+        """Load the content from a specified path based on the project name, layer name, id, format, and content type.
+
+        Args:
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            content_type (ContentType): The type of the content.
+            columns (List[str], optional): The columns to load. Only used for DataFrame content. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Only used for DataFrame content. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            CoveredContentType: The loaded content.
+
+        Raises:
+            ContentExtensionMismatch: If the content cannot be saved with the specified extension.
+            NotCoveredContentType: If the content type is not covered.
+        """
+        return await asyncio.to_thread(
+            self._repository.load,
+            project_name,
+            layer_name,
+            id,
+            format,
+            content_type,
+            columns,
+            filters,
+            compression,
+        )
+
+    async def save(
+        self,
+        content: CoveredContentType,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ):
+        """Saves the given content to a file with the specified project name, layer name, ID, format, and content type.
+
+        Args:
+            content (CoveredContentType): The content to be saved.
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the file to be saved.
+            content_type (ContentType): The type of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+        Raises:
+            ContentExtensionMismatch: If the content can't be saved with the specified extension.
+            NotCoveredContentType: If the content type is not covered.
+
+        Returns:
+            None
+        """
+        await asyncio.to_thread(
+            self._repository.save,
+            content,
+            project_name,
+            layer_name,
+            id,
+            format,
+            content_type,
+            compression,
+            compression_level,
+        )
+
+    def _compose_path(
+        self, project_name: str, layer_name: str, id: str, format: str
+    ) -> str:
+        return self._repository._compose_path(project_name, layer_name, id, format)
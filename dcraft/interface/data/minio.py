@@ -1,16 +1,65 @@
 import json
-from io import BytesIO, StringIO
-from typing import Optional
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BufferedReader, BytesIO, RawIOBase
+from typing import IO, Callable, Iterator, List, Optional
 
 import pandas as pd
+import pyarrow as pa
 from minio import Minio
 from minio.credentials.providers import Provider
+from minio.error import S3Error
 from urllib3 import PoolManager
 
 from dcraft.domain.error import ContentExtensionMismatch, NotCoveredContentType
-from dcraft.domain.type.content import CoveredContentType
-from dcraft.domain.type.enum import ContentType
+from dcraft.domain.type.content import CoveredContentType, DataFrameStream, Filters
+from dcraft.domain.type.enum import TABULAR_CONTENT_TYPES, ContentType
 from dcraft.interface.data.base import DataRepository
+from dcraft.interface.data.compression import (
+    compose_columnar_options,
+    compose_file_format,
+    open_decompressed_reader,
+)
+from dcraft.interface.data.jsonl import iter_jsonl, read_jsonl, write_jsonl
+from dcraft.interface.data.query import (
+    DEFAULT_BATCH_SIZE,
+    compose_read_columns,
+    iter_csv_chunks,
+    iter_ipc_batches,
+    iter_parquet_batches,
+    iter_records,
+    query_dataframe,
+    read_ipc_table,
+)
+from dcraft.interface.data.serializer import write_ipc
+from dcraft.interface.data.stream import (
+    write_csv_stream,
+    write_ipc_stream,
+    write_parquet_stream,
+    write_text,
+)
+from dcraft.interface.data.table import (
+    from_arrow_table,
+    read_table,
+    to_arrow_table,
+    write_table,
+)
+
+TABLE_MIME_TYPES = {
+    "csv": "text/csv",
+    "feather": "application/vnd.apache.arrow.file",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+PARQUET_RANGE_READ_SIZE = 1024 * 1024
+
+MULTIPART_PART_SIZE = 16 * 1024 * 1024
+
+# The limits of the part size of a multipart upload in S3 and MinIO.
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+
+DOWNLOAD_READ_SIZE = 1024 * 1024
 
 
 class MinioRepository(DataRepository):
@@ -26,6 +75,8 @@ class MinioRepository(DataRepository):
         http_client: Optional[PoolManager] = None,
         credentials: Optional[Provider] = None,
         cert_check: bool = True,
+        part_size: int = MULTIPART_PART_SIZE,
+        parallel: int = 4,
     ):
         """
         Initializes the MinioClient object.
@@ -41,10 +92,18 @@ class MinioRepository(DataRepository):
             http_client (PoolManager, optional): The HTTP client. Defaults to None.
             credentials (Provider, optional): The credentials provider. Defaults to None.
             cert_check (bool, optional): Whether to check the server's SSL certificate. Defaults to True.
+            part_size (int, optional): The size in bytes of a part of the multipart uploads and the ranged downloads.
+                Contents smaller than one part are uploaded with a single request. Defaults to 16 MiB.
+            parallel (int, optional): The number of parts uploaded or downloaded in parallel. Defaults to 4.
 
         Returns:
             None
+
+        Raises:
+            ValueError: If the part size is not between 5 MiB and 5 GiB, the limits of multipart uploads.
         """
+        if not MIN_PART_SIZE <= part_size <= MAX_PART_SIZE:
+            raise ValueError("part_size must be between 5 MiB and 5 GiB.")
         # TODO: Accept parameters which Minio gets
         self._client = Minio(
             endpoint=endpoint,
@@ -58,6 +117,8 @@ class MinioRepository(DataRepository):
             cert_check=cert_check,
         )
         self._bucket = bucket
+        self._part_size = part_size
+        self._parallel = parallel
 
     def load(
         self,
@@ -66,6 +127,9 @@ class MinioRepository(DataRepository):
         id: str,
         format: str,
         content_type: ContentType,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
     ) -> CoveredContentType:
         """Load the specified content from the given project, layer, and ID.
 
@@ -75,6 +139,9 @@ class MinioRepository(DataRepository):
             id (str): The ID of the content.
             format (str): The format of the content.
             content_type (ContentType): The type of the content.
+            columns (List[str], optional): The columns to load. Only used for DataFrame content. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Only used for DataFrame content. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
 
         Returns:
             CoveredContentType: The loaded content.
@@ -82,32 +149,175 @@ class MinioRepository(DataRepository):
         Raises:
             ContentExtensionMismatch: If the content cannot be saved with the given extension.
         """
-        path = self._compose_path(project_name, layer_name, id, format)
+        if content_type in [ContentType.ARROW_TABLE, ContentType.POLARS_DF]:
+            table = self.load_table(
+                project_name, layer_name, id, format, columns, filters, compression
+            )
+            return from_arrow_table(table, content_type)
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
         if content_type == ContentType.DF:
             if format == "csv":
-                object = (
-                    self._client.get_object(self._bucket, path).read().decode("utf-8")
+                object = self._download(path)
+                data = query_dataframe(
+                    pd.read_csv(
+                        open_decompressed_reader(object, compression),
+                        usecols=compose_read_columns(columns, filters),
+                    ),
+                    columns,
+                    filters,
                 )
-                data = pd.read_csv(StringIO(object))
             elif format == "parquet":
-                object = self._client.get_object(self._bucket, path).read()
-                data = pd.read_parquet(BytesIO(object))
+                if columns is None and filters is None:
+                    object = self._download(path)
+                    data = pd.read_parquet(pa.BufferReader(object))
+                else:
+                    # Ranged reads fetch only the footer and the needed column chunks and row groups.
+                    with BufferedReader(
+                        _MinioObjectReader(self._client, self._bucket, path),
+                        buffer_size=PARQUET_RANGE_READ_SIZE,
+                    ) as f:
+                        data = pd.read_parquet(f, columns=columns, filters=filters)
+            elif format in ["feather", "arrow"]:
+                object = self._download(path)
+                data = read_ipc_table(
+                    pa.BufferReader(object), columns, filters
+                ).to_pandas()
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
                 )
         elif content_type in [ContentType.DICT, ContentType.DICT_LIST]:
             if format == "json":
-                object = (
-                    self._client.get_object(self._bucket, path).read().decode("utf-8")
-                )
-                data = json.loads(object)
+                object = self._download(path)
+                data = json.load(open_decompressed_reader(object, compression))
+            elif format == "jsonl" and content_type == ContentType.DICT_LIST:
+                object = self._download(path)
+                data = read_jsonl(open_decompressed_reader(object, compression))
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
                 )
         return data
 
+    def load_table(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> pa.Table:
+        """Load tabular content from the bucket as a pyarrow Table, without converting it to pandas.
+
+        Args:
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            columns (List[str], optional): The columns to load. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            pa.Table: The loaded content.
+
+        Raises:
+            ContentExtensionMismatch: If the content can't be loaded as a table with the specified extension.
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        if format == "parquet" and (columns is not None or filters is not None):
+            with BufferedReader(
+                _MinioObjectReader(self._client, self._bucket, path),
+                buffer_size=PARQUET_RANGE_READ_SIZE,
+            ) as f:
+                return read_table(f, format, columns, filters)
+        return read_table(self._download(path), format, columns, filters, compression)
+
+    def load_iter(
+        self,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        content_type: ContentType,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        compression: Optional[str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream the CSV, parquet or JSON Lines content from the bucket chunk by chunk.
+
+        Args:
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            content_type (ContentType): The type of the content.
+            batch_size (int, optional): The maximum number of rows in a chunk. Defaults to 65536.
+            columns (List[str], optional): The columns to load. Defaults to None, all the columns.
+            filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+            compression (str, optional): The compression codec the content was saved with. Defaults to None.
+
+        Returns:
+            Iterator[pd.DataFrame]: The chunks of the content.
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        if content_type in TABULAR_CONTENT_TYPES and format == "csv":
+            response = self._client.get_object(self._bucket, path)
+            try:
+                yield from iter_csv_chunks(
+                    open_decompressed_reader(response, compression),
+                    batch_size,
+                    columns,
+                    filters,
+                )
+            finally:
+                response.close()
+                response.release_conn()
+        elif content_type in TABULAR_CONTENT_TYPES and format == "parquet":
+            with BufferedReader(
+                _MinioObjectReader(self._client, self._bucket, path),
+                buffer_size=PARQUET_RANGE_READ_SIZE,
+            ) as f:
+                yield from iter_parquet_batches(f, batch_size, columns, filters)
+        elif content_type in TABULAR_CONTENT_TYPES and format in ["feather", "arrow"]:
+            object = self._download(path)
+            yield from iter_ipc_batches(
+                pa.BufferReader(object), batch_size, columns, filters
+            )
+        elif content_type == ContentType.DICT_LIST and format == "jsonl":
+            response = self._client.get_object(self._bucket, path)
+            try:
+                yield from iter_records(
+                    iter_jsonl(open_decompressed_reader(response, compression)),
+                    batch_size,
+                    columns,
+                    filters,
+                )
+            finally:
+                response.close()
+                response.release_conn()
+        else:
+            yield from super().load_iter(
+                project_name,
+                layer_name,
+                id,
+                format,
+                content_type,
+                batch_size,
+                columns,
+                filters,
+                compression,
+            )
+
     def save(
         self,
         content: CoveredContentType,
@@ -116,6 +326,8 @@ class MinioRepository(DataRepository):
         id: str,
         format: str,
         content_type: ContentType,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
     ):
         """Save the content to a specified location in the bucket.
 
@@ -126,29 +338,79 @@ class MinioRepository(DataRepository):
             id (str): The unique identifier.
             format (str): The format of the content.
             content_type (ContentType): The type of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
 
         Raises:
             ContentExtensionMismatch: If the content cannot be saved with the given extension.
             NotCoveredContentType: If the content type is not supported.
 
         """
-        path = self._compose_path(project_name, layer_name, id, format)
-        if content_type == ContentType.DF:
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        if content_type in [ContentType.ARROW_TABLE, ContentType.POLARS_DF]:
+            table = to_arrow_table(content)
+            self._put_stream(
+                path,
+                lambda f: write_table(table, f, format, compression, compression_level),
+                TABLE_MIME_TYPES.get(format, "application/octet-stream"),
+            )
+        elif content_type == ContentType.DF:
             if format == "csv":
-                data = content.to_csv(index=False).encode("utf-8")
-                self._client.put_object(self._bucket, path, BytesIO(data), len(data))
-
+                self._put_stream(
+                    path,
+                    lambda f: write_text(
+                        f,
+                        lambda text: content.to_csv(text, index=False),
+                        compression,
+                        compression_level,
+                    ),
+                    "text/csv",
+                )
             elif format == "parquet":
-                data = content.to_parquet(index=False)
-                self._client.put_object(self._bucket, path, BytesIO(data), len(data))
+                self._put_stream(
+                    path,
+                    lambda f: content.to_parquet(
+                        f,
+                        index=False,
+                        **compose_columnar_options(compression, compression_level),
+                    ),
+                    "application/octet-stream",
+                )
+            elif format in ["feather", "arrow"]:
+                self._put_stream(
+                    path,
+                    lambda f: write_ipc(content, f, compression, compression_level),
+                    "application/vnd.apache.arrow.file",
+                )
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
                 )
         elif content_type in [ContentType.DICT, ContentType.DICT_LIST]:
             if format == "json":
-                data = json.dumps(content).encode("utf-8")
-                self._client.put_object(self._bucket, path, BytesIO(data), len(data))
+                self._put_stream(
+                    path,
+                    lambda f: write_text(
+                        f,
+                        lambda text: json.dump(content, text),
+                        compression,
+                        compression_level,
+                    ),
+                    "application/json",
+                )
+            elif format == "jsonl" and content_type == ContentType.DICT_LIST:
+                self._put_stream(
+                    path,
+                    lambda f: write_text(
+                        f,
+                        lambda text: write_jsonl(content, text),
+                        compression,
+                        compression_level,
+                    ),
+                    "application/jsonl",
+                )
             else:
                 raise ContentExtensionMismatch(
                     "This content can't be saved with this extension."
@@ -156,7 +418,335 @@ class MinioRepository(DataRepository):
         else:
             raise NotCoveredContentType("This content type is not covered.")
 
+    def save_iter(
+        self,
+        batches: DataFrameStream,
+        project_name: str,
+        layer_name: str,
+        id: str,
+        format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ):
+        """Save DataFrame content batch by batch through a multipart upload. Parquet gets one row group per batch.
+
+        Args:
+            batches (DataFrameStream): The DataFrames or the Arrow record batch reader to be saved.
+            project_name (str): The name of the project.
+            layer_name (str): The name of the layer.
+            id (str): The ID of the content.
+            format (str): The format of the content.
+            compression (str, optional): The compression codec. Defaults to None, the default of the format.
+            compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+        Raises:
+            ContentExtensionMismatch: If the content can't be saved with the specified extension.
+
+        Returns:
+            None
+        """
+        path = self._compose_path(
+            project_name, layer_name, id, compose_file_format(format, compression)
+        )
+        if format == "csv":
+            self._put_stream(
+                path,
+                lambda f: write_text(
+                    f,
+                    lambda text: write_csv_stream(batches, text),
+                    compression,
+                    compression_level,
+                ),
+                "text/csv",
+            )
+        elif format == "parquet":
+            self._put_stream(
+                path,
+                lambda f: write_parquet_stream(
+                    batches, f, compression, compression_level
+                ),
+                "application/octet-stream",
+            )
+        elif format in ["feather", "arrow"]:
+            self._put_stream(
+                path,
+                lambda f: write_ipc_stream(batches, f, compression, compression_level),
+                "application/vnd.apache.arrow.file",
+            )
+        else:
+            raise ContentExtensionMismatch(
+                "This content can't be saved with this extension."
+            )
+
+    def _put_stream(
+        self, path: str, write: Callable[[IO[bytes]], None], content_type: str
+    ):
+        # The content is serialized in memory and sent with a single request while it is smaller than one part.
+        # Beyond that, it goes through a pipe which put_object reads as a multipart upload of unknown length,
+        # so only the parts being uploaded are buffered, instead of copies of the whole payload.
+        writer = _SpillingWriter(
+            self._part_size,
+            lambda reader: self._client.put_object(
+                self._bucket,
+                path,
+                reader,
+                -1,
+                content_type=content_type,
+                part_size=self._part_size,
+                num_parallel_uploads=self._parallel,
+            ),
+        )
+        try:
+            write(writer)
+        except BaseException as e:
+            writer.abort(e)
+            raise
+        data = writer.finish()
+        if data is not None:
+            self._client.put_object(
+                self._bucket,
+                path,
+                BytesIO(data),
+                len(data),
+                content_type=content_type,
+            )
+
+    def _download(self, path: str) -> bytearray:
+        # The first part is fetched without a stat_object, and its Content-Range gives the size of the object,
+        # so a content of one part costs a single request. The other parts are fetched by parallel workers.
+        # They all write into one preallocated buffer, so the payload is never concatenated or decoded as a whole.
+        try:
+            response = self._client.get_object(
+                self._bucket, path, offset=0, length=self._part_size
+            )
+        except S3Error as e:
+            if e.code == "InvalidRange":
+                # An empty object has no byte to range over.
+                return bytearray()
+            raise
+        try:
+            size = _parse_object_size(response.headers.get("Content-Range"))
+            if size is None:
+                # The whole object was sent.
+                return bytearray(response.read())
+            buffer = bytearray(size)
+            view = memoryview(buffer)
+            _read_into(response, view, 0)
+        finally:
+            response.close()
+            response.release_conn()
+
+        def fetch(offset: int):
+            length = min(self._part_size, size - offset)
+            response = self._client.get_object(
+                self._bucket, path, offset=offset, length=length
+            )
+            try:
+                _read_into(response, view, offset)
+            finally:
+                response.close()
+                response.release_conn()
+
+        offsets = range(self._part_size, size, self._part_size)
+        if offsets:
+            with ThreadPoolExecutor(max_workers=max(1, self._parallel)) as executor:
+                list(executor.map(fetch, offsets))
+        return buffer
+
     def _compose_path(
         self, project_name: str, layer_name: str, id: str, format: str
     ) -> str:
         return f"{project_name}/{layer_name}/{id}.{format}"
+
+
+def _parse_object_size(content_range: Optional[str]) -> Optional[int]:
+    # e.g. "bytes 0-99/1234". The size is None if the header is missing or the size is unknown.
+    if not content_range or "/" not in content_range:
+        return None
+    size = content_range.rsplit("/", 1)[1]
+    return int(size) if size.isdigit() else None
+
+
+def _read_into(response, view: memoryview, position: int):
+    for chunk in response.stream(DOWNLOAD_READ_SIZE):
+        view[position : position + len(chunk)] = chunk
+        position += len(chunk)
+
+
+class _MinioObjectReader(RawIOBase):
+    # The first request reads the tail of the object, where the parquet footer is, with a suffix range.
+    # Its Content-Range gives the size of the object, so no stat_object is needed.
+    def __init__(self, client: Minio, bucket: str, path: str):
+        self._client = client
+        self._bucket = bucket
+        self._path = path
+        self._size: Optional[int] = None
+        self._tail = b""
+        self._tail_start = 0
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 0:
+            self._position = offset
+        elif whence == 1:
+            self._position += offset
+        else:
+            self._position = self._get_size() + offset
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        length = min(len(buffer), self._get_size() - self._position)
+        if length <= 0:
+            return 0
+        if self._position >= self._tail_start:
+            start = self._position - self._tail_start
+            data = self._tail[start : start + length]
+        else:
+            response = self._client.get_object(
+                self._bucket, self._path, offset=self._position, length=length
+            )
+            try:
+                data = response.read()
+            finally:
+                response.close()
+                response.release_conn()
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def _get_size(self) -> int:
+        if self._size is not None:
+            return self._size
+        try:
+            response = self._client.get_object(
+                self._bucket,
+                self._path,
+                request_headers={"Range": f"bytes=-{PARQUET_RANGE_READ_SIZE}"},
+            )
+        except S3Error as e:
+            if e.code != "InvalidRange":
+                raise
+            self._size = 0
+            return self._size
+        try:
+            self._tail = response.read()
+            size = _parse_object_size(response.headers.get("Content-Range"))
+        finally:
+            response.close()
+            response.release_conn()
+        self._size = size if size is not None else len(self._tail)
+        self._tail_start = self._size - len(self._tail)
+        return self._size
+
+
+class _PipeReader(RawIOBase):
+    def __init__(self, reader: IO[bytes], check: Callable[[], None]):
+        self._reader = reader
+        self._check = check
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._reader.read(size)
+        if not data:
+            # Raises the exception of the writer, so a partly written content is not committed.
+            self._check()
+        return data
+
+    def close(self):
+        self._reader.close()
+        super().close()
+
+
+class _SpillingWriter(RawIOBase):
+    def __init__(self, threshold: int, upload: Callable[[IO[bytes]], None]):
+        self._threshold = threshold
+        self._upload = upload
+        self._buffer: Optional[BytesIO] = BytesIO()
+        self._pipe: Optional[IO[bytes]] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._future: Optional[Future] = None
+        self._error: Optional[BaseException] = None
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self._pipe is not None:
+            self._pipe.write(data)
+        else:
+            self._buffer.write(data)
+            if self._buffer.tell() > self._threshold:
+                self._spill()
+        return len(data)
+
+    def finish(self) -> Optional[bytes]:
+        """Get the written bytes if they fit in one part, or wait for the multipart upload they were spilled to.
+
+        Returns:
+            Optional[bytes]: The written bytes, or None if they were uploaded.
+        """
+        if self._pipe is None:
+            return self._buffer.getvalue()
+        self._close_pipe()
+        return None
+
+    def abort(self, error: BaseException):
+        """Make the multipart upload fail with the error of the writer, so nothing is committed.
+
+        Args:
+            error (BaseException): The error raised while writing.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: The error of the upload, if the writer failed because the upload stopped reading.
+        """
+        self._error = error
+        if self._pipe is None:
+            return
+        try:
+            self._close_pipe()
+        except BaseException as upload_error:
+            if isinstance(error, BrokenPipeError) and upload_error is not error:
+                raise upload_error from error
+
+    def _spill(self):
+        read_fd, write_fd = os.pipe()
+        self._pipe = os.fdopen(write_fd, "wb")
+        reader = _PipeReader(os.fdopen(read_fd, "rb"), self._check)
+
+        def upload():
+            # The read end is closed on a failure, so the writer isn't blocked on a full pipe.
+            with reader:
+                self._upload(reader)
+
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._future = self._executor.submit(upload)
+        data, self._buffer = self._buffer.getvalue(), None
+        self._pipe.write(data)
+
+    def _check(self):
+        if self._error is not None:
+            raise self._error
+
+    def _close_pipe(self):
+        try:
+            self._pipe.close()
+        except BrokenPipeError:
+            pass
+        try:
+            self._future.result()
+        finally:
+            self._executor.shutdown()
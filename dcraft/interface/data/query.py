@@ -0,0 +1,257 @@
+from typing import IO, Iterator, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from dcraft.domain.type.content import Filters
+
+DEFAULT_BATCH_SIZE = 65536
+
+
+def compose_read_columns(
+    columns: Optional[List[str]], filters: Optional[Filters]
+) -> Optional[List[str]]:
+    """Compose the columns which have to be read to project and filter the rows.
+
+    Args:
+        columns (List[str], optional): The columns to be returned.
+        filters (Filters, optional): The row filters.
+
+    Returns:
+        Optional[List[str]]: The columns to be read. None means all the columns.
+    """
+    if columns is None:
+        return None
+    filter_columns = [column for column, _, _ in _to_dnf(filters)]
+    return list(dict.fromkeys(columns + filter_columns))
+
+
+def query_dataframe(
+    data: pd.DataFrame, columns: Optional[List[str]], filters: Optional[Filters]
+) -> pd.DataFrame:
+    """Filter the rows and project the columns of the DataFrame, the same way as parquet reads do.
+
+    Args:
+        data (pd.DataFrame): The DataFrame to be queried.
+        columns (List[str], optional): The columns to be returned. None means all the columns.
+        filters (Filters, optional): The row filters. None means all the rows.
+
+    Returns:
+        pd.DataFrame: The queried DataFrame.
+    """
+    if filters:
+        mask = pd.Series(False, index=data.index)
+        for conjunction in _to_dnf_groups(filters):
+            conjunction_mask = pd.Series(True, index=data.index)
+            for column, operator, value in conjunction:
+                conjunction_mask &= _compare(data[column], operator, value)
+            mask |= conjunction_mask
+        data = data[mask].reset_index(drop=True)
+    if columns is not None:
+        data = data[columns]
+    return data
+
+
+def iter_parquet_batches(
+    source: Union[str, IO[bytes]],
+    batch_size: int,
+    columns: Optional[List[str]],
+    filters: Optional[Filters],
+) -> Iterator[pd.DataFrame]:
+    """Read the parquet file batch by batch, so only one batch is in memory at a time.
+
+    Args:
+        source (Union[str, IO[bytes]]): The path or the seekable file object of the parquet file.
+        batch_size (int): The maximum number of rows in a batch.
+        columns (List[str], optional): The columns to be returned. None means all the columns.
+        filters (Filters, optional): The row filters. None means all the rows.
+
+    Returns:
+        Iterator[pd.DataFrame]: The batches. Batches without any row left after filtering are skipped.
+    """
+    parquet_file = pq.ParquetFile(source)
+    for batch in parquet_file.iter_batches(
+        batch_size=batch_size, columns=compose_read_columns(columns, filters)
+    ):
+        data = query_dataframe(batch.to_pandas(), columns, filters)
+        if len(data) > 0:
+            yield data
+
+
+def read_ipc_table(
+    source: Union[str, IO[bytes], pa.NativeFile],
+    columns: Optional[List[str]],
+    filters: Optional[Filters],
+    memory_map: bool = False,
+) -> pa.Table:
+    """Read the Arrow IPC (feather) file as a pyarrow Table. Compressed files are decompressed transparently.
+
+    Args:
+        source (Union[str, IO[bytes], pa.NativeFile]): The path or the seekable file object of the IPC file.
+        columns (List[str], optional): The columns to be returned. None means all the columns.
+        filters (Filters, optional): The row filters. None means all the rows.
+        memory_map (bool, optional): Whether the file at the path is memory mapped. Defaults to False.
+
+    Returns:
+        pa.Table: The read table.
+    """
+    table = feather.read_table(
+        source,
+        columns=compose_read_columns(columns, filters),
+        memory_map=memory_map,
+    )
+    if filters:
+        table = table.filter(pq.filters_to_expression(filters))
+    if columns is not None:
+        table = table.select(columns)
+    return table
+
+
+def iter_ipc_batches(
+    source: Union[str, IO[bytes], pa.NativeFile],
+    batch_size: int,
+    columns: Optional[List[str]],
+    filters: Optional[Filters],
+) -> Iterator[pd.DataFrame]:
+    """Read the Arrow IPC (feather) file record batch by record batch.
+
+    Args:
+        source (Union[str, IO[bytes], pa.NativeFile]): The path or the seekable file object of the IPC file.
+        batch_size (int): The maximum number of rows in a batch.
+        columns (List[str], optional): The columns to be returned. None means all the columns.
+        filters (Filters, optional): The row filters. None means all the rows.
+
+    Returns:
+        Iterator[pd.DataFrame]: The batches. Batches without any row left after filtering are skipped.
+    """
+    if isinstance(source, str):
+        # The mapping is closed even if the iteration is abandoned, when the generator is closed.
+        with pa.memory_map(source) as mapped_source:
+            yield from iter_ipc_batches(mapped_source, batch_size, columns, filters)
+        return
+    read_columns = compose_read_columns(columns, filters)
+    reader = pa.ipc.open_file(source)
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        if read_columns is not None:
+            batch = batch.select(read_columns)
+        for offset in range(0, batch.num_rows, batch_size):
+            data = query_dataframe(
+                batch.slice(offset, batch_size).to_pandas(), columns, filters
+            )
+            if len(data) > 0:
+                yield data
+
+
+def iter_csv_chunks(
+    source: Union[str, IO],
+    batch_size: int,
+    columns: Optional[List[str]],
+    filters: Optional[Filters],
+) -> Iterator[pd.DataFrame]:
+    """Parse the CSV file chunk by chunk, so only one chunk is in memory at a time.
+
+    Args:
+        source (Union[str, IO]): The path or the file object of the CSV file.
+        batch_size (int): The maximum number of rows in a chunk.
+        columns (List[str], optional): The columns to be returned. None means all the columns.
+        filters (Filters, optional): The row filters. None means all the rows.
+
+    Returns:
+        Iterator[pd.DataFrame]: The chunks. Chunks without any row left after filtering are skipped.
+    """
+    with pd.read_csv(
+        source, chunksize=batch_size, usecols=compose_read_columns(columns, filters)
+    ) as reader:
+        for chunk in reader:
+            data = query_dataframe(chunk.reset_index(drop=True), columns, filters)
+            if len(data) > 0:
+                yield data
+
+
+def iter_records(
+    records: Iterator[dict],
+    batch_size: int,
+    columns: Optional[List[str]],
+    filters: Optional[Filters],
+) -> Iterator[pd.DataFrame]:
+    """Group the records into DataFrames of at most batch_size rows.
+
+    Args:
+        records (Iterator[dict]): The records.
+        batch_size (int): The maximum number of rows in a DataFrame.
+        columns (List[str], optional): The columns to be returned. None means all the columns.
+        filters (Filters, optional): The row filters. None means all the rows.
+
+    Returns:
+        Iterator[pd.DataFrame]: The DataFrames. DataFrames without any row left after filtering are skipped.
+    """
+    batch: List[dict] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            data = query_dataframe(
+                _records_to_dataframe(batch, columns, filters), columns, filters
+            )
+            batch = []
+            if len(data) > 0:
+                yield data
+    if batch:
+        data = query_dataframe(
+            _records_to_dataframe(batch, columns, filters), columns, filters
+        )
+        if len(data) > 0:
+            yield data
+
+
+def _records_to_dataframe(
+    records: List[dict], columns: Optional[List[str]], filters: Optional[Filters]
+) -> pd.DataFrame:
+    data = pd.DataFrame.from_records(records)
+    # Records don't have to share their keys, so a key missing from the whole batch is read as nulls.
+    queried_columns = list(columns or []) + [
+        column for column, _, _ in _to_dnf(filters)
+    ]
+    missing_columns = [
+        column
+        for column in dict.fromkeys(queried_columns)
+        if column not in data.columns
+    ]
+    if missing_columns:
+        data = data.reindex(columns=[*data.columns, *missing_columns])
+    return data
+
+
+def _to_dnf_groups(filters: Optional[Filters]) -> List[list]:
+    if not filters:
+        return []
+    if isinstance(filters[0], tuple):
+        return [list(filters)]
+    return [list(conjunction) for conjunction in filters]
+
+
+def _to_dnf(filters: Optional[Filters]) -> list:
+    return [term for conjunction in _to_dnf_groups(filters) for term in conjunction]
+
+
+def _compare(series: pd.Series, operator: str, value) -> pd.Series:
+    if operator in ["=", "=="]:
+        return series == value
+    elif operator == "!=":
+        return series != value
+    elif operator == "<":
+        return series < value
+    elif operator == "<=":
+        return series <= value
+    elif operator == ">":
+        return series > value
+    elif operator == ">=":
+        return series >= value
+    elif operator == "in":
+        return series.isin(value)
+    elif operator == "not in":
+        return ~series.isin(value)
+    else:
+        raise ValueError(f"Unknown filter operator: {operator}")
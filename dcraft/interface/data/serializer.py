@@ -0,0 +1,180 @@
+import json
+from io import BytesIO, StringIO
+from typing import IO, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from dcraft.domain.error import ContentExtensionMismatch, NotCoveredContentType
+from dcraft.domain.type.content import CoveredContentType, Filters
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.data.compression import (
+    compose_columnar_options,
+    compress,
+    is_compressed_as_file,
+    open_decompressed_reader,
+)
+from dcraft.interface.data.jsonl import read_jsonl, write_jsonl
+from dcraft.interface.data.query import (
+    compose_read_columns,
+    query_dataframe,
+    read_ipc_table,
+)
+from dcraft.interface.data.table import (
+    from_arrow_table,
+    read_table,
+    to_arrow_table,
+    write_table,
+)
+
+
+def serialize(
+    content: CoveredContentType,
+    format: str,
+    content_type: ContentType,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> bytes:
+    """Serialize the content to bytes in the given format.
+
+    Args:
+        content (CoveredContentType): The content to be serialized.
+        format (str): The format of the serialized content.
+        content_type (ContentType): The type of the content.
+        compression (str, optional): The compression codec. Defaults to None, the default of the format.
+        compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+    Returns:
+        bytes: The serialized content.
+
+    Raises:
+        ContentExtensionMismatch: If the content can't be serialized with the format.
+        NotCoveredContentType: If the content type is not covered.
+    """
+    if compression is not None and is_compressed_as_file(format):
+        return compress(
+            serialize(content, format, content_type), compression, compression_level
+        )
+    if content_type in [ContentType.ARROW_TABLE, ContentType.POLARS_DF]:
+        sink = pa.BufferOutputStream()
+        write_table(
+            to_arrow_table(content), sink, format, compression, compression_level
+        )
+        return sink.getvalue().to_pybytes()
+    elif content_type == ContentType.DF:
+        if format == "csv":
+            return content.to_csv(index=False).encode("utf-8")
+        elif format == "parquet":
+            return content.to_parquet(
+                index=False, **compose_columnar_options(compression, compression_level)
+            )
+        elif format in ["feather", "arrow"]:
+            sink = pa.BufferOutputStream()
+            write_ipc(content, sink, compression, compression_level)
+            return sink.getvalue().to_pybytes()
+        else:
+            raise ContentExtensionMismatch(
+                "This content can't be saved with this extension."
+            )
+    elif content_type in [ContentType.DICT, ContentType.DICT_LIST]:
+        if format == "json":
+            return json.dumps(content).encode("utf-8")
+        elif format == "jsonl" and content_type == ContentType.DICT_LIST:
+            sink = StringIO()
+            write_jsonl(content, sink)
+            return sink.getvalue().encode("utf-8")
+        else:
+            raise ContentExtensionMismatch(
+                "This content can't be saved with this extension."
+            )
+    else:
+        raise NotCoveredContentType("This content type is not covered.")
+
+
+def deserialize(
+    data: bytes,
+    format: str,
+    content_type: ContentType,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None,
+    compression: Optional[str] = None,
+) -> CoveredContentType:
+    """Deserialize the content from bytes in the given format.
+
+    Args:
+        data (bytes): The serialized content.
+        format (str): The format of the serialized content.
+        content_type (ContentType): The type of the content.
+        columns (List[str], optional): The columns to keep. Only used for DataFrame content. Defaults to None, all the columns.
+        filters (Filters, optional): The row filters in the pyarrow form. Only used for DataFrame content. Defaults to None.
+        compression (str, optional): The compression codec the content was serialized with. Defaults to None.
+
+    Returns:
+        CoveredContentType: The deserialized content.
+
+    Raises:
+        ContentExtensionMismatch: If the content can't be deserialized with the format.
+        NotCoveredContentType: If the content type is not covered.
+    """
+    if compression is not None and is_compressed_as_file(format):
+        data = open_decompressed_reader(data, compression).read()
+    if content_type in [ContentType.ARROW_TABLE, ContentType.POLARS_DF]:
+        return from_arrow_table(
+            read_table(data, format, columns, filters), content_type
+        )
+    elif content_type == ContentType.DF:
+        if format == "csv":
+            return query_dataframe(
+                pd.read_csv(
+                    BytesIO(data), usecols=compose_read_columns(columns, filters)
+                ),
+                columns,
+                filters,
+            )
+        elif format == "parquet":
+            return pd.read_parquet(BytesIO(data), columns=columns, filters=filters)
+        elif format in ["feather", "arrow"]:
+            return read_ipc_table(pa.BufferReader(data), columns, filters).to_pandas()
+        else:
+            raise ContentExtensionMismatch(
+                "This content can't be saved with this extension."
+            )
+    elif content_type in [ContentType.DICT, ContentType.DICT_LIST]:
+        if format == "json":
+            return json.loads(data)
+        elif format == "jsonl" and content_type == ContentType.DICT_LIST:
+            return read_jsonl(BytesIO(data))
+        else:
+            raise ContentExtensionMismatch(
+                "This content can't be saved with this extension."
+            )
+    else:
+        raise NotCoveredContentType("This content type is not covered.")
+
+
+def write_ipc(
+    content: pd.DataFrame,
+    sink: Union[str, IO[bytes], pa.NativeFile],
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+):
+    """Write the DataFrame as an Arrow IPC (feather) file.
+
+    Without compression, the file is written uncompressed so it can be memory mapped without copying.
+
+    Args:
+        content (pd.DataFrame): The content to be written.
+        sink (Union[str, IO[bytes], pa.NativeFile]): The path or the binary file object to write to.
+        compression (str, optional): The compression codec, "lz4" or "zstd". Defaults to None.
+        compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+    Returns:
+        None
+    """
+    feather.write_feather(
+        pa.Table.from_pandas(content, preserve_index=False),
+        sink,
+        compression=compression or "uncompressed",
+        compression_level=compression_level,
+    )
@@ -0,0 +1,144 @@
+from io import TextIOWrapper
+from typing import IO, Callable, Iterator, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dcraft.domain.type.content import DataFrameStream
+from dcraft.interface.data.compression import (
+    compose_columnar_options,
+    open_compressed_writer,
+)
+
+
+def iter_dataframes(batches: DataFrameStream) -> Iterator[pd.DataFrame]:
+    """Iterate the stream as DataFrames.
+
+    Args:
+        batches (DataFrameStream): The DataFrames or the Arrow record batch reader.
+
+    Returns:
+        Iterator[pd.DataFrame]: The DataFrames.
+    """
+    if isinstance(batches, pa.RecordBatchReader):
+        for batch in batches:
+            yield batch.to_pandas()
+    else:
+        yield from batches
+
+
+def write_parquet_stream(
+    batches: DataFrameStream,
+    sink: IO[bytes],
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+):
+    """Write the stream to the sink as a parquet file, one row group per batch.
+
+    Only one batch is converted at a time, so the memory used does not depend on the size of the stream.
+
+    Args:
+        batches (DataFrameStream): The DataFrames or the Arrow record batch reader.
+        sink (IO[bytes]): The binary file object the parquet file is written to.
+        compression (str, optional): The compression codec. Defaults to None, snappy.
+        compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+    Returns:
+        None
+    """
+    options = compose_columnar_options(compression, compression_level)
+    writer = None
+    try:
+        if isinstance(batches, pa.RecordBatchReader):
+            writer = pq.ParquetWriter(sink, batches.schema, **options)
+            for batch in batches:
+                writer.write_batch(batch)
+        else:
+            for data in batches:
+                table = pa.Table.from_pandas(data, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(sink, table.schema, **options)
+                writer.write_table(table.cast(writer.schema))
+            if writer is None:
+                pq.write_table(pa.table({}), sink, **options)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_ipc_stream(
+    batches: DataFrameStream,
+    sink: IO[bytes],
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+):
+    """Write the stream to the sink as an Arrow IPC (feather) file, one record batch per batch.
+
+    Args:
+        batches (DataFrameStream): The DataFrames or the Arrow record batch reader.
+        sink (IO[bytes]): The binary file object the IPC file is written to.
+        compression (str, optional): The compression codec, "lz4" or "zstd". Defaults to None, uncompressed.
+        compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+    Returns:
+        None
+    """
+    options = pa.ipc.IpcWriteOptions(
+        compression=pa.Codec(compression, compression_level) if compression else None
+    )
+    writer = None
+    try:
+        if isinstance(batches, pa.RecordBatchReader):
+            writer = pa.ipc.new_file(sink, batches.schema, options=options)
+            for batch in batches:
+                writer.write_batch(batch)
+        else:
+            for data in batches:
+                table = pa.Table.from_pandas(data, preserve_index=False)
+                if writer is None:
+                    writer = pa.ipc.new_file(sink, table.schema, options=options)
+                writer.write_table(table.cast(writer.schema))
+            if writer is None:
+                writer = pa.ipc.new_file(sink, pa.schema([]), options=options)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_csv_stream(batches: DataFrameStream, sink: IO[str]):
+    """Write the stream to the sink as a CSV file. The header is written with the first batch.
+
+    Args:
+        batches (DataFrameStream): The DataFrames or the Arrow record batch reader.
+        sink (IO[str]): The text file object the CSV file is written to.
+
+    Returns:
+        None
+    """
+    for i, data in enumerate(iter_dataframes(batches)):
+        data.to_csv(sink, index=False, header=i == 0)
+
+
+def write_text(
+    sink: IO[bytes],
+    write: Callable[[IO[str]], None],
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+):
+    """Write text to the binary sink as UTF-8, optionally compressed, without closing the sink.
+
+    Args:
+        sink (IO[bytes]): The binary file object the text is written to.
+        write (Callable[[IO[str]], None]): The function writing the text to the given text file object.
+        compression (str, optional): The compression codec. Defaults to None, no compression.
+        compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+    Returns:
+        None
+    """
+    with open_compressed_writer(sink, compression, compression_level) as writer:
+        text = TextIOWrapper(writer, encoding="utf-8", newline="")
+        write(text)
+        text.flush()
+        text.detach()
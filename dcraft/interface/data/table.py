@@ -0,0 +1,156 @@
+from typing import IO, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from dcraft.domain.error import ContentExtensionMismatch, NotCoveredContentType
+from dcraft.domain.type.content import CoveredContentType, Filters
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.data.compression import (
+    compose_columnar_options,
+    open_compressed_writer,
+    open_decompressed_reader,
+)
+from dcraft.interface.data.query import compose_read_columns, read_ipc_table
+
+TableSource = Union[str, IO[bytes], pa.NativeFile, bytes, bytearray]
+
+
+def to_arrow_table(content: CoveredContentType) -> pa.Table:
+    """Convert the tabular content to a pyarrow Table. Tables and polars DataFrames are not copied.
+
+    Args:
+        content (CoveredContentType): The pandas DataFrame, the pyarrow Table or the polars DataFrame.
+
+    Returns:
+        pa.Table: The table.
+    """
+    if isinstance(content, pa.Table):
+        return content
+    elif isinstance(content, pd.DataFrame):
+        return pa.Table.from_pandas(content, preserve_index=False)
+    return content.to_arrow()
+
+
+def from_arrow_table(table: pa.Table, content_type: ContentType) -> CoveredContentType:
+    """Convert the pyarrow Table to the tabular content type.
+
+    Args:
+        table (pa.Table): The table.
+        content_type (ContentType): The type of the content to be returned.
+
+    Returns:
+        CoveredContentType: The content.
+
+    Raises:
+        NotCoveredContentType: If the content type is not tabular.
+    """
+    if content_type == ContentType.ARROW_TABLE:
+        return table
+    elif content_type == ContentType.DF:
+        return table.to_pandas()
+    elif content_type == ContentType.POLARS_DF:
+        try:
+            import polars
+        except ImportError:
+            raise ImportError(
+                "polars is required to load the content as a polars DataFrame."
+            )
+        return polars.from_arrow(table)
+    raise NotCoveredContentType("This content type is not a table.")
+
+
+def write_table(
+    table: pa.Table,
+    sink: Union[IO[bytes], pa.NativeFile],
+    format: str,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+):
+    """Write the pyarrow Table without converting it to pandas.
+
+    Args:
+        table (pa.Table): The table to be written.
+        sink (Union[IO[bytes], pa.NativeFile]): The binary file object to write to. It is not closed.
+        format (str): The format of the file, "csv", "parquet", "feather" or "arrow".
+        compression (str, optional): The compression codec. Defaults to None, the default of the format.
+        compression_level (int, optional): The level of the compression codec. Defaults to None.
+
+    Returns:
+        None
+
+    Raises:
+        ContentExtensionMismatch: If the table can't be written with the format.
+    """
+    if format == "csv":
+        with open_compressed_writer(sink, compression, compression_level) as writer:
+            pacsv.write_csv(table, writer)
+    elif format == "parquet":
+        pq.write_table(
+            table, sink, **compose_columnar_options(compression, compression_level)
+        )
+    elif format in ["feather", "arrow"]:
+        feather.write_feather(
+            table,
+            sink,
+            compression=compression or "uncompressed",
+            compression_level=compression_level,
+        )
+    else:
+        raise ContentExtensionMismatch(
+            "This content can't be saved with this extension."
+        )
+
+
+def read_table(
+    source: TableSource,
+    format: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None,
+    compression: Optional[str] = None,
+    memory_map: bool = False,
+) -> pa.Table:
+    """Read the file as a pyarrow Table without converting it to pandas.
+
+    Args:
+        source (TableSource): The path, the binary file object or the bytes of the file.
+        format (str): The format of the file, "csv", "parquet", "feather" or "arrow".
+        columns (List[str], optional): The columns to be returned. Defaults to None, all the columns.
+        filters (Filters, optional): The row filters in the pyarrow form. Defaults to None.
+        compression (str, optional): The codec the csv file is compressed with. Defaults to None.
+        memory_map (bool, optional): Whether the file at the path is memory mapped. Defaults to False.
+
+    Returns:
+        pa.Table: The read table.
+
+    Raises:
+        ContentExtensionMismatch: If the file can't be read as a table with the format.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = pa.BufferReader(source)
+    if format == "csv":
+        read_columns = compose_read_columns(columns, filters)
+        table = pacsv.read_csv(
+            open_decompressed_reader(source, compression),
+            convert_options=pacsv.ConvertOptions(include_columns=read_columns)
+            if read_columns is not None
+            else None,
+        )
+        if filters:
+            table = table.filter(pq.filters_to_expression(filters))
+        if columns is not None:
+            table = table.select(columns)
+        return table
+    elif format == "parquet":
+        return pq.read_table(
+            source, columns=columns, filters=filters, memory_map=memory_map
+        )
+    elif format in ["feather", "arrow"]:
+        return read_ipc_table(source, columns, filters, memory_map)
+    else:
+        raise ContentExtensionMismatch(
+            "This content can't be loaded as a table with this extension."
+        )
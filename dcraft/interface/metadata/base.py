@@ -1,6 +1,15 @@
 from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
 
+from dcraft.domain.error import NoMetadataFound
 from dcraft.domain.metadata import Metadata
+from dcraft.interface.metadata.query import (
+    DEFAULT_PAGE_SIZE,
+    CreatedBetween,
+    ListPosition,
+    MetadataPager,
+    MetadataQuery,
+)
 
 
 class MetadataRepository(ABC):
@@ -27,3 +36,207 @@ class MetadataRepository(ABC):
             None
         """
         pass
+
+    def load_many(self, ids: List[str]) -> Dict[str, Metadata]:
+        """Load the metadata for several IDs.
+
+        IDs without metadata are left out of the result.
+
+        Args:
+            ids (List[str]): The IDs of the metadata to load.
+
+        Returns:
+            Dict[str, Metadata]: The loaded metadata objects keyed by ID.
+        """
+        metadata_dict = {}
+        for id in dict.fromkeys(ids):
+            try:
+                metadata_dict[id] = self.load(id)
+            except NoMetadataFound:
+                continue
+        return metadata_dict
+
+    def save_many(self, metadata_list: List[Metadata]):
+        """Save several metadata objects.
+
+        Args:
+            metadata_list (List[Metadata]): The metadata objects to be saved.
+
+        Returns:
+            None
+        """
+        for metadata in metadata_list:
+            self.save(metadata)
+
+    def get_ancestors(
+        self, id: str, depth: Optional[int] = None
+    ) -> Dict[str, Metadata]:
+        """Get the metadata of the layer data the ID was made from, following source_ids.
+
+        This default implementation loads one lineage frontier per load_many call.
+
+        Args:
+            id (str): The ID whose ancestors are returned.
+            depth (int, optional): The maximum number of hops, 1 for the direct sources only.
+                Defaults to None, no limit.
+
+        Returns:
+            Dict[str, Metadata]: The metadata of the ancestors keyed by ID. The ID itself is left out.
+        """
+        return self._walk_lineage(
+            id,
+            depth,
+            lambda frontier: self.load_many(
+                [
+                    source_id
+                    for metadata in frontier.values()
+                    for source_id in metadata.source_ids or []
+                ]
+            ),
+        )
+
+    def get_descendants(
+        self, id: str, depth: Optional[int] = None
+    ) -> Dict[str, Metadata]:
+        """Get the metadata of the layer data made from the ID, directly or not.
+
+        This default implementation loads one lineage frontier per _load_children call.
+
+        Args:
+            id (str): The ID whose descendants are returned.
+            depth (int, optional): The maximum number of hops, 1 for the direct children only.
+                Defaults to None, no limit.
+
+        Returns:
+            Dict[str, Metadata]: The metadata of the descendants keyed by ID. The ID itself is left out.
+        """
+        return self._walk_lineage(
+            id, depth, lambda frontier: self._load_children(list(frontier))
+        )
+
+    def list(
+        self,
+        project_name: Optional[str] = None,
+        layer: Optional[str] = None,
+        author: Optional[str] = None,
+        created_between: Optional[CreatedBetween] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> MetadataPager:
+        """List the metadata matching all the given conditions, from the newest to the oldest.
+
+        The metadata are filtered by the backend and loaded one page at a time while iterating.
+        The next_cursor of the returned iterator continues the listing in a later call.
+
+        Args:
+            project_name (str, optional): The name of the project. Defaults to None, any project.
+            layer (str, optional): The name of the layer. Defaults to None, any layer.
+            author (str, optional): The author. Defaults to None, any author.
+            created_between (CreatedBetween, optional): The range of created_at, the start included
+                and the end excluded. Either side can be None. Defaults to None, any time.
+            limit (int, optional): The maximum number of metadata to be listed. Defaults to None, no limit.
+            cursor (str, optional): The next_cursor of a previous listing with the same conditions.
+                Defaults to None, from the newest.
+            page_size (int, optional): The maximum number of metadata loaded at a time. Defaults to 1000.
+
+        Returns:
+            MetadataPager: The iterator of the metadata.
+
+        Raises:
+            ValueError: If the limit is negative, the page size is not positive or the cursor is invalid.
+        """
+        query = MetadataQuery(project_name, layer, author, created_between)
+        return MetadataPager(
+            lambda size, after: self._list_page(query, size, after),
+            limit,
+            cursor,
+            page_size,
+        )
+
+    def _list_page(
+        self, query: MetadataQuery, limit: int, after: Optional[ListPosition]
+    ) -> List[Metadata]:
+        """Load one page of the listing. list and the default _load_children are built on it.
+
+        A repository which lists metadata overrides it. This default raises, so a repository implementing only
+        load and save still works until a listing or get_descendants is asked of it.
+
+        Args:
+            query (MetadataQuery): The conditions the metadata match.
+            limit (int): The maximum number of metadata to be loaded.
+            after (ListPosition, optional): The created_at and the ID of the last metadata of the previous page.
+                None for the first page.
+
+        Returns:
+            List[Metadata]: The matching metadata before the position in the descending order of created_at
+                and ID, at most the limit.
+
+        Raises:
+            NotImplementedError: If the repository doesn't list metadata.
+        """
+        raise NotImplementedError(f"{type(self).__name__} doesn't list metadata.")
+
+    def _load_children(self, ids: List[str]) -> Dict[str, Metadata]:
+        """Load the metadata made directly from any of the IDs.
+
+        This default implementation goes through the whole listing once per call. A repository which can look up
+        metadata by source ID should override it, or get_descendants.
+
+        Args:
+            ids (List[str]): The IDs whose children are returned.
+
+        Returns:
+            Dict[str, Metadata]: The metadata whose source_ids contain any of the IDs, keyed by ID.
+        """
+        ids_set = set(ids)
+        return {
+            metadata.id: metadata
+            for metadata in self.list()
+            if ids_set.intersection(metadata.source_ids or [])
+        }
+
+    def _walk_lineage(
+        self,
+        id: str,
+        depth: Optional[int],
+        load_next: Callable[[Dict[str, Metadata]], Dict[str, Metadata]],
+    ) -> Dict[str, Metadata]:
+        lineage: Dict[str, Metadata] = {}
+        frontier = self.load_many([id])
+        hops = 0
+        while frontier and (depth is None or hops < depth):
+            frontier = {
+                next_id: metadata
+                for next_id, metadata in load_next(frontier).items()
+                if next_id != id and next_id not in lineage
+            }
+            lineage.update(frontier)
+            hops += 1
+        return lineage
+
+
+class AsyncMetadataRepository(ABC):
+    @abstractmethod
+    async def load(self, id: str) -> Metadata:
+        """Load the metadata for a specific ID.
+
+        Args:
+            id (str): The ID of the metadata to load.
+
+        Returns:
+            Metadata: The loaded metadata object.
+        """
+        pass
+
+    @abstractmethod
+    async def save(self, metadata: Metadata):
+        """Save the metadata.
+
+        Args:
+            metadata (Metadata): The metadata object to be saved.
+
+        Returns:
+            None
+        """
+        pass
@@ -1,11 +1,27 @@
+import atexit
+import functools
 import json
-from typing import Any, Optional
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional
 
-from google.cloud.bigquery import Client, LoadJobConfig, SchemaField
+from google.cloud.bigquery import (
+    ArrayQueryParameter,
+    Client,
+    LoadJobConfig,
+    QueryJobConfig,
+    ScalarQueryParameter,
+    SchemaField,
+    Table,
+    TimePartitioning,
+    TimePartitioningType,
+)
 
+from dcraft.domain.error import MetadataSaveFailed, NoMetadataFound
 from dcraft.domain.metadata import Metadata
 from dcraft.domain.type.enum import ContentType
 from dcraft.interface.metadata.base import MetadataRepository
+from dcraft.interface.metadata.query import ListPosition, MetadataQuery
 
 METADATA_TABLE_SCHEMA = [
     SchemaField("id", "STRING", mode="REQUIRED"),
@@ -18,13 +34,41 @@ METADATA_TABLE_SCHEMA = [
     SchemaField("extra_info", "STRING", mode="NULLABLE"),
     SchemaField("source_ids", "STRING", mode="REPEATED"),
     SchemaField("format", "STRING", mode="REQUIRED"),
+    SchemaField("compression", "STRING", mode="NULLABLE"),
 ]
 
+METADATA_TABLE_PARTITIONING = TimePartitioning(
+    type_=TimePartitioningType.MONTH, field="created_at"
+)
+
+METADATA_TABLE_CLUSTERING_FIELDS = ["id", "project_name", "layer"]
+
 
 METADATA_GET_QUERY = """
 SELECT *
-FROM `{}.{}.{}`
-WHERE id = '{}'
+FROM `{}`
+WHERE id = @id
+LIMIT 1
+"""
+
+METADATA_GET_MANY_QUERY = """
+SELECT *
+FROM `{}`
+WHERE id IN UNNEST(@ids)
+"""
+
+METADATA_LIST_QUERY = """
+SELECT *
+FROM `{}`
+{}
+ORDER BY created_at DESC, id DESC
+LIMIT @limit
+"""
+
+METADATA_GET_CHILDREN_QUERY = """
+SELECT *
+FROM `{}`
+WHERE EXISTS (SELECT 1 FROM UNNEST(source_ids) AS source_id WHERE source_id IN UNNEST(@ids))
 """
 
 
@@ -41,9 +85,20 @@ class BqMetadataRepository(MetadataRepository):
         default_load_job_config: Optional[Any] = None,
         client_info: Optional[Any] = None,
         client_options: Optional[Any] = None,
+        write_mode: str = "load",
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
     ):
         """Initializes a new instance of the class.
 
+        The table is created on the first save, partitioned by month of created_at and clustered by
+        id, project_name and layer, so a lookup by ID only scans the matching blocks.
+        With the "stream" write mode, saved metadata is buffered and sent with streaming inserts
+        when batch_size rows are buffered or flush_interval seconds passed, instead of one load job per save.
+        The rows still buffered are sent by close, or at the exit of the process.
+        A save in the "stream" mode never fails on a flush. The rows which couldn't be sent stay buffered
+        and are sent again, and the error is raised by the next flush or close.
+
         Args:
             project (str): The project ID.
             dataset_id (str): The dataset ID.
@@ -55,7 +110,12 @@ class BqMetadataRepository(MetadataRepository):
             default_load_job_config (Any, optional): The default configuration for load jobs. Defaults to None.
             client_info (Any, optional): The client info. Defaults to None.
             client_options (Any, optional): The client options. Defaults to None.
+            write_mode (str, optional): "load" to save with load jobs or "stream" to save with streaming inserts. Defaults to "load".
+            batch_size (int, optional): The number of buffered rows which triggers a flush in the "stream" mode. Defaults to 500.
+            flush_interval (float, optional): The maximum seconds rows stay buffered in the "stream" mode. Defaults to 5.0.
         """
+        if write_mode not in ["load", "stream"]:
+            raise ValueError(f"Unknown write mode: {write_mode}")
         self._project = project
         self._dataset_id = dataset_id
         self._table_id = table_id
@@ -69,6 +129,28 @@ class BqMetadataRepository(MetadataRepository):
             client_info=client_info,
             client_options=client_options,
         )
+        self._table_path = f"{project}.{dataset_id}.{table_id}"
+        self._get_query = METADATA_GET_QUERY.format(self._table_path)
+        self._get_many_query = METADATA_GET_MANY_QUERY.format(self._table_path)
+        self._get_children_query = METADATA_GET_CHILDREN_QUERY.format(self._table_path)
+        self._load_job_config = LoadJobConfig(
+            schema=METADATA_TABLE_SCHEMA, write_disposition="WRITE_APPEND"
+        )
+        self._is_table_ready = False
+        self._write_mode = write_mode
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._buffer: List[Metadata] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._rejected: List[Metadata] = []
+        self._background_error: Optional[Exception] = None
+        self._is_closed = False
+        self._exit_handler: Optional[Callable[[], None]] = None
+        if write_mode == "stream":
+            # A weak reference, so the registered handler doesn't keep the repository alive.
+            self._exit_handler = functools.partial(_flush_at_exit, weakref.ref(self))
+            atexit.register(self._exit_handler)
 
     def load(self, id: str) -> Metadata:
         """Loads the metadata for a specific ID.
@@ -78,28 +160,43 @@ class BqMetadataRepository(MetadataRepository):
 
         Returns:
             Metadata: The loaded metadata.
+
+        Raises:
+            NoMetadataFound: If no metadata is found for the given ID.
         """
-        query = METADATA_GET_QUERY.format(
-            self._project, self._dataset_id, self._table_id, id
+        buffered_metadata_dict = self._get_buffered([id])
+        if id in buffered_metadata_dict:
+            return buffered_metadata_dict[id]
+        job_config = QueryJobConfig(
+            query_parameters=[ScalarQueryParameter("id", "STRING", id)]
         )
-        query_job = self._client.query(query)
+        query_job = self._client.query(self._get_query, job_config=job_config)
         for result in query_job.result():
-            metadata = Metadata(
-                id=result["id"],
-                project_name=result["project_name"],
-                layer=result["layer"],
-                content_type=ContentType[result["content_type"]],
-                author=result["author"],
-                created_at=result["created_at"],
-                description=result["description"],
-                extra_info=json.loads(result["extra_info"])
-                if result["extra_info"] is not None
-                else None,
-                source_ids=result["source_ids"],
-                format=result["format"],
-            )
-            break
-        return metadata
+            return self._to_metadata(result)
+        raise NoMetadataFound(f"No Metadata found for {id}")
+
+    def load_many(self, ids: List[str]) -> Dict[str, Metadata]:
+        """Loads the metadata for several IDs with a single query.
+
+        Args:
+            ids (List[str]): The IDs of the metadata to load.
+
+        Returns:
+            Dict[str, Metadata]: The loaded metadata keyed by ID. IDs without metadata are left out.
+        """
+        if not ids:
+            return {}
+        metadata_dict = self._get_buffered(ids)
+        ids = [id for id in set(ids) if id not in metadata_dict]
+        if not ids:
+            return metadata_dict
+        job_config = QueryJobConfig(
+            query_parameters=[ArrayQueryParameter("ids", "STRING", ids)]
+        )
+        query_job = self._client.query(self._get_many_query, job_config=job_config)
+        for result in query_job.result():
+            metadata_dict.setdefault(result["id"], self._to_metadata(result))
+        return metadata_dict
 
     def save(self, metadata: Metadata):
         """Save the given metadata to the dataset.
@@ -110,6 +207,277 @@ class BqMetadataRepository(MetadataRepository):
         Returns:
             None
         """
+        self.save_many([metadata])
+
+    def save_many(self, metadata_list: List[Metadata]):
+        """Save the given metadata objects to the dataset with a single load job.
+        In the "stream" write mode, they are buffered and sent with streaming inserts instead,
+        and the errors of sending them are raised by flush or close.
+
+        Args:
+            metadata_list (List[Metadata]): The metadata objects to save.
+
+        Returns:
+            None
+        """
+        if not metadata_list:
+            return
+        if self._write_mode == "stream":
+            self._buffer_rows(metadata_list)
+            return
+        self._ensure_table()
+        job = self._client.load_table_from_json(
+            json_rows=[self._to_row(metadata) for metadata in metadata_list],
+            destination=self._table_path,
+            job_config=self._load_job_config,
+        )
+        job.result()
+
+    @property
+    def rejected_metadata(self) -> List[Metadata]:
+        """The metadata BigQuery rejected as invalid in the "stream" write mode. They are not sent again."""
+        with self._buffer_lock:
+            return list(self._rejected)
+
+    def flush(self):
+        """Send the buffered metadata of the "stream" write mode to the table.
+
+        Rows rejected as invalid are kept in rejected_metadata. The other rows of a failed request
+        stay buffered and are sent again by the next flush, which is scheduled in the background.
+
+        Raises:
+            MetadataSaveFailed: If BigQuery rejects some of the rows, or a flush triggered by a save
+                or in the background failed since the last flush.
+
+        Returns:
+            None
+        """
+        background_error = self._pop_background_error()
+        self._flush()
+        self._raise_background_error(background_error)
+
+    def close(self):
+        """Flush the buffered metadata and stop flushing in the background.
+
+        Raises:
+            MetadataSaveFailed: If the metadata couldn't be sent.
+
+        Returns:
+            None
+        """
+        if self._exit_handler is not None:
+            atexit.unregister(self._exit_handler)
+            self._exit_handler = None
+        with self._buffer_lock:
+            self._is_closed = True
+        self.flush()
+
+    def __del__(self):
+        # Neither the timer nor the exit handler keeps the repository alive, so the rows still buffered
+        # when it is garbage collected are sent here. No caller can receive an error anymore.
+        if getattr(self, "_buffer", None):
+            try:
+                self._flush()
+            except Exception:
+                pass
+
+    def _flush(self):
+        with self._buffer_lock:
+            metadata_list, self._buffer = self._buffer, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        if not metadata_list:
+            return
+        try:
+            self._ensure_table()
+            errors = self._client.insert_rows_json(
+                self._table_path,
+                [self._to_row(metadata) for metadata in metadata_list],
+                row_ids=[metadata.id for metadata in metadata_list],
+            )
+        except Exception:
+            self._requeue(metadata_list)
+            raise
+        if errors:
+            failed_indexes = {error["index"] for error in errors}
+            # "stopped" rows are valid ones which weren't inserted because of an invalid row in the request.
+            rejected_indexes = {
+                error["index"]
+                for error in errors
+                if any(e.get("reason") != "stopped" for e in error["errors"])
+            }
+            with self._buffer_lock:
+                self._rejected.extend(
+                    metadata_list[i] for i in sorted(rejected_indexes)
+                )
+            self._requeue(
+                [metadata_list[i] for i in sorted(failed_indexes - rejected_indexes)]
+            )
+            raise MetadataSaveFailed(f"Failed to insert metadata rows: {errors}")
+
+    def _requeue(self, metadata_list: List[Metadata]):
+        if not metadata_list:
+            return
+        with self._buffer_lock:
+            self._buffer = metadata_list + self._buffer
+            self._schedule_flush()
+
+    def _flush_deferring_error(self):
+        try:
+            self._flush()
+        except Exception as e:
+            # No caller waits for this flush, so the error is raised by the next flush or close.
+            with self._buffer_lock:
+                self._background_error = e
+
+    def _pop_background_error(self) -> Optional[Exception]:
+        with self._buffer_lock:
+            background_error, self._background_error = self._background_error, None
+        return background_error
+
+    @staticmethod
+    def _raise_background_error(background_error: Optional[Exception]):
+        if background_error is not None:
+            raise MetadataSaveFailed(
+                "An earlier flush of the buffered metadata failed."
+            ) from background_error
+
+    def _buffer_rows(self, metadata_list: List[Metadata]):
+        with self._buffer_lock:
+            self._buffer.extend(metadata_list)
+            is_full = len(self._buffer) >= self._batch_size
+            if not is_full:
+                self._schedule_flush()
+        if is_full:
+            self._flush_deferring_error()
+
+    def _schedule_flush(self):
+        # Called with the buffer lock held.
+        if self._flush_timer is not None or self._is_closed:
+            return
+        # The timer holds a weak reference, so a pending flush doesn't keep the repository alive.
+        self._flush_timer = threading.Timer(
+            self._flush_interval, _flush_in_background, args=(weakref.ref(self),)
+        )
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_on_timer(self):
+        with self._buffer_lock:
+            self._flush_timer = None
+        self._flush_deferring_error()
+
+    def _list_page(
+        self, query: MetadataQuery, limit: int, after: Optional[ListPosition]
+    ) -> List[Metadata]:
+        conditions = []
+        parameters: List[Any] = [ScalarQueryParameter("limit", "INT64", limit)]
+        for field, value in [
+            ("project_name", query.project_name),
+            ("layer", query.layer),
+            ("author", query.author),
+        ]:
+            if value is not None:
+                conditions.append(f"{field} = @{field}")
+                parameters.append(ScalarQueryParameter(field, "STRING", value))
+        # The conditions on created_at prune the monthly partitions.
+        if query.created_after is not None:
+            conditions.append("created_at >= @created_after")
+            parameters.append(
+                ScalarQueryParameter("created_after", "DATETIME", query.created_after)
+            )
+        if query.created_before is not None:
+            conditions.append("created_at < @created_before")
+            parameters.append(
+                ScalarQueryParameter("created_before", "DATETIME", query.created_before)
+            )
+        if after is not None:
+            conditions.append(
+                "(created_at < @after_created_at OR (created_at = @after_created_at AND id < @after_id))"
+            )
+            parameters.append(
+                ScalarQueryParameter("after_created_at", "DATETIME", after[0])
+            )
+            parameters.append(ScalarQueryParameter("after_id", "STRING", after[1]))
+        sql = METADATA_LIST_QUERY.format(
+            self._table_path,
+            f"WHERE {' AND '.join(conditions)}" if conditions else "",
+        )
+        with self._buffer_lock:
+            metadata_dict = {
+                metadata.id: metadata
+                for metadata in self._buffer
+                if query.matches(
+                    metadata.project_name,
+                    metadata.layer,
+                    metadata.author,
+                    metadata.created_at,
+                )
+                and (after is None or (metadata.created_at, metadata.id) < after)
+            }
+        query_job = self._client.query(
+            sql, job_config=QueryJobConfig(query_parameters=parameters)
+        )
+        for result in query_job.result():
+            metadata_dict.setdefault(result["id"], self._to_metadata(result))
+        metadata_list = sorted(
+            metadata_dict.values(),
+            key=lambda metadata: (metadata.created_at, metadata.id),
+            reverse=True,
+        )
+        return metadata_list[:limit]
+
+    def _load_children(self, ids: List[str]) -> Dict[str, Metadata]:
+        # get_descendants calls this once per lineage frontier, so a walk costs one query per hop. The query
+        # matches the rows whose source_ids share an element with the whole frontier, and the buffered rows
+        # not streamed yet are matched in memory.
+        ids_set = set(ids)
+        with self._buffer_lock:
+            metadata_dict = {
+                metadata.id: metadata
+                for metadata in self._buffer
+                if ids_set.intersection(metadata.source_ids or [])
+            }
+        job_config = QueryJobConfig(
+            query_parameters=[ArrayQueryParameter("ids", "STRING", list(ids_set))]
+        )
+        query_job = self._client.query(self._get_children_query, job_config=job_config)
+        for result in query_job.result():
+            metadata_dict.setdefault(result["id"], self._to_metadata(result))
+        return metadata_dict
+
+    def _get_buffered(self, ids: List[str]) -> Dict[str, Metadata]:
+        with self._buffer_lock:
+            if not self._buffer:
+                return {}
+            ids_set = set(ids)
+            return {
+                metadata.id: metadata
+                for metadata in self._buffer
+                if metadata.id in ids_set
+            }
+
+    def _ensure_table(self):
+        if self._is_table_ready:
+            return
+        self._client.create_dataset(self._dataset_id, exists_ok=True)
+        table = Table(self._table_path, schema=METADATA_TABLE_SCHEMA)
+        table.time_partitioning = METADATA_TABLE_PARTITIONING
+        table.clustering_fields = METADATA_TABLE_CLUSTERING_FIELDS
+        table = self._client.create_table(table, exists_ok=True)
+        # Tables created by an older version lack the fields added since then.
+        field_names = {field.name for field in table.schema}
+        missing_fields = [
+            field for field in METADATA_TABLE_SCHEMA if field.name not in field_names
+        ]
+        if missing_fields:
+            table.schema = list(table.schema) + missing_fields
+            self._client.update_table(table, ["schema"])
+        self._is_table_ready = True
+
+    @staticmethod
+    def _to_row(metadata: Metadata) -> dict:
         metadata_dict = metadata.asdict
         metadata_dict["created_at"] = metadata_dict["created_at"].isoformat()
         metadata_dict["extra_info"] = (
@@ -117,13 +485,34 @@ class BqMetadataRepository(MetadataRepository):
             if metadata_dict["extra_info"] is not None
             else None
         )
-        self._client.create_dataset(self._dataset_id, exists_ok=True)
-        job_config = LoadJobConfig(
-            schema=METADATA_TABLE_SCHEMA, write_disposition="WRITE_APPEND"
-        )
-        job = self._client.load_table_from_json(
-            json_rows=[metadata_dict],
-            destination=f"{self._project}.{self._dataset_id}.{self._table_id}",
-            job_config=job_config,
+        return metadata_dict
+
+    @staticmethod
+    def _to_metadata(result: Any) -> Metadata:
+        return Metadata(
+            id=result["id"],
+            project_name=result["project_name"],
+            layer=result["layer"],
+            content_type=ContentType[result["content_type"]],
+            author=result["author"],
+            created_at=result["created_at"],
+            description=result["description"],
+            extra_info=json.loads(result["extra_info"])
+            if result["extra_info"] is not None
+            else None,
+            source_ids=result["source_ids"],
+            format=result["format"],
+            compression=result.get("compression"),
         )
-        job.result()
+
+
+def _flush_at_exit(repository_ref: "weakref.ref[BqMetadataRepository]"):
+    repository = repository_ref()
+    if repository is not None:
+        repository._flush()
+
+
+def _flush_in_background(repository_ref: "weakref.ref[BqMetadataRepository]"):
+    repository = repository_ref()
+    if repository is not None:
+        repository._flush_on_timer()
@@ -0,0 +1,175 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from dcraft.domain.metadata import Metadata
+from dcraft.interface.metadata.base import MetadataRepository
+from dcraft.interface.metadata.query import ListPosition, MetadataQuery, encode_cursor
+
+
+class CachedMetadataRepository(MetadataRepository):
+    def __init__(
+        self,
+        repository: MetadataRepository,
+        max_size: int = 10000,
+        ttl: Optional[float] = None,
+    ):
+        """Initializes a new instance of the class.
+
+        Metadata is written once per ID, so loaded and saved metadata are kept in an in-memory LRU cache
+        in front of the wrapped repository.
+
+        Args:
+            repository (MetadataRepository): The metadata repository whose metadata are cached.
+            max_size (int, optional): The maximum number of cached metadata. Defaults to 10000.
+            ttl (float, optional): Seconds after which a cached metadata is loaded again. Defaults to None, no expiry.
+        """
+        self._repository = repository
+        self._max_size = max_size
+        self._ttl = ttl
+        self._cache: "OrderedDict[str, Tuple[Metadata, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, id: str) -> Metadata:
+        """Load the metadata for a specific ID from the cache, or from the wrapped repository on a cache miss.
+
+        Args:
+            id (str): The ID of the metadata to load.
+
+        Returns:
+            Metadata: The loaded metadata object.
+        """
+        metadata = self._get(id)
+        if metadata is None:
+            metadata = self._repository.load(id)
+            self._put(metadata)
+        return copy.deepcopy(metadata)
+
+    def load_many(self, ids: List[str]) -> Dict[str, Metadata]:
+        """Load the metadata for several IDs. Only the IDs missing in the cache are loaded from the wrapped repository.
+
+        Args:
+            ids (List[str]): The IDs of the metadata to load.
+
+        Returns:
+            Dict[str, Metadata]: The loaded metadata objects keyed by ID. IDs without metadata are left out.
+        """
+        metadata_dict: Dict[str, Metadata] = {}
+        missing_ids = []
+        for id in dict.fromkeys(ids):
+            metadata = self._get(id)
+            if metadata is None:
+                missing_ids.append(id)
+            else:
+                metadata_dict[id] = metadata
+        if missing_ids:
+            for metadata in self._repository.load_many(missing_ids).values():
+                self._put(metadata)
+                metadata_dict[metadata.id] = metadata
+        return copy.deepcopy(metadata_dict)
+
+    def save(self, metadata: Metadata):
+        """Save the metadata to the wrapped repository and keep it in the cache.
+
+        Args:
+            metadata (Metadata): The metadata object to be saved.
+
+        Returns:
+            None
+        """
+        self._repository.save(metadata)
+        self._put(copy.deepcopy(metadata))
+
+    def save_many(self, metadata_list: List[Metadata]):
+        """Save several metadata objects to the wrapped repository and keep them in the cache.
+
+        Args:
+            metadata_list (List[Metadata]): The metadata objects to be saved.
+
+        Returns:
+            None
+        """
+        self._repository.save_many(metadata_list)
+        for metadata in metadata_list:
+            self._put(copy.deepcopy(metadata))
+
+    def get_ancestors(
+        self, id: str, depth: Optional[int] = None
+    ) -> Dict[str, Metadata]:
+        """Get the ancestors of the ID from the wrapped repository and keep them in the cache.
+
+        Args:
+            id (str): The ID whose ancestors are returned.
+            depth (int, optional): The maximum number of hops, 1 for the direct sources only.
+                Defaults to None, no limit.
+
+        Returns:
+            Dict[str, Metadata]: The metadata of the ancestors keyed by ID. The ID itself is left out.
+        """
+        return self._put_all(self._repository.get_ancestors(id, depth))
+
+    def get_descendants(
+        self, id: str, depth: Optional[int] = None
+    ) -> Dict[str, Metadata]:
+        """Get the descendants of the ID from the wrapped repository and keep them in the cache.
+
+        Descendants can be added at any time, so the traversal itself is never served from the cache.
+
+        Args:
+            id (str): The ID whose descendants are returned.
+            depth (int, optional): The maximum number of hops, 1 for the direct children only.
+                Defaults to None, no limit.
+
+        Returns:
+            Dict[str, Metadata]: The metadata of the descendants keyed by ID. The ID itself is left out.
+        """
+        return self._put_all(self._repository.get_descendants(id, depth))
+
+    def clear(self):
+        """Drop all the cached metadata."""
+        with self._lock:
+            self._cache.clear()
+
+    def _get(self, id: str) -> Optional[Metadata]:
+        with self._lock:
+            if id not in self._cache:
+                return None
+            metadata, cached_at = self._cache[id]
+            if self._ttl is not None and time.monotonic() - cached_at > self._ttl:
+                del self._cache[id]
+                return None
+            self._cache.move_to_end(id)
+            return metadata
+
+    def _list_page(
+        self, query: MetadataQuery, limit: int, after: Optional[ListPosition]
+    ) -> List[Metadata]:
+        # New metadata can match at any time, so the pages are always loaded from the wrapped repository.
+        metadata_list = list(
+            self._repository.list(
+                query.project_name,
+                query.layer,
+                query.author,
+                query.created_between,
+                limit=limit,
+                cursor=encode_cursor(after) if after is not None else None,
+                page_size=limit,
+            )
+        )
+        for metadata in metadata_list:
+            self._put(metadata)
+        return copy.deepcopy(metadata_list)
+
+    def _put_all(self, metadata_dict: Dict[str, Metadata]) -> Dict[str, Metadata]:
+        for metadata in metadata_dict.values():
+            self._put(metadata)
+        return copy.deepcopy(metadata_dict)
+
+    def _put(self, metadata: Metadata):
+        with self._lock:
+            self._cache[metadata.id] = (metadata, time.monotonic())
+            self._cache.move_to_end(metadata.id)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
@@ -1,22 +1,48 @@
+import asyncio
+import bisect
 import json
 import os
+import threading
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
 from dcraft.domain.error import NoMetadataFound
 from dcraft.domain.metadata import Metadata
 from dcraft.domain.type.enum import ContentType
-from dcraft.interface.metadata.base import MetadataRepository
-from dcraft.interface.metadata.setting import LOCAL_METADATA_NAME
+from dcraft.interface.metadata.base import AsyncMetadataRepository, MetadataRepository
+from dcraft.interface.metadata.query import ListPosition, MetadataQuery
+from dcraft.interface.metadata.setting import (
+    LOCAL_METADATA_INDEX_NAME,
+    LOCAL_METADATA_NAME,
+)
+
+# Enough bytes to hold the last line of the index file.
+INDEX_TAIL_READ_SIZE = 4096
 
 
 class LocalMetadataRepository(MetadataRepository):
     def __init__(self, path):
         self._path = path
         self._metadata_path = self._compose_path()
+        self._index_path = self._compose_index_path()
+        self._index: Dict[str, int] = {}
+        self._indexed_size = 0
+        self._index_lock = threading.Lock()
+        self._parents: Dict[str, List[str]] = {}
+        self._children: Dict[str, List[str]] = {}
+        # created_at, id, project_name, layer and author of each record, sorted by the first two on a listing.
+        self._entries: List[Tuple[datetime, str, str, str, Optional[str]]] = []
+        self._is_entries_sorted = True
+        self._catalog_size = 0
+        self._catalog_lock = threading.Lock()
 
     def load(self, id: str) -> Metadata:
         """Load the metadata for a given ID.
 
+        The record is looked up in the id to byte offset index, so the lookup cost does not depend
+        on the number of saved records. The index is read from the index file kept next to the
+        metadata file, and only kept in memory here, so loading never writes to the directory.
+
         Args:
             id (str): The ID of the metadata to load.
 
@@ -26,29 +52,37 @@ class LocalMetadataRepository(MetadataRepository):
         Raises:
             NoMetadataFound: If no metadata is found for the given ID.
         """
-        with open(self._metadata_path, "r") as f:
-            for line in f:
-                metadata_dict = json.loads(line)
-                if metadata_dict["id"] == id:
-                    if metadata_dict["created_at"] is not None:
-                        metadata_dict["created_at"] = datetime.fromisoformat(
-                            metadata_dict["created_at"]
-                        )
-
-                    return Metadata(
-                        id=metadata_dict["id"],
-                        project_name=metadata_dict["project_name"],
-                        layer=metadata_dict["layer"],
-                        content_type=ContentType[metadata_dict["content_type"]],
-                        author=metadata_dict.get("author"),
-                        created_at=metadata_dict["created_at"],
-                        description=metadata_dict.get("description"),
-                        extra_info=metadata_dict.get("extra_info"),
-                        source_ids=metadata_dict.get("source_ids"),
-                        format=metadata_dict["format"],
-                    )
-            else:
-                raise NoMetadataFound(f"No Metadata found for {id}")
+        self._refresh_index()
+        offset = self._index.get(id)
+        if offset is None:
+            raise NoMetadataFound(f"No Metadata found for {id}")
+        with open(self._metadata_path, "rb") as f:
+            f.seek(offset)
+            metadata_dict = json.loads(f.readline())
+        return self._to_metadata(metadata_dict)
+
+    def load_many(self, ids: List[str]) -> Dict[str, Metadata]:
+        """Load the metadata for several IDs in a single pass over the file.
+
+        The records are read in file order by seeking to the indexed offsets.
+
+        Args:
+            ids (List[str]): The IDs of the metadata to load.
+
+        Returns:
+            Dict[str, Metadata]: The loaded metadata keyed by ID. IDs without metadata are left out.
+        """
+        self._refresh_index()
+        index = self._index
+        offsets = sorted((index[id], id) for id in set(ids) if id in index)
+        metadata_dict: Dict[str, Metadata] = {}
+        if not offsets:
+            return metadata_dict
+        with open(self._metadata_path, "rb") as f:
+            for offset, id in offsets:
+                f.seek(offset)
+                metadata_dict[id] = self._to_metadata(json.loads(f.readline()))
+        return metadata_dict
 
     def save(self, metadata: Metadata):
         """Saves the given metadata to a file.
@@ -59,11 +93,348 @@ class LocalMetadataRepository(MetadataRepository):
         Returns:
             None
         """
-        metadata_dict = metadata.asdict
+        self.save_many([metadata])
+
+    def save_many(self, metadata_list: List[Metadata]):
+        """Saves the given metadata objects to a file with a single append.
+
+        The index file is brought up to date afterwards. Failing to write it is not an error,
+        the records it misses are scanned again by the next load.
+
+        Parameters:
+            metadata_list (List[Metadata]): The metadata objects to be saved.
+
+        Returns:
+            None
+        """
+        if not metadata_list:
+            return
+        lines = []
+        for metadata in metadata_list:
+            metadata_dict = metadata.asdict
+            if metadata_dict["created_at"] is not None:
+                metadata_dict["created_at"] = metadata_dict["created_at"].isoformat()
+            lines.append(json.dumps(metadata_dict) + "\n")
+        data = "".join(lines).encode("utf-8")
+        with open(self._metadata_path, "ab") as f:
+            if f.tell() > 0 and not self._ends_with_newline():
+                data = b"\n" + data
+            f.write(data)
+        with self._index_lock:
+            self._catch_up_index()
+            self._persist_index()
+
+    def get_ancestors(
+        self, id: str, depth: Optional[int] = None
+    ) -> Dict[str, Metadata]:
+        """Get the metadata of the layer data the ID was made from, following source_ids.
+
+        The lineage is walked in an in-memory graph of the IDs, and only the reached records are read.
+
+        Args:
+            id (str): The ID whose ancestors are returned.
+            depth (int, optional): The maximum number of hops, 1 for the direct sources only.
+                Defaults to None, no limit.
+
+        Returns:
+            Dict[str, Metadata]: The metadata of the ancestors keyed by ID. The ID itself is left out.
+        """
+        with self._catalog_lock:
+            self._catch_up_catalog()
+            ids = self._walk_ids(id, depth, self._parents)
+        return self.load_many(ids)
+
+    def get_descendants(
+        self, id: str, depth: Optional[int] = None
+    ) -> Dict[str, Metadata]:
+        """Get the metadata of the layer data made from the ID, directly or not.
+
+        The lineage is walked in an in-memory reverse index of source_ids, and only the reached records are read.
+
+        Args:
+            id (str): The ID whose descendants are returned.
+            depth (int, optional): The maximum number of hops, 1 for the direct children only.
+                Defaults to None, no limit.
+
+        Returns:
+            Dict[str, Metadata]: The metadata of the descendants keyed by ID. The ID itself is left out.
+        """
+        with self._catalog_lock:
+            self._catch_up_catalog()
+            if id not in self._parents:
+                return {}
+            ids = self._walk_ids(id, depth, self._children)
+        return self.load_many(ids)
+
+    def _list_page(
+        self, query: MetadataQuery, limit: int, after: Optional[ListPosition]
+    ) -> List[Metadata]:
+        ids = []
+        with self._catalog_lock:
+            self._catch_up_catalog()
+            if not self._is_entries_sorted:
+                self._entries.sort()
+                self._is_entries_sorted = True
+            end = len(self._entries)
+            if after is not None:
+                end = bisect.bisect_left(self._entries, after)
+            if query.created_before is not None:
+                end = min(
+                    end, bisect.bisect_left(self._entries, (query.created_before,))
+                )
+            for i in range(end - 1, -1, -1):
+                created_at, id, project_name, layer, author = self._entries[i]
+                if query.created_after is not None and created_at < query.created_after:
+                    break
+                if query.matches(project_name, layer, author, created_at):
+                    ids.append(id)
+                    if len(ids) == limit:
+                        break
+        metadata_dict = self.load_many(ids)
+        return [metadata_dict[id] for id in ids]
+
+    @staticmethod
+    def _walk_ids(
+        id: str, depth: Optional[int], edges: Dict[str, List[str]]
+    ) -> List[str]:
+        seen = {id}
+        ids = []
+        frontier = [id]
+        hops = 0
+        while frontier and (depth is None or hops < depth):
+            next_frontier = []
+            for current_id in frontier:
+                for next_id in edges.get(current_id, []):
+                    if next_id not in seen:
+                        seen.add(next_id)
+                        next_frontier.append(next_id)
+            ids.extend(next_frontier)
+            frontier = next_frontier
+            hops += 1
+        return ids
+
+    def _catch_up_catalog(self):
+        try:
+            size = os.path.getsize(self._metadata_path)
+        except FileNotFoundError:
+            size = 0
+        if size < self._catalog_size:
+            # The metadata file was rewritten, so the catalog is built again.
+            self._parents = {}
+            self._children = {}
+            self._entries = []
+            self._catalog_size = 0
+        if size == self._catalog_size:
+            return
+        offset = self._catalog_size
+        with open(self._metadata_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if line.strip():
+                    try:
+                        metadata_dict = json.loads(line)
+                    except ValueError:
+                        # A record which is still being written by another process.
+                        break
+                    id = metadata_dict["id"]
+                    if id not in self._parents:
+                        source_ids = metadata_dict.get("source_ids") or []
+                        self._parents[id] = source_ids
+                        for source_id in source_ids:
+                            self._children.setdefault(source_id, []).append(id)
+                        if metadata_dict["created_at"] is not None:
+                            self._entries.append(
+                                (
+                                    datetime.fromisoformat(metadata_dict["created_at"]),
+                                    id,
+                                    metadata_dict["project_name"],
+                                    metadata_dict["layer"],
+                                    metadata_dict.get("author"),
+                                )
+                            )
+                            self._is_entries_sorted = False
+                offset += len(line)
+        self._catalog_size = offset
+
+    def _refresh_index(self):
+        with self._index_lock:
+            self._catch_up_index()
+
+    def _catch_up_index(self):
+        try:
+            size = os.path.getsize(self._metadata_path)
+        except FileNotFoundError:
+            self._index = {}
+            self._indexed_size = 0
+            return
+        if size == self._indexed_size:
+            return
+        if size < self._indexed_size:
+            # The metadata file was rewritten, so none of the offsets can be trusted.
+            self._index = {}
+            self._indexed_size = 0
+        if not self._index:
+            self._read_index_file(size)
+        if self._indexed_size < size:
+            entries, self._indexed_size = self._scan(self._indexed_size)
+            for id, offset, _ in entries:
+                self._index.setdefault(id, offset)
+
+    def _persist_index(self):
+        # Another process may have extended the index file, so it is continued from its own last entry.
+        try:
+            indexed_size = self._read_index_file_end()
+            if indexed_size is None:
+                if os.path.exists(self._index_path):
+                    os.remove(self._index_path)
+                indexed_size = 0
+            entries, _ = self._scan(indexed_size)
+            self._append_index_file(entries)
+        except OSError:
+            pass
+
+    def _read_index_file(self, size: int):
+        index: Dict[str, int] = {}
+        last_entry = None
+        try:
+            with open(self._index_path, "r") as f:
+                for line in f:
+                    id, offset, length = line.rstrip("\n").split("\t")
+                    last_entry = (id, int(offset), int(length))
+                    index.setdefault(id, last_entry[1])
+        except (OSError, ValueError):
+            # A missing or broken index file is ignored here and rewritten by the next save.
+            return
+        if last_entry is None or not self._is_valid_entry(last_entry, size):
+            return
+        self._index = index
+        self._indexed_size = last_entry[1] + last_entry[2]
+
+    def _is_valid_entry(self, entry: Tuple[str, int, int], size: int) -> bool:
+        id, offset, length = entry
+        if offset + length > size:
+            return False
+        with open(self._metadata_path, "rb") as f:
+            f.seek(offset)
+            line = f.read(length)
+        try:
+            return json.loads(line)["id"] == id
+        except (ValueError, KeyError):
+            return False
+
+    def _read_index_file_end(self) -> Optional[int]:
+        # The offset of the metadata file the index file covers, None if the index file is broken.
+        try:
+            with open(self._index_path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                if size == 0:
+                    return 0
+                f.seek(max(size - INDEX_TAIL_READ_SIZE, 0))
+                tail = f.read()
+        except FileNotFoundError:
+            return 0
+        lines = tail.split(b"\n")
+        if lines[-1] != b"" or len(lines) < 2:
+            return None
+        try:
+            id, offset, length = lines[-2].decode("utf-8").split("\t")
+            entry = (id, int(offset), int(length))
+        except ValueError:
+            return None
+        if not self._is_valid_entry(entry, os.path.getsize(self._metadata_path)):
+            return None
+        return entry[1] + entry[2]
+
+    def _append_index_file(self, entries: List[Tuple[str, int, int]]):
+        if not entries:
+            return
+        with open(self._index_path, "a") as f:
+            f.write(
+                "".join(f"{id}\t{offset}\t{length}\n" for id, offset, length in entries)
+            )
+
+    def _scan(self, start: int) -> Tuple[List[Tuple[str, int, int]], int]:
+        entries = []
+        offset = start
+        with open(self._metadata_path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if line.strip():
+                    try:
+                        metadata_dict = json.loads(line)
+                    except ValueError:
+                        # A record which is still being written by another process.
+                        break
+                    entries.append((metadata_dict["id"], offset, len(line)))
+                offset += len(line)
+        return entries, offset
+
+    def _ends_with_newline(self) -> bool:
+        with open(self._metadata_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    @staticmethod
+    def _to_metadata(metadata_dict: dict) -> Metadata:
         if metadata_dict["created_at"] is not None:
-            metadata_dict["created_at"] = metadata_dict["created_at"].isoformat()
-        with open(self._metadata_path, "a") as f:
-            f.write(json.dumps(metadata_dict) + "\n")
+            metadata_dict["created_at"] = datetime.fromisoformat(
+                metadata_dict["created_at"]
+            )
+        return Metadata(
+            id=metadata_dict["id"],
+            project_name=metadata_dict["project_name"],
+            layer=metadata_dict["layer"],
+            content_type=ContentType[metadata_dict["content_type"]],
+            author=metadata_dict.get("author"),
+            created_at=metadata_dict["created_at"],
+            description=metadata_dict.get("description"),
+            extra_info=metadata_dict.get("extra_info"),
+            source_ids=metadata_dict.get("source_ids"),
+            format=metadata_dict["format"],
+            compression=metadata_dict.get("compression"),
+        )
 
     def _compose_path(self) -> str:
         return os.path.join(self._path, LOCAL_METADATA_NAME)
+
+    def _compose_index_path(self) -> str:
+        return os.path.join(self._path, LOCAL_METADATA_INDEX_NAME)
+
+
+class AsyncLocalMetadataRepository(AsyncMetadataRepository):
+    def __init__(self, path):
+        """Initializes a new instance of the class.
+
+        Local files have no non-blocking API, so the file I/O runs on the default executor of the event loop.
+
+        Args:
+            path (str): The path of the directory where the metadata file is saved.
+        """
+        self._path = path
+        self._repository = LocalMetadataRepository(path)
+
+    async def load(self, id: str) -> Metadata:
+        """Load the metadata for a given ID.
+
+        Args:
+            id (str): The ID of the metadata to load.
+
+        Returns:
+            Metadata: The loaded metadata.
+
+        Raises:
+            NoMetadataFound: If no metadata is found for the given ID.
+        """
+        return await asyncio.to_thread(self._repository.load, id)
+
+    async def save(self, metadata: Metadata):
+        """Saves the given metadata to a file.
+
+        Parameters:
+            metadata (Metadata): The metadata object to be saved.
+
+        Returns:
+            None
+        """
+        await asyncio.to_thread(self._repository.save, metadata)
@@ -1,12 +1,42 @@
 import json
-from typing import Any, Optional, Sequence, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 from bson.codec_options import TypeRegistry
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, IndexModel, MongoClient
 
+from dcraft.domain.error import NoMetadataFound
 from dcraft.domain.metadata import Metadata
 from dcraft.domain.type.enum import ContentType
 from dcraft.interface.metadata.base import MetadataRepository
+from dcraft.interface.metadata.query import ListPosition, MetadataQuery
+
+METADATA_INDEXES = [
+    IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    # A multikey index, so the descendants are looked up by an element of source_ids.
+    IndexModel([("source_ids", ASCENDING)], name="source_ids"),
+    # id is the tie-breaker of the listing order, so a page is read from the index without sorting.
+    IndexModel(
+        [
+            ("project_name", ASCENDING),
+            ("layer", ASCENDING),
+            ("created_at", DESCENDING),
+            ("id", DESCENDING),
+        ],
+        name="project_name_layer_created_at_id",
+    ),
+    IndexModel(
+        [("author", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+        name="author_created_at_id",
+    ),
+    IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+]
+
+# The indexes of older versions which are a prefix of a current one, so they only slow the writes down.
+OBSOLETE_METADATA_INDEXES = ["project_name_layer_created_at"]
+
+METADATA_LIST_SORT = [("created_at", DESCENDING), ("id", DESCENDING)]
+
+METADATA_PROJECTION = {"_id": 0}
 
 
 class MongoMetadataRepository(MetadataRepository):
@@ -20,6 +50,7 @@ class MongoMetadataRepository(MetadataRepository):
         tz_aware: Optional[bool] = None,
         connect: Optional[bool] = None,
         type_registry: Optional[TypeRegistry] = None,
+        create_indexes: bool = True,
     ):
         """Initializes a new instance of the class.
 
@@ -32,6 +63,10 @@ class MongoMetadataRepository(MetadataRepository):
             tz_aware (Optional[bool], optional): Whether to be timezone aware. Defaults to None.
             connect (Optional[bool], optional): Whether to connect on initialization. Defaults to None.
             type_registry (Optional[TypeRegistry], optional): The type registry. Defaults to None.
+            create_indexes (bool, optional): Whether the indexes are ensured by the first save. Defaults to True.
+                With False, or with read-only credentials, ensure_indexes can be called explicitly instead.
+
+        Loading never creates indexes, so reads don't pay for an index build or need write permissions.
         """
         self._host = host
         self._port = port
@@ -45,6 +80,8 @@ class MongoMetadataRepository(MetadataRepository):
             connect=connect,
             type_registry=type_registry,
         )
+        self._metadata_collection = self._client[db][collection]
+        self._has_indexes = not create_indexes
 
     def load(self, id: str) -> Metadata:
         """Loads metadata for a specific ID.
@@ -54,26 +91,35 @@ class MongoMetadataRepository(MetadataRepository):
 
         Returns:
             Metadata: The loaded metadata object.
+
+        Raises:
+            NoMetadataFound: If no metadata is found for the given ID.
+        """
+        document = self._metadata_collection.find_one(
+            {"id": id}, projection=METADATA_PROJECTION
+        )
+        if document is None:
+            raise NoMetadataFound(f"No Metadata found for {id}")
+        return self._to_metadata(document)
+
+    def load_many(self, ids: List[str]) -> Dict[str, Metadata]:
+        """Loads the metadata for several IDs with a single query.
+
+        Args:
+            ids (List[str]): The IDs of the metadata to load.
+
+        Returns:
+            Dict[str, Metadata]: The loaded metadata keyed by ID. IDs without metadata are left out.
         """
-        collection = self._client[self._db][self._collection]
-        cursor = collection.find({"id": id})
+        if not ids:
+            return {}
+        cursor = self._metadata_collection.find(
+            {"id": {"$in": list(set(ids))}}, projection=METADATA_PROJECTION
+        )
+        metadata_dict: Dict[str, Metadata] = {}
         for document in cursor:
-            metadata = Metadata(
-                id=document["id"],
-                project_name=document["project_name"],
-                layer=document["layer"],
-                content_type=ContentType[document["content_type"]],
-                author=document["author"],
-                created_at=document["created_at"],
-                description=document["description"],
-                extra_info=json.loads(document["extra_info"])
-                if document["extra_info"] is not None
-                else None,
-                source_ids=document["source_ids"],
-                format=document["format"],
-            )
-            break
-        return metadata
+            metadata_dict.setdefault(document["id"], self._to_metadata(document))
+        return metadata_dict
 
     def save(self, metadata: Metadata):
         """Save the given metadata to the database.
@@ -84,11 +130,168 @@ class MongoMetadataRepository(MetadataRepository):
         Returns:
             None
         """
+        self._ensure_indexes_once()
+        self._metadata_collection.insert_one(self._to_document(metadata))
+
+    def save_many(self, metadata_list: List[Metadata]):
+        """Save the given metadata objects to the database with a single unordered insert.
+
+        Args:
+            metadata_list (List[Metadata]): The metadata objects to save.
+
+        Returns:
+            None
+        """
+        if not metadata_list:
+            return
+        self._ensure_indexes_once()
+        self._metadata_collection.insert_many(
+            [self._to_document(metadata) for metadata in metadata_list], ordered=False
+        )
+
+    def ensure_indexes(self):
+        """Create the unique index on id and the indexes of the lineage and the listing, and drop the
+        obsolete indexes of older versions.
+
+        Building the unique index fails if the collection already holds duplicate IDs.
+
+        Returns:
+            None
+        """
+        self._metadata_collection.create_indexes(METADATA_INDEXES)
+        existing_indexes = self._metadata_collection.index_information()
+        for name in OBSOLETE_METADATA_INDEXES:
+            if name in existing_indexes:
+                self._metadata_collection.drop_index(name)
+        self._has_indexes = True
+
+    def get_ancestors(
+        self, id: str, depth: Optional[int] = None
+    ) -> Dict[str, Metadata]:
+        """Get the metadata of the layer data the ID was made from with a single $graphLookup.
+
+        Args:
+            id (str): The ID whose ancestors are returned.
+            depth (int, optional): The maximum number of hops, 1 for the direct sources only.
+                Defaults to None, no limit.
+
+        Returns:
+            Dict[str, Metadata]: The metadata of the ancestors keyed by ID. The ID itself is left out.
+        """
+        return self._graph_lookup(id, depth, "$source_ids", "source_ids", "id")
+
+    def get_descendants(
+        self, id: str, depth: Optional[int] = None
+    ) -> Dict[str, Metadata]:
+        """Get the metadata of the layer data made from the ID with a single $graphLookup.
+
+        Args:
+            id (str): The ID whose descendants are returned.
+            depth (int, optional): The maximum number of hops, 1 for the direct children only.
+                Defaults to None, no limit.
+
+        Returns:
+            Dict[str, Metadata]: The metadata of the descendants keyed by ID. The ID itself is left out.
+        """
+        return self._graph_lookup(id, depth, "$id", "id", "source_ids")
+
+    def _graph_lookup(
+        self,
+        id: str,
+        depth: Optional[int],
+        start_with: str,
+        connect_from_field: str,
+        connect_to_field: str,
+    ) -> Dict[str, Metadata]:
+        if depth is not None and depth < 1:
+            return {}
+        graph_lookup: Dict[str, Any] = {
+            "from": self._collection,
+            "startWith": start_with,
+            "connectFromField": connect_from_field,
+            "connectToField": connect_to_field,
+            "as": "lineage",
+        }
+        if depth is not None:
+            # maxDepth 0 is the documents matched by startWith.
+            graph_lookup["maxDepth"] = depth - 1
+        pipeline = [
+            {"$match": {"id": id}},
+            {"$limit": 1},
+            {"$graphLookup": graph_lookup},
+            {"$project": {"_id": 0, "lineage": 1}},
+        ]
+        metadata_dict: Dict[str, Metadata] = {}
+        for document in self._metadata_collection.aggregate(pipeline):
+            for lineage_document in document["lineage"]:
+                if lineage_document["id"] != id:
+                    metadata_dict.setdefault(
+                        lineage_document["id"], self._to_metadata(lineage_document)
+                    )
+        return metadata_dict
+
+    def _list_page(
+        self, query: MetadataQuery, limit: int, after: Optional[ListPosition]
+    ) -> List[Metadata]:
+        conditions: List[Dict[str, Any]] = []
+        for field, value in [
+            ("project_name", query.project_name),
+            ("layer", query.layer),
+            ("author", query.author),
+        ]:
+            if value is not None:
+                conditions.append({field: value})
+        if query.created_after is not None:
+            conditions.append({"created_at": {"$gte": query.created_after}})
+        if query.created_before is not None:
+            conditions.append({"created_at": {"$lt": query.created_before}})
+        if after is not None:
+            conditions.append(
+                {
+                    "$or": [
+                        {"created_at": {"$lt": after[0]}},
+                        {"created_at": after[0], "id": {"$lt": after[1]}},
+                    ]
+                }
+            )
+        cursor = (
+            self._metadata_collection.find(
+                {"$and": conditions} if conditions else {},
+                projection=METADATA_PROJECTION,
+            )
+            .sort(METADATA_LIST_SORT)
+            .limit(limit)
+        )
+        return [self._to_metadata(document) for document in cursor]
+
+    def _ensure_indexes_once(self):
+        if not self._has_indexes:
+            self.ensure_indexes()
+
+    @staticmethod
+    def _to_document(metadata: Metadata) -> dict:
         metadata_dict = metadata.asdict
         metadata_dict["extra_info"] = (
             json.dumps(metadata_dict["extra_info"])
             if metadata_dict["extra_info"] is not None
             else None
         )
-        collection = self._client[self._db][self._collection]
-        collection.insert_one(metadata_dict)
+        return metadata_dict
+
+    @staticmethod
+    def _to_metadata(document: dict) -> Metadata:
+        return Metadata(
+            id=document["id"],
+            project_name=document["project_name"],
+            layer=document["layer"],
+            content_type=ContentType[document["content_type"]],
+            author=document["author"],
+            created_at=document["created_at"],
+            description=document["description"],
+            extra_info=json.loads(document["extra_info"])
+            if document["extra_info"] is not None
+            else None,
+            source_ids=document["source_ids"],
+            format=document["format"],
+            compression=document.get("compression"),
+        )
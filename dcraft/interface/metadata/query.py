@@ -0,0 +1,172 @@
+import base64
+import json
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+
+from dcraft.domain.metadata import Metadata
+
+DEFAULT_PAGE_SIZE = 1000
+
+# The range of created_at, the start included and the end excluded. None leaves the side open.
+CreatedBetween = Tuple[Optional[datetime], Optional[datetime]]
+
+# The created_at and the ID of the last listed metadata. The listing continues with the older ones.
+ListPosition = Tuple[datetime, str]
+
+
+@dataclass(frozen=True)
+class MetadataQuery:
+    project_name: Optional[str] = None
+    layer: Optional[str] = None
+    author: Optional[str] = None
+    created_between: Optional[CreatedBetween] = None
+
+    @property
+    def created_after(self) -> Optional[datetime]:
+        return self.created_between[0] if self.created_between else None
+
+    @property
+    def created_before(self) -> Optional[datetime]:
+        return self.created_between[1] if self.created_between else None
+
+    def matches(
+        self,
+        project_name: str,
+        layer: str,
+        author: Optional[str],
+        created_at: datetime,
+    ) -> bool:
+        """Whether the metadata with the given fields matches the query.
+
+        Args:
+            project_name (str): The name of the project.
+            layer (str): The name of the layer.
+            author (str, optional): The author.
+            created_at (datetime): The creation time.
+
+        Returns:
+            bool: True if every given condition of the query holds.
+        """
+        if self.project_name is not None and project_name != self.project_name:
+            return False
+        if self.layer is not None and layer != self.layer:
+            return False
+        if self.author is not None and author != self.author:
+            return False
+        if self.created_after is not None and created_at < self.created_after:
+            return False
+        if self.created_before is not None and created_at >= self.created_before:
+            return False
+        return True
+
+
+def encode_cursor(position: ListPosition) -> str:
+    """Encode the position of the last listed metadata as an opaque cursor.
+
+    Args:
+        position (ListPosition): The created_at and the ID of the last listed metadata.
+
+    Returns:
+        str: The cursor.
+    """
+    created_at, id = position
+    data = json.dumps([created_at.isoformat(), id])
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> ListPosition:
+    """Decode the cursor returned by a previous listing.
+
+    Args:
+        cursor (str): The cursor.
+
+    Returns:
+        ListPosition: The created_at and the ID of the last listed metadata.
+
+    Raises:
+        ValueError: If the cursor is not a cursor of a listing.
+    """
+    try:
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), id
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+class MetadataPager:
+    def __init__(
+        self,
+        load_page: Callable[[int, Optional[ListPosition]], List[Metadata]],
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        """Initializes a new instance of the class.
+
+        The metadata are iterated from the newest to the oldest, and loaded one page at a time on demand.
+
+        Args:
+            load_page (Callable[[int, Optional[ListPosition]], List[Metadata]]): The function loading
+                at most the given number of metadata older than the position.
+            limit (int, optional): The maximum number of metadata to be iterated. Defaults to None, no limit.
+            cursor (str, optional): The cursor the listing continues from. Defaults to None, from the newest.
+            page_size (int, optional): The maximum number of metadata loaded at a time. Defaults to 1000.
+
+        Raises:
+            ValueError: If the limit is negative, the page size is not positive or the cursor is invalid.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative.")
+        if page_size < 1:
+            raise ValueError("page_size must be positive.")
+        self._load_page = load_page
+        self._remaining = limit
+        self._page_size = page_size
+        self._position = decode_cursor(cursor) if cursor is not None else None
+        self._cursor = cursor
+        self._buffer: Deque[Metadata] = deque()
+        self._has_more = True
+        self._can_load = limit != 0
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        """The cursor continuing the listing after the last iterated metadata.
+
+        Returns:
+            Optional[str]: The cursor, or None if no metadata is left.
+        """
+        if self._buffer or self._has_more:
+            return self._cursor
+        return None
+
+    def __iter__(self) -> Iterator[Metadata]:
+        return self
+
+    def __next__(self) -> Metadata:
+        if not self._buffer:
+            if not self._can_load:
+                raise StopIteration
+            self._load_next_page()
+            if not self._buffer:
+                raise StopIteration
+        metadata = self._buffer.popleft()
+        self._cursor = encode_cursor((metadata.created_at, metadata.id))
+        return metadata
+
+    def _load_next_page(self):
+        size = self._page_size
+        if self._remaining is not None:
+            # One more than the remaining, to know if metadata is left after the limit.
+            size = min(size, self._remaining + 1)
+        page = self._load_page(size, self._position)
+        self._has_more = len(page) >= size
+        if self._remaining is not None:
+            if len(page) > self._remaining:
+                page = page[: self._remaining]
+            self._remaining -= len(page)
+        if page:
+            self._position = (page[-1].created_at, page[-1].id)
+        self._buffer.extend(page)
+        self._can_load = self._has_more and self._remaining != 0
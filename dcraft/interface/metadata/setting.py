@@ -1 +1,3 @@
 LOCAL_METADATA_NAME = "metadata.jsonl"
+LOCAL_METADATA_INDEX_NAME = "metadata.index"
+SQLITE_METADATA_TABLE_NAME = "metadata"
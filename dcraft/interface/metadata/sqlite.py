@@ -0,0 +1,373 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from dcraft.domain.error import NoMetadataFound
+from dcraft.domain.metadata import Metadata
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.metadata.base import MetadataRepository
+from dcraft.interface.metadata.query import ListPosition, MetadataQuery
+from dcraft.interface.metadata.setting import SQLITE_METADATA_TABLE_NAME
+
+METADATA_COLUMNS = [
+    "id",
+    "project_name",
+    "layer",
+    "content_type",
+    "author",
+    "created_at",
+    "description",
+    "extra_info",
+    "source_ids",
+    "format",
+    "compression",
+]
+
+METADATA_CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS {0} (
+    id TEXT PRIMARY KEY,
+    project_name TEXT NOT NULL,
+    layer TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    author TEXT,
+    created_at TEXT NOT NULL,
+    description TEXT,
+    extra_info TEXT,
+    source_ids TEXT,
+    format TEXT NOT NULL,
+    compression TEXT
+)
+"""
+
+METADATA_CREATE_INDEX_QUERIES = [
+    "CREATE INDEX IF NOT EXISTS {0}_layer_created_at ON {0} (layer, created_at)",
+    "CREATE INDEX IF NOT EXISTS {0}_created_at ON {0} (created_at)",
+    # id is the tie-breaker of the listing order, so a page is read from the index without sorting.
+    "CREATE INDEX IF NOT EXISTS {0}_project_layer_created_at_id ON {0} (project_name, layer, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS {0}_author_created_at_id ON {0} (author, created_at, id)",
+]
+
+# The indexes of older versions which are a prefix of a current one, so they only slow the writes down.
+METADATA_DROP_INDEX_QUERIES = [
+    "DROP INDEX IF EXISTS {0}_project_layer_created_at",
+]
+
+METADATA_TABLE_INFO_QUERY = "PRAGMA table_info({})"
+
+METADATA_ADD_COLUMN_QUERY = "ALTER TABLE {} ADD COLUMN {} TEXT"
+
+METADATA_INSERT_QUERY = "INSERT INTO {} ({}) VALUES ({})"
+
+METADATA_GET_QUERY = "SELECT {} FROM {} WHERE id = ?"
+
+METADATA_GET_MANY_QUERY = (
+    "SELECT {} FROM {} WHERE id IN (SELECT value FROM json_each(?))"
+)
+
+METADATA_LIST_QUERY = "SELECT {} FROM {}{} ORDER BY created_at DESC, id DESC LIMIT ?"
+
+# The source_ids edges, indexed both ways, so the lineage is walked with index lookups in both directions.
+LINEAGE_CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS {0}_lineage (
+    source_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (source_id, id)
+)
+"""
+
+LINEAGE_CREATE_INDEX_QUERY = (
+    "CREATE INDEX IF NOT EXISTS {0}_lineage_id ON {0}_lineage (id, source_id)"
+)
+
+LINEAGE_TABLE_EXISTS_QUERY = (
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+)
+
+LINEAGE_BACKFILL_QUERY = """
+INSERT OR IGNORE INTO {0}_lineage (source_id, id)
+SELECT source.value, {0}.id FROM {0}, json_each({0}.source_ids) AS source
+WHERE {0}.source_ids IS NOT NULL
+"""
+
+LINEAGE_INSERT_QUERY = "INSERT OR IGNORE INTO {}_lineage (source_id, id) VALUES (?, ?)"
+
+# {2} is the column walked to and {3} the column walked from: source_id and id for the ancestors,
+# id and source_id for the descendants.
+LINEAGE_QUERY = """
+WITH RECURSIVE lineage(id) AS (
+    SELECT {2} FROM {0}_lineage WHERE {3} = ?
+    UNION
+    SELECT edge.{2} FROM lineage JOIN {0}_lineage AS edge ON edge.{3} = lineage.id
+)
+SELECT {1} FROM {0} WHERE id IN (SELECT id FROM lineage) AND id != ?
+"""
+
+LINEAGE_WITH_DEPTH_QUERY = """
+WITH RECURSIVE lineage(id, depth) AS (
+    SELECT {2}, 1 FROM {0}_lineage WHERE {3} = ?
+    UNION
+    SELECT edge.{2}, lineage.depth + 1
+    FROM lineage JOIN {0}_lineage AS edge ON edge.{3} = lineage.id
+    WHERE lineage.depth < ?
+)
+SELECT {1} FROM {0} WHERE id IN (SELECT id FROM lineage) AND id != ?
+"""
+
+
+class SqliteMetadataRepository(MetadataRepository):
+    def __init__(
+        self,
+        path: str,
+        table_name: str = SQLITE_METADATA_TABLE_NAME,
+        timeout: float = 5.0,
+    ):
+        """Initializes a new instance of the class.
+
+        The database is opened in WAL mode, so readers are not blocked by a writer and
+        several processes on the same node can share the file.
+
+        Args:
+            path (str): The path of the SQLite database file.
+            table_name (str, optional): The name of the metadata table. Defaults to "metadata".
+            timeout (float, optional): Seconds to wait for a lock held by another connection. Defaults to 5.0.
+        """
+        self._path = path
+        self._table_name = table_name
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(METADATA_CREATE_TABLE_QUERY.format(table_name))
+            for query in METADATA_CREATE_INDEX_QUERIES + METADATA_DROP_INDEX_QUERIES:
+                self._connection.execute(query.format(table_name))
+            self._add_missing_columns()
+            self._ensure_lineage_table()
+
+    def load(self, id: str) -> Metadata:
+        """Loads the metadata for a specific ID.
+
+        Args:
+            id (str): The ID of the metadata to load.
+
+        Returns:
+            Metadata: The loaded metadata.
+
+        Raises:
+            NoMetadataFound: If no metadata is found for the given ID.
+        """
+        query = METADATA_GET_QUERY.format(", ".join(METADATA_COLUMNS), self._table_name)
+        with self._lock:
+            row = self._connection.execute(query, (id,)).fetchone()
+        if row is None:
+            raise NoMetadataFound(f"No Metadata found for {id}")
+        return self._to_metadata(row)
+
+    def load_many(self, ids: List[str]) -> Dict[str, Metadata]:
+        """Loads the metadata for several IDs with a single query.
+
+        Args:
+            ids (List[str]): The IDs of the metadata to load.
+
+        Returns:
+            Dict[str, Metadata]: The loaded metadata keyed by ID. IDs without metadata are left out.
+        """
+        if not ids:
+            return {}
+        query = METADATA_GET_MANY_QUERY.format(
+            ", ".join(METADATA_COLUMNS), self._table_name
+        )
+        with self._lock:
+            rows = self._connection.execute(
+                query, (json.dumps(list(set(ids))),)
+            ).fetchall()
+        metadata_list = [self._to_metadata(row) for row in rows]
+        return {metadata.id: metadata for metadata in metadata_list}
+
+    def save(self, metadata: Metadata):
+        """Save the given metadata to the table.
+
+        Args:
+            metadata (Metadata): The metadata object to save.
+
+        Returns:
+            None
+        """
+        self.save_many([metadata])
+
+    def save_many(self, metadata_list: List[Metadata]):
+        """Save the given metadata objects to the table in a single transaction.
+
+        Args:
+            metadata_list (List[Metadata]): The metadata objects to save.
+
+        Returns:
+            None
+        """
+        query = METADATA_INSERT_QUERY.format(
+            self._table_name,
+            ", ".join(METADATA_COLUMNS),
+            ", ".join(["?"] * len(METADATA_COLUMNS)),
+        )
+        with self._lock, self._connection:
+            self._connection.executemany(
+                query, [self._to_row(metadata) for metadata in metadata_list]
+            )
+            self._connection.executemany(
+                LINEAGE_INSERT_QUERY.format(self._table_name),
+                [
+                    (source_id, metadata.id)
+                    for metadata in metadata_list
+                    for source_id in metadata.source_ids or []
+                ],
+            )
+
+    def get_ancestors(
+        self, id: str, depth: Optional[int] = None
+    ) -> Dict[str, Metadata]:
+        """Get the metadata of the layer data the ID was made from with a single recursive query.
+
+        Args:
+            id (str): The ID whose ancestors are returned.
+            depth (int, optional): The maximum number of hops, 1 for the direct sources only.
+                Defaults to None, no limit.
+
+        Returns:
+            Dict[str, Metadata]: The metadata of the ancestors keyed by ID. The ID itself is left out.
+        """
+        return self._query_lineage(id, depth, "source_id", "id")
+
+    def get_descendants(
+        self, id: str, depth: Optional[int] = None
+    ) -> Dict[str, Metadata]:
+        """Get the metadata of the layer data made from the ID with a single recursive query.
+
+        Args:
+            id (str): The ID whose descendants are returned.
+            depth (int, optional): The maximum number of hops, 1 for the direct children only.
+                Defaults to None, no limit.
+
+        Returns:
+            Dict[str, Metadata]: The metadata of the descendants keyed by ID. The ID itself is left out.
+        """
+        return self._query_lineage(id, depth, "id", "source_id")
+
+    def close(self):
+        """Close the connection to the database."""
+        self._connection.close()
+
+    def _list_page(
+        self, query: MetadataQuery, limit: int, after: Optional[ListPosition]
+    ) -> List[Metadata]:
+        conditions = []
+        parameters: list = []
+        for column, value in [
+            ("project_name", query.project_name),
+            ("layer", query.layer),
+            ("author", query.author),
+        ]:
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if query.created_after is not None:
+            conditions.append("created_at >= ?")
+            parameters.append(query.created_after.isoformat())
+        if query.created_before is not None:
+            conditions.append("created_at < ?")
+            parameters.append(query.created_before.isoformat())
+        if after is not None:
+            conditions.append("(created_at, id) < (?, ?)")
+            parameters.extend([after[0].isoformat(), after[1]])
+        sql = METADATA_LIST_QUERY.format(
+            ", ".join(METADATA_COLUMNS),
+            self._table_name,
+            f" WHERE {' AND '.join(conditions)}" if conditions else "",
+        )
+        with self._lock:
+            rows = self._connection.execute(sql, parameters + [limit]).fetchall()
+        return [self._to_metadata(row) for row in rows]
+
+    def _query_lineage(
+        self, id: str, depth: Optional[int], to_column: str, from_column: str
+    ) -> Dict[str, Metadata]:
+        if depth is not None and depth < 1:
+            return {}
+        columns = ", ".join(METADATA_COLUMNS)
+        if depth is None:
+            query = LINEAGE_QUERY.format(
+                self._table_name, columns, to_column, from_column
+            )
+            parameters: tuple = (id, id)
+        else:
+            query = LINEAGE_WITH_DEPTH_QUERY.format(
+                self._table_name, columns, to_column, from_column
+            )
+            parameters = (id, depth, id)
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        metadata_list = [self._to_metadata(row) for row in rows]
+        return {metadata.id: metadata for metadata in metadata_list}
+
+    def _ensure_lineage_table(self):
+        exists = (
+            self._connection.execute(
+                LINEAGE_TABLE_EXISTS_QUERY, (f"{self._table_name}_lineage",)
+            ).fetchone()
+            is not None
+        )
+        self._connection.execute(LINEAGE_CREATE_TABLE_QUERY.format(self._table_name))
+        self._connection.execute(LINEAGE_CREATE_INDEX_QUERY.format(self._table_name))
+        if not exists:
+            # Metadata saved before the lineage table existed.
+            self._connection.execute(LINEAGE_BACKFILL_QUERY.format(self._table_name))
+
+    def _add_missing_columns(self):
+        # Tables created by an older version lack the columns added since then.
+        existing_columns = {
+            row[1]
+            for row in self._connection.execute(
+                METADATA_TABLE_INFO_QUERY.format(self._table_name)
+            )
+        }
+        for column in METADATA_COLUMNS:
+            if column not in existing_columns:
+                self._connection.execute(
+                    METADATA_ADD_COLUMN_QUERY.format(self._table_name, column)
+                )
+
+    @staticmethod
+    def _to_row(metadata: Metadata) -> tuple:
+        metadata_dict = metadata.asdict
+        metadata_dict["created_at"] = metadata_dict["created_at"].isoformat()
+        for key in ["extra_info", "source_ids"]:
+            metadata_dict[key] = (
+                json.dumps(metadata_dict[key])
+                if metadata_dict[key] is not None
+                else None
+            )
+        return tuple(metadata_dict[column] for column in METADATA_COLUMNS)
+
+    @staticmethod
+    def _to_metadata(row: tuple) -> Metadata:
+        metadata_dict = dict(zip(METADATA_COLUMNS, row))
+        return Metadata(
+            id=metadata_dict["id"],
+            project_name=metadata_dict["project_name"],
+            layer=metadata_dict["layer"],
+            content_type=ContentType[metadata_dict["content_type"]],
+            author=metadata_dict["author"],
+            created_at=datetime.fromisoformat(metadata_dict["created_at"]),
+            description=metadata_dict["description"],
+            extra_info=json.loads(metadata_dict["extra_info"])
+            if metadata_dict["extra_info"] is not None
+            else None,
+            source_ids=json.loads(metadata_dict["source_ids"])
+            if metadata_dict["source_ids"] is not None
+            else None,
+            format=metadata_dict["format"],
+            compression=metadata_dict["compression"],
+        )
@@ -7,8 +7,19 @@ deps = ["pandas", "pyarrow"]
 gcp_deps = ["google-cloud-storage>=2.6.0", "google-cloud-bigquery", "pyarrow"]
 mongo_deps = ["pymongo"]
 minio_deps = ["minio"]
+gcp_async_deps = ["gcloud-aio-storage"]
+minio_async_deps = ["miniopy-async"]
+json_deps = ["orjson"]
 test_requires = ["pytest"]
-all_requirements = deps + gcp_deps + mongo_deps + minio_deps
+all_requirements = (
+    deps
+    + gcp_deps
+    + mongo_deps
+    + minio_deps
+    + gcp_async_deps
+    + minio_async_deps
+    + json_deps
+)
 
 setup(
     name="dcraft",
@@ -22,6 +33,9 @@ setup(
         "gcp": gcp_deps,
         "mongo": mongo_deps,
         "minio": minio_deps,
+        "gcp-async": gcp_async_deps,
+        "minio-async": minio_async_deps,
+        "json": json_deps,
         "test": test_requires,
         "all": all_requirements
     },
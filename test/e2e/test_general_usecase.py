@@ -1,3 +1,4 @@
+import os
 from itertools import product
 
 import pandas as pd
@@ -6,6 +7,7 @@ from pytest import mark
 from dcraft import (
     LocalDataRepository,
     LocalMetadataRepository,
+    SqliteMetadataRepository,
     create_raw,
     create_refined,
     create_trusted,
@@ -60,7 +62,7 @@ def compose_parameters():
     DATA_REPOSITORIES = [LocalDataRepository]
     if WITH_GCS:
         DATA_REPOSITORIES.append(GcsDataRepository)
-    METADATA_REPOSITORIES = [LocalMetadataRepository]
+    METADATA_REPOSITORIES = [LocalMetadataRepository, SqliteMetadataRepository]
     if WITH_BQ:
         METADATA_REPOSITORIES.append(BqMetadataRepository)
     if WITH_MONGO:
@@ -69,11 +71,15 @@ def compose_parameters():
         DATA_REPOSITORIES.append(MinioRepository)
     DICT_CONTENTS = [{"a": 1, "b": 2}, [{"a": 1, "b": 2}, {"a": 3, "b": 4}]]
     DICT_FORMATS = ["json"]
+    DICT_LIST_CONTENTS = [[{"a": 1, "b": 2}, {"a": 3, "b": 4}]]
+    DICT_LIST_FORMATS = ["jsonl"]
     DF_CONTENTS = [pd.DataFrame({"a": [1], "b": [2]})]
-    DF_FORMATS = ["csv", "parquet"]
+    DF_FORMATS = ["csv", "parquet", "feather"]
 
     data_and_metadata = list(product(DATA_REPOSITORIES, METADATA_REPOSITORIES))
-    dict_content_and_format = product(DICT_CONTENTS, DICT_FORMATS)
+    dict_content_and_format = list(product(DICT_CONTENTS, DICT_FORMATS)) + list(
+        product(DICT_LIST_CONTENTS, DICT_LIST_FORMATS)
+    )
     df_content_and_format = product(DF_CONTENTS, DF_FORMATS)
     return [
         (*p[0], *p[1], lambda x: x, lambda x: x)
@@ -113,6 +119,10 @@ def test_general_usecase(
         )
     if metadata_repository_class is LocalMetadataRepository:
         metadata_repository = metadata_repository_class(tmp_path)
+    elif metadata_repository_class is SqliteMetadataRepository:
+        metadata_repository = metadata_repository_class(
+            os.path.join(tmp_path, "metadata.db")
+        )
     elif metadata_repository_class is BqMetadataRepository:
         metadata_repository = metadata_repository_class(
             GCP_PROJECT, BQ_DATASET_ID, BQ_TABLE_ID
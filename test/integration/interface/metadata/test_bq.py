@@ -91,3 +91,29 @@ def test_save_with_optional_information(id):
     )
 
     metadata_repository.save(metadata)
+
+
+@mark.integration
+def test_save_and_load_with_stream_mode():
+    id = str(uuid4())
+    metadata = Metadata(
+        id=id,
+        project_name="test-project",
+        layer="raw",
+        content_type=ContentType.DICT,
+        author="test-author",
+        created_at=datetime(2023, 1, 1),
+        description="test-description",
+        extra_info=None,
+        source_ids=[],
+        format="json",
+    )
+
+    metadata_repository = BqMetadataRepository(
+        GCP_PROJECT, "test_dataset", "test_table", write_mode="stream"
+    )
+    metadata_repository.save(metadata)
+    assert metadata_repository.load(id) == metadata
+
+    metadata_repository.flush()
+    assert metadata_repository.load(id) == metadata
@@ -97,3 +97,35 @@ def test_save_with_optional_information(id):
     )
 
     metadata_repository.save(metadata)
+
+
+@mark.integration
+def test_save_many_and_load_many():
+    metadata_list = [
+        Metadata(
+            id=str(uuid4()),
+            project_name="test-project",
+            layer="raw",
+            content_type=ContentType.DICT,
+            author="test-author",
+            created_at=datetime(2023, 1, 1),
+            description="test-description",
+            extra_info=None,
+            source_ids=None,
+            format="json",
+        )
+        for _ in range(3)
+    ]
+
+    metadata_repository = MongoMetadataRepository(
+        MONGO_DB,
+        MONGO_COLLECTION,
+        MONGO_HOST,
+        MONGO_PORT,
+    )
+    metadata_repository.save_many(metadata_list)
+
+    assert metadata_repository.load_many(
+        [metadata.id for metadata in metadata_list]
+    ) == {metadata.id: metadata for metadata in metadata_list}
+    assert "id_unique" in metadata_repository._metadata_collection.index_information()
@@ -8,6 +8,8 @@ import pytest
 from dcraft.domain.error import NotCoveredContentType
 from dcraft.domain.layer.raw import RawLayerData
 from dcraft.domain.loader import read_layer_data
+from dcraft.domain.loader.raw import create_raw
+from dcraft.domain.type.enum import ContentType
 from dcraft.interface.data.local import LocalDataRepository
 from dcraft.interface.metadata.local import LocalMetadataRepository
 
@@ -114,3 +116,64 @@ def test_raw_layer_load():
 
     expected_content = {"a": 1, "b": 2}
     assert raw_layer_data.content == expected_content
+
+
+def test_raw_layer_data_content_type_is_determined_once(monkeypatch):
+    content = [{"a": 1}, {"a": 2}]
+    raw_data_layer = RawLayerData(
+        None, "test-project", content, None, datetime.now(), None, None
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The content type is determined again.")
+
+    monkeypatch.setattr(RawLayerData, "_get_content_type", staticmethod(fail))
+
+    assert raw_data_layer.content_type == ContentType.DICT_LIST
+    assert raw_data_layer._compose_metadata("id", "json").content_type == (
+        ContentType.DICT_LIST
+    )
+
+
+def test_raw_layer_data_init_with_validation_sample_size():
+    content = [{"a": i} for i in range(1000)]
+    content[500] = "not a dict"
+
+    sampled = RawLayerData(
+        None,
+        "test-project",
+        content,
+        None,
+        datetime.now(),
+        None,
+        None,
+        validation_sample_size=10,
+    )
+
+    assert sampled.content_type == ContentType.DICT_LIST
+    with pytest.raises(NotCoveredContentType):
+        RawLayerData(None, "test-project", content, None, datetime.now(), None, None)
+
+
+def test_raw_layer_data_init_with_content_type():
+    content = [{"a": 1}, "not inspected"]
+
+    raw_data_layer = create_raw(
+        content, "test-project", content_type=ContentType.DICT_LIST
+    )
+
+    assert raw_data_layer.content_type == ContentType.DICT_LIST
+    with pytest.raises(NotCoveredContentType):
+        create_raw(content, "test-project", content_type=ContentType.DF)
+
+
+@pytest.mark.parametrize("validation_sample_size", [0, -1])
+def test_raw_layer_data_init_with_invalid_validation_sample_size(
+    validation_sample_size,
+):
+    with pytest.raises(ValueError):
+        create_raw(
+            [{"a": 1}, "not a dict"],
+            "test-project",
+            validation_sample_size=validation_sample_size,
+        )
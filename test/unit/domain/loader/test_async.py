@@ -0,0 +1,33 @@
+import asyncio
+
+import pandas as pd
+
+from dcraft.domain.layer.raw import RawLayerData
+from dcraft.domain.loader import read_layer_data_async
+from dcraft.domain.loader.raw import create_raw
+from dcraft.interface.data.local import AsyncLocalDataRepository
+from dcraft.interface.metadata.local import AsyncLocalMetadataRepository
+
+
+def test_read_layer_data_async(tmp_path):
+    data_repository = AsyncLocalDataRepository(tmp_path)
+    metadata_repository = AsyncLocalMetadataRepository(tmp_path)
+    content = pd.DataFrame({"a": [1], "b": [2]})
+    raw_layer_data = create_raw(content, "test-project")
+    metadata = raw_layer_data._compose_metadata("test-id", "parquet")
+
+    async def run():
+        await data_repository.save(
+            content, "test-project", "raw", "test-id", "parquet", metadata.content_type
+        )
+        await metadata_repository.save(metadata)
+        return await asyncio.gather(
+            *[
+                read_layer_data_async("test-id", data_repository, metadata_repository)
+                for _ in range(3)
+            ]
+        )
+
+    for loaded_layer_data in asyncio.run(run()):
+        assert isinstance(loaded_layer_data, RawLayerData)
+        assert loaded_layer_data.content.equals(content)
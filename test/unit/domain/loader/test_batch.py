@@ -0,0 +1,130 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from dcraft.domain.error import MetadataSaveFailed, NoMetadataFound, NotCoveredFormat
+from dcraft.domain.layer.raw import RawLayerData
+from dcraft.domain.layer.trusted import TrustedLayerData
+from dcraft.domain.loader import read_layer_data_many, save_many
+from dcraft.domain.loader.raw import create_raw
+from dcraft.domain.loader.trusted import create_trusted
+from dcraft.interface.data.local import LocalDataRepository
+from dcraft.interface.metadata.local import LocalMetadataRepository
+
+
+def test_read_layer_data_many(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    raw_layer_data = create_raw({"a": 1, "b": 2}, "test-project")
+    raw_layer_data.save("json", data_repository, metadata_repository)
+    trusted_layer_data = create_trusted(
+        pd.DataFrame({"a": [1], "b": [2]}),
+        "test-project",
+        source_ids=[raw_layer_data.id],
+    )
+    trusted_layer_data.save("parquet", data_repository, metadata_repository)
+
+    layer_data_list = read_layer_data_many(
+        [trusted_layer_data.id, "not-saved-id", raw_layer_data.id],
+        data_repository,
+        metadata_repository,
+        max_workers=2,
+    )
+
+    assert isinstance(layer_data_list[0], TrustedLayerData)
+    assert layer_data_list[0].content.equals(trusted_layer_data.content)
+    assert isinstance(layer_data_list[1], NoMetadataFound)
+    assert isinstance(layer_data_list[2], RawLayerData)
+    assert layer_data_list[2].content == raw_layer_data.content
+
+
+def test_save_many(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    layer_data_list = [create_raw({"a": i}, "test-project") for i in range(3)] + [
+        create_trusted({"a": 3}, "test-project")
+    ]
+
+    save_many(layer_data_list, "json", data_repository, metadata_repository)
+
+    loaded_layer_data_list = read_layer_data_many(
+        [layer_data.id for layer_data in layer_data_list],
+        data_repository,
+        metadata_repository,
+    )
+    assert [layer_data.content for layer_data in loaded_layer_data_list] == [
+        {"a": i} for i in range(4)
+    ]
+    with open(os.path.join(tmp_path, "metadata.jsonl")) as f:
+        assert len(f.readlines()) == 4
+
+
+def test_save_many_failed_content(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    layer_data_list = [
+        create_raw({"a": 1}, "test-project"),
+        create_raw([{"a": 1}], "test-project"),
+    ]
+
+    with pytest.raises(NotCoveredFormat):
+        save_many(layer_data_list, "csv", data_repository, metadata_repository)
+
+    assert [layer_data.id for layer_data in layer_data_list] == [None, None]
+    assert not os.path.exists(os.path.join(tmp_path, "metadata.jsonl"))
+
+
+def test_save_many_failed_metadata(tmp_path):
+    class FailingMetadataRepository(LocalMetadataRepository):
+        def save_many(self, metadata_list):
+            raise MetadataSaveFailed("test")
+
+    data_repository = LocalDataRepository(tmp_path)
+    layer_data_list = [create_raw({"a": i}, "test-project") for i in range(2)]
+
+    with pytest.raises(MetadataSaveFailed):
+        save_many(
+            layer_data_list,
+            "json",
+            data_repository,
+            FailingMetadataRepository(tmp_path),
+        )
+
+    assert [layer_data.id for layer_data in layer_data_list] == [None, None]
+
+
+def test_save_many_skips_contents_after_failure(tmp_path):
+    class FailingDataRepository(LocalDataRepository):
+        def __init__(self, dir_path):
+            super().__init__(dir_path)
+            self.saved_contents = []
+
+        def save(self, content, *args, **kwargs):
+            self.saved_contents.append(content)
+            if content == {"a": 0}:
+                # Still being written when the next content fails.
+                time.sleep(0.2)
+            elif content == {"a": 1}:
+                raise OSError("test")
+            super().save(content, *args, **kwargs)
+
+    data_repository = FailingDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    layer_data_list = [create_raw({"a": i}, "test-project") for i in range(4)]
+
+    with pytest.raises(OSError):
+        save_many(
+            layer_data_list,
+            "json",
+            data_repository,
+            metadata_repository,
+            max_workers=2,
+        )
+
+    assert sorted(content["a"] for content in data_repository.saved_contents) == [
+        0,
+        1,
+    ]
+    assert [layer_data.id for layer_data in layer_data_list] == [None] * 4
@@ -0,0 +1,82 @@
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from dcraft.domain.error import NotCoveredCompression
+from dcraft.domain.loader import read_layer_data, read_layer_data_iter
+from dcraft.domain.loader.raw import create_raw
+from dcraft.interface.data.local import LocalDataRepository
+from dcraft.interface.metadata.local import LocalMetadataRepository
+from dcraft.interface.metadata.sqlite import SqliteMetadataRepository
+
+
+@pytest.mark.parametrize(
+    "format, compression, extension",
+    [("csv", "gzip", "csv.gz"), ("csv", "zstd", "csv.zst"), ("csv", "lz4", "csv.lz4")],
+)
+def test_save_compressed_csv(tmp_path, format, compression, extension):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    content = pd.DataFrame({"a": list(range(100)), "b": ["x"] * 100})
+    layer_data = create_raw(content, "test-project")
+
+    layer_data.save(
+        format, data_repository, metadata_repository, compression, compression_level=3
+    )
+
+    path = data_repository._compose_path(
+        "test-project", "raw", layer_data.id, extension
+    )
+    assert os.path.exists(path)
+    assert metadata_repository.load(layer_data.id).compression == compression
+    read_data = read_layer_data(layer_data.id, data_repository, metadata_repository)
+    assert read_data.content.equals(content)
+    chunks = list(
+        read_layer_data_iter(
+            layer_data.id, data_repository, metadata_repository, batch_size=40
+        )
+    )
+    assert [len(chunk) for chunk in chunks] == [40, 40, 20]
+
+
+def test_save_compressed_json(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = SqliteMetadataRepository(str(tmp_path / "metadata.db"))
+    content = [{"a": i, "b": "x"} for i in range(10)]
+    layer_data = create_raw(content, "test-project")
+
+    layer_data.save("json", data_repository, metadata_repository, "zstd")
+
+    read_data = read_layer_data(layer_data.id, data_repository, metadata_repository)
+    assert read_data.content == content
+
+
+def test_save_parquet_with_compression_codec(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    content = pd.DataFrame({"a": [1, 2, 3]})
+    layer_data = create_raw(content, "test-project")
+
+    layer_data.save("parquet", data_repository, metadata_repository, "zstd", 9)
+
+    path = data_repository._compose_path(
+        "test-project", "raw", layer_data.id, "parquet"
+    )
+    assert pq.ParquetFile(path).metadata.row_group(0).column(0).compression == "ZSTD"
+    read_data = read_layer_data(layer_data.id, data_repository, metadata_repository)
+    assert read_data.content.equals(content)
+
+
+@pytest.mark.parametrize(
+    "format, compression", [("csv", "snappy"), ("feather", "gzip"), ("json", "xz")]
+)
+def test_save_with_not_covered_compression(tmp_path, format, compression):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    content = pd.DataFrame({"a": [1, 2, 3]}) if format != "json" else {"a": 1}
+    layer_data = create_raw(content, "test-project")
+
+    with pytest.raises(NotCoveredCompression):
+        layer_data.save(format, data_repository, metadata_repository, compression)
@@ -0,0 +1,120 @@
+import json
+import math
+from io import BytesIO, StringIO
+
+import pandas as pd
+import pytest
+
+from dcraft.domain.error import NotCoveredFormat
+from dcraft.domain.loader import read_layer_data, read_layer_data_iter
+from dcraft.domain.loader.raw import create_raw
+from dcraft.interface.data import jsonl
+from dcraft.interface.data.local import LocalDataRepository
+from dcraft.interface.metadata.local import LocalMetadataRepository
+
+
+@pytest.mark.parametrize("compression", [None, "zstd"])
+def test_save_and_read_jsonl(tmp_path, compression):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    content = [{"a": i, "b": "x" if i % 2 else None} for i in range(5)]
+    layer_data = create_raw(content, "test-project")
+
+    layer_data.save("jsonl", data_repository, metadata_repository, compression)
+
+    read_data = read_layer_data(layer_data.id, data_repository, metadata_repository)
+    chunks = list(
+        read_layer_data_iter(
+            layer_data.id,
+            data_repository,
+            metadata_repository,
+            batch_size=2,
+            filters=[("a", ">", 0)],
+        )
+    )
+    assert read_data.content == content
+    assert [len(chunk) for chunk in chunks] == [1, 2, 1]
+    assert pd.concat(chunks, ignore_index=True)["a"].tolist() == [1, 2, 3, 4]
+
+
+def test_read_jsonl_with_mismatched_records(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    content = [{"a": 0}, {"a": 1}, {"a": 2, "b": "x"}, {"a": 3, "b": "y"}]
+    layer_data = create_raw(content, "test-project")
+    layer_data.save("jsonl", data_repository, metadata_repository)
+
+    chunks = list(
+        read_layer_data_iter(
+            layer_data.id,
+            data_repository,
+            metadata_repository,
+            batch_size=2,
+            columns=["a", "b"],
+        )
+    )
+    filtered_chunks = list(
+        read_layer_data_iter(
+            layer_data.id,
+            data_repository,
+            metadata_repository,
+            batch_size=2,
+            filters=[("b", "==", "y")],
+        )
+    )
+
+    assert [chunk.columns.tolist() for chunk in chunks] == [["a", "b"], ["a", "b"]]
+    assert chunks[0]["b"].isna().all()
+    assert chunks[1]["b"].tolist() == ["x", "y"]
+    assert len(filtered_chunks) == 1
+    assert filtered_chunks[0]["a"].tolist() == [3]
+
+
+def test_jsonl_is_one_record_per_line(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    layer_data = create_raw([{"a": 1}, {"a": 2}], "test-project")
+
+    layer_data.save("jsonl", data_repository, metadata_repository)
+
+    path = data_repository._compose_path("test-project", "raw", layer_data.id, "jsonl")
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line) for line in lines] == [{"a": 1}, {"a": 2}]
+
+
+def test_save_dict_as_jsonl(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    layer_data = create_raw({"a": 1}, "test-project")
+
+    with pytest.raises(NotCoveredFormat):
+        layer_data.save("jsonl", data_repository, metadata_repository)
+
+
+@pytest.mark.parametrize("with_orjson", [True, False])
+def test_iter_jsonl(monkeypatch, with_orjson):
+    if not with_orjson:
+        monkeypatch.setattr(jsonl, "orjson", None)
+    monkeypatch.setattr(jsonl, "JSONL_READ_SIZE", 4)
+    source = BytesIO(b'{"a": 1}\n\n{"a": "\\u3042"}\n{"a": [1, 2]}')
+
+    assert list(jsonl.iter_jsonl(source)) == [{"a": 1}, {"a": "\u3042"}, {"a": [1, 2]}]
+
+
+@pytest.mark.parametrize("with_orjson", [True, False])
+def test_jsonl_does_not_depend_on_orjson(monkeypatch, with_orjson):
+    if not with_orjson:
+        monkeypatch.setattr(jsonl, "orjson", None)
+    records = [{"a": 2**70, "b": "あ", 1: None}]
+    sink = StringIO()
+
+    jsonl.write_jsonl(records, sink)
+
+    assert sink.getvalue() == '{"a":1180591620717411303424,"b":"あ","1":null}\n'
+    source = BytesIO(sink.getvalue().encode("utf-8") + b'{"a": NaN}\n')
+    loaded = list(jsonl.iter_jsonl(source))
+    assert loaded[0] == {"a": 2**70, "b": "あ", "1": None}
+    assert math.isnan(loaded[1]["a"])
+    with pytest.raises(ValueError):
+        jsonl.write_jsonl([{"a": float("nan")}], StringIO())
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from dcraft.domain.loader import read_layer_data
+from dcraft.domain.loader.raw import create_raw
+from dcraft.domain.loader.trusted import create_trusted
+from dcraft.interface.data.local import LocalDataRepository
+from dcraft.interface.metadata.local import LocalMetadataRepository
+
+
+class CountingDataRepository(LocalDataRepository):
+    def __init__(self, dir_path):
+        super().__init__(dir_path)
+        self.load_count = 0
+
+    def load(self, *args, **kwargs):
+        self.load_count += 1
+        return super().load(*args, **kwargs)
+
+
+def test_read_layer_data_lazily(tmp_path):
+    data_repository = CountingDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    content = pd.DataFrame({"a": [1, 2, 3]})
+    layer_data = create_trusted(content, "test-project", source_ids=["source-id"])
+    layer_data.save("parquet", data_repository, metadata_repository)
+
+    read_data = read_layer_data(
+        layer_data.id, data_repository, metadata_repository, lazy=True
+    )
+
+    assert read_data._source_ids == ["source-id"]
+    assert not read_data.is_content_loaded
+    assert data_repository.load_count == 0
+    assert read_data.content.equals(content)
+    assert read_data.content.equals(content)
+    assert read_data.is_content_loaded
+    assert data_repository.load_count == 1
+
+
+def test_read_layer_data_with_prefetch(tmp_path):
+    data_repository = CountingDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    content = [{"a": 1}, {"a": 2}]
+    layer_data = create_raw(content, "test-project")
+    layer_data.save("json", data_repository, metadata_repository)
+
+    read_data = read_layer_data(
+        layer_data.id, data_repository, metadata_repository, lazy=True, prefetch=True
+    )
+
+    assert read_data.content == content
+    assert data_repository.load_count == 1
+
+
+def test_read_layer_data_lazily_raises_on_access(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    layer_data = create_raw({"a": 1}, "test-project")
+    layer_data.save("json", data_repository, metadata_repository)
+    (tmp_path / "test-project" / "raw" / f"{layer_data.id}.json").unlink()
+
+    read_data = read_layer_data(
+        layer_data.id, data_repository, metadata_repository, lazy=True, prefetch=True
+    )
+
+    with pytest.raises(FileNotFoundError):
+        read_data.content
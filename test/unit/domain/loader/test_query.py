@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from dcraft.domain.loader import read_layer_data, read_layer_data_iter
+from dcraft.domain.loader.trusted import create_trusted
+from dcraft.interface.data.local import LocalDataRepository
+from dcraft.interface.metadata.local import LocalMetadataRepository
+
+
+@pytest.mark.parametrize("format", ["csv", "parquet"])
+def test_read_layer_data_with_columns_and_filters(tmp_path, format):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    layer_data = create_trusted(
+        pd.DataFrame({"a": [1, 2, 3, 4], "b": ["w", "x", "y", "z"], "c": [0] * 4}),
+        "test-project",
+    )
+    layer_data.save(format, data_repository, metadata_repository)
+
+    read_data = read_layer_data(
+        layer_data.id,
+        data_repository,
+        metadata_repository,
+        columns=["b"],
+        filters=[[("a", ">=", 3)], [("b", "in", ["w"])]],
+    )
+
+    assert list(read_data.content.columns) == ["b"]
+    assert read_data.content["b"].tolist() == ["w", "y", "z"]
+
+
+@pytest.mark.parametrize("format", ["csv", "parquet"])
+def test_read_layer_data_iter(tmp_path, format):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    layer_data = create_trusted(
+        pd.DataFrame({"a": list(range(10)), "b": [str(i) for i in range(10)]}),
+        "test-project",
+    )
+    layer_data.save(format, data_repository, metadata_repository)
+
+    chunks = list(
+        read_layer_data_iter(
+            layer_data.id,
+            data_repository,
+            metadata_repository,
+            batch_size=4,
+            columns=["a"],
+            filters=[("a", "<", 9)],
+        )
+    )
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 1]
+    assert pd.concat(chunks)["a"].tolist() == list(range(9))
+
+
+def test_read_layer_data_iter_for_dict_list(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    layer_data = create_trusted([{"a": i} for i in range(5)], "test-project")
+    layer_data.save("json", data_repository, metadata_repository)
+
+    chunks = list(
+        read_layer_data_iter(
+            layer_data.id, data_repository, metadata_repository, batch_size=2
+        )
+    )
+
+    assert [chunk["a"].tolist() for chunk in chunks] == [[0, 1], [2, 3], [4]]
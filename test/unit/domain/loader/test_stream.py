@@ -0,0 +1,49 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from dcraft.domain.error import NotCoveredContentType
+from dcraft.domain.loader import read_layer_data
+from dcraft.domain.loader.raw import create_raw
+from dcraft.interface.data.local import LocalDataRepository
+from dcraft.interface.metadata.local import LocalMetadataRepository
+
+
+def test_save_dataframe_iterator_as_parquet_row_groups(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    batches = (pd.DataFrame({"a": [i, i + 1], "b": ["x", "y"]}) for i in [0, 2, 4])
+    layer_data = create_raw(batches, "test-project")
+
+    layer_data.save("parquet", data_repository, metadata_repository)
+
+    path = data_repository._compose_path(
+        "test-project", "raw", layer_data.id, "parquet"
+    )
+    assert pq.ParquetFile(path).num_row_groups == 3
+    read_data = read_layer_data(layer_data.id, data_repository, metadata_repository)
+    assert read_data.content.equals(
+        pd.DataFrame({"a": [0, 1, 2, 3, 4, 5], "b": ["x", "y"] * 3})
+    )
+
+
+@pytest.mark.parametrize("format", ["csv", "parquet"])
+def test_save_record_batch_reader(tmp_path, format):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    table = pa.table({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    reader = pa.RecordBatchReader.from_batches(
+        table.schema, table.to_batches(max_chunksize=2)
+    )
+    layer_data = create_raw(reader, "test-project")
+
+    layer_data.save(format, data_repository, metadata_repository)
+
+    read_data = read_layer_data(layer_data.id, data_repository, metadata_repository)
+    assert read_data.content.equals(table.to_pandas())
+
+
+def test_create_with_iterator_of_dicts():
+    with pytest.raises(NotCoveredContentType):
+        create_raw(iter([{"a": 1}]), "test-project")
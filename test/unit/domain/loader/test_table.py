@@ -0,0 +1,89 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from dcraft.domain.error import NotCoveredContentType, NotCoveredFormat
+from dcraft.domain.loader import read_layer_data, read_layer_data_iter
+from dcraft.domain.loader.raw import create_raw
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.data.local import LocalDataRepository
+from dcraft.interface.metadata.local import LocalMetadataRepository
+
+
+@pytest.mark.parametrize("format", ["csv", "parquet", "feather"])
+def test_save_and_read_arrow_table(tmp_path, format):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    table = pa.table({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    layer_data = create_raw(table, "test-project")
+
+    layer_data.save(format, data_repository, metadata_repository)
+
+    read_data = read_layer_data(
+        layer_data.id, data_repository, metadata_repository, ["b"], [("a", ">", 1)]
+    )
+    assert layer_data.content_type == ContentType.ARROW_TABLE
+    assert isinstance(read_data.content, pa.Table)
+    assert read_data.content.to_pydict() == {"b": ["y", "z"]}
+    chunks = list(
+        read_layer_data_iter(
+            layer_data.id, data_repository, metadata_repository, batch_size=2
+        )
+    )
+    assert pd.concat(chunks, ignore_index=True).equals(table.to_pandas())
+
+
+def test_read_dataframe_as_arrow_table(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    content = pd.DataFrame({"a": [1, 2, 3]})
+    layer_data = create_raw(content, "test-project")
+    layer_data.save("parquet", data_repository, metadata_repository)
+
+    read_data = read_layer_data(
+        layer_data.id,
+        data_repository,
+        metadata_repository,
+        content_type=ContentType.ARROW_TABLE,
+    )
+
+    assert isinstance(read_data.content, pa.Table)
+    assert read_data.content.to_pandas().equals(content)
+
+
+def test_read_dict_list_as_arrow_table(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    layer_data = create_raw([{"a": 1}], "test-project")
+    layer_data.save("json", data_repository, metadata_repository)
+
+    with pytest.raises(NotCoveredContentType):
+        read_layer_data(
+            layer_data.id,
+            data_repository,
+            metadata_repository,
+            content_type=ContentType.ARROW_TABLE,
+        )
+
+
+def test_save_arrow_table_as_json(tmp_path):
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    layer_data = create_raw(pa.table({"a": [1]}), "test-project")
+
+    with pytest.raises(NotCoveredFormat):
+        layer_data.save("json", data_repository, metadata_repository)
+
+
+def test_save_and_read_polars_dataframe(tmp_path):
+    pl = pytest.importorskip("polars")
+    data_repository = LocalDataRepository(tmp_path)
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    content = pl.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    layer_data = create_raw(content, "test-project")
+
+    layer_data.save("parquet", data_repository, metadata_repository)
+
+    read_data = read_layer_data(layer_data.id, data_repository, metadata_repository)
+    assert layer_data.content_type == ContentType.POLARS_DF
+    assert read_data.content.equals(content)
@@ -0,0 +1,44 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from dcraft.domain.type.enum import ContentType
+
+async_gcs = pytest.importorskip("dcraft.interface.data.async_gcs")
+
+
+class FakeStorage:
+    def __init__(self, **kwargs):
+        self.objects = {}
+        self.timeouts = []
+
+    async def download(self, bucket, object_name, *, timeout=10):
+        self.timeouts.append(timeout)
+        return self.objects[(bucket, object_name)]
+
+    async def upload(self, bucket, object_name, file_data, *, timeout=30):
+        self.timeouts.append(timeout)
+        self.objects[(bucket, object_name)] = file_data
+        return {}
+
+
+def test_save_and_load(monkeypatch):
+    monkeypatch.setattr(async_gcs, "Storage", FakeStorage)
+    data_repository = async_gcs.AsyncGcsDataRepository("test-bucket", timeout=600)
+    content = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+
+    async def run():
+        await data_repository.save(
+            content, "test-project", "raw", "test-id", "parquet", ContentType.DF
+        )
+        return await data_repository.load(
+            "test-project", "raw", "test-id", "parquet", ContentType.DF, columns=["a"]
+        )
+
+    loaded_content = asyncio.run(run())
+    assert loaded_content.equals(content[["a"]])
+    assert ("test-bucket", "test-project/raw/test-id.parquet") in (
+        data_repository._client.objects
+    )
+    assert data_repository._client.timeouts == [600, 600]
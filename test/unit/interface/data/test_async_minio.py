@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from dcraft.domain.type.enum import ContentType
+
+async_minio = pytest.importorskip("dcraft.interface.data.async_minio")
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+        self.is_released = False
+
+    async def read(self):
+        return self._data
+
+    def release(self):
+        self.is_released = True
+
+
+class FakeMinio:
+    def __init__(self, **kwargs):
+        self.objects = {}
+        self.responses = []
+
+    async def get_object(self, bucket, object_name):
+        response = FakeResponse(self.objects[(bucket, object_name)])
+        self.responses.append(response)
+        return response
+
+    async def put_object(self, bucket, object_name, data, length):
+        self.objects[(bucket, object_name)] = data.read(length)
+
+
+def test_save_and_load(monkeypatch):
+    monkeypatch.setattr(async_minio, "Minio", FakeMinio)
+    data_repository = async_minio.AsyncMinioRepository("localhost:9000", "test-bucket")
+    content = [{"a": 1}, {"a": 2}]
+
+    async def run():
+        await data_repository.save(
+            content,
+            "test-project",
+            "raw",
+            "test-id",
+            "jsonl",
+            ContentType.DICT_LIST,
+            compression="gzip",
+        )
+        return await data_repository.load(
+            "test-project",
+            "raw",
+            "test-id",
+            "jsonl",
+            ContentType.DICT_LIST,
+            compression="gzip",
+        )
+
+    assert asyncio.run(run()) == content
+    assert list(data_repository._client.objects) == [
+        ("test-bucket", "test-project/raw/test-id.jsonl.gz")
+    ]
+    assert data_repository._client.responses[0].is_released
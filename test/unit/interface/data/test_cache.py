@@ -0,0 +1,162 @@
+import os
+
+import pandas as pd
+
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.data.cache import CachedDataRepository
+from dcraft.interface.data.local import LocalDataRepository
+
+
+class CountingDataRepository(LocalDataRepository):
+    def __init__(self, dir_path):
+        super().__init__(dir_path)
+        self.load_count = 0
+
+    def load(self, *args, **kwargs):
+        self.load_count += 1
+        return super().load(*args, **kwargs)
+
+
+def test_load_from_memory_cache(tmp_path):
+    repository = CountingDataRepository(tmp_path)
+    content = pd.DataFrame({"a": [1], "b": [2]})
+    repository.save(
+        content, "test-project", "raw", "test-id", "parquet", ContentType.DF
+    )
+
+    data_repository = CachedDataRepository(repository)
+    for _ in range(3):
+        loaded_content = data_repository.load(
+            "test-project", "raw", "test-id", "parquet", ContentType.DF
+        )
+        assert loaded_content.equals(content)
+        loaded_content["a"] = 0
+
+    assert repository.load_count == 1
+
+
+def test_evict_least_recently_used(tmp_path):
+    repository = CountingDataRepository(tmp_path)
+    for id in ["test-id-1", "test-id-2"]:
+        repository.save(
+            {"a": "x" * 100}, "test-project", "raw", id, "json", ContentType.DICT
+        )
+
+    # Each content takes about 400 bytes in memory, so only one of them fits.
+    data_repository = CachedDataRepository(repository, max_bytes=600)
+    data_repository.load("test-project", "raw", "test-id-1", "json", ContentType.DICT)
+    data_repository.load("test-project", "raw", "test-id-2", "json", ContentType.DICT)
+    data_repository.load("test-project", "raw", "test-id-2", "json", ContentType.DICT)
+    assert repository.load_count == 2
+
+    data_repository.load("test-project", "raw", "test-id-1", "json", ContentType.DICT)
+    assert repository.load_count == 3
+
+
+def test_load_from_disk_cache(tmp_path):
+    repository = CountingDataRepository(os.path.join(tmp_path, "data"))
+    content = {"a": 1, "b": 2}
+    repository.save(content, "test-project", "raw", "test-id", "json", ContentType.DICT)
+    disk_cache_dir = os.path.join(tmp_path, "cache")
+
+    CachedDataRepository(repository, disk_cache_dir=disk_cache_dir).load(
+        "test-project", "raw", "test-id", "json", ContentType.DICT
+    )
+    loaded_content = CachedDataRepository(
+        repository, disk_cache_dir=disk_cache_dir
+    ).load("test-project", "raw", "test-id", "json", ContentType.DICT)
+
+    assert loaded_content == content
+    assert repository.load_count == 1
+    assert os.listdir(os.path.join(disk_cache_dir, "test-project", "raw")) == [
+        "test-id.json"
+    ]
+
+
+def test_save_does_not_copy_content_too_large_to_cache(tmp_path, monkeypatch):
+    copied_contents = []
+    monkeypatch.setattr(
+        CachedDataRepository, "_copy", staticmethod(copied_contents.append)
+    )
+    data_repository = CachedDataRepository(
+        LocalDataRepository(tmp_path), max_bytes=1024
+    )
+
+    data_repository.save(
+        [{"a": i} for i in range(1000)],
+        "test-project",
+        "raw",
+        "test-id-1",
+        "json",
+        ContentType.DICT_LIST,
+    )
+    assert copied_contents == []
+
+    data_repository.save(
+        {"a": 1}, "test-project", "raw", "test-id-2", "json", ContentType.DICT
+    )
+    assert copied_contents == [{"a": 1}]
+
+
+def test_load_dict_from_memory_cache_with_columns(tmp_path):
+    repository = CountingDataRepository(tmp_path)
+    content = {"a": 1, "b": 2}
+    repository.save(content, "test-project", "raw", "test-id", "json", ContentType.DICT)
+
+    data_repository = CachedDataRepository(repository)
+    for _ in range(2):
+        loaded_content = data_repository.load(
+            "test-project", "raw", "test-id", "json", ContentType.DICT, columns=["a"]
+        )
+        assert loaded_content == content
+
+    assert repository.load_count == 1
+
+
+def test_disk_cache_is_bounded(tmp_path):
+    repository = CountingDataRepository(os.path.join(tmp_path, "data"))
+    disk_cache_dir = os.path.join(tmp_path, "cache")
+    for id in ["test-id-1", "test-id-2", "test-id-3"]:
+        repository.save(
+            {"a": "x" * 100}, "test-project", "raw", id, "json", ContentType.DICT
+        )
+
+    # Each file takes about 110 bytes, so only two of them fit.
+    data_repository = CachedDataRepository(
+        repository, max_bytes=0, disk_cache_dir=disk_cache_dir, disk_max_bytes=250
+    )
+    for id in ["test-id-1", "test-id-2", "test-id-1", "test-id-3"]:
+        data_repository.load("test-project", "raw", id, "json", ContentType.DICT)
+
+    assert sorted(os.listdir(os.path.join(disk_cache_dir, "test-project", "raw"))) == [
+        "test-id-1.json",
+        "test-id-3.json",
+    ]
+    assert repository.load_count == 3
+
+    # The order of use is kept by the modification times of the files.
+    data_repository = CachedDataRepository(
+        repository, max_bytes=0, disk_cache_dir=disk_cache_dir, disk_max_bytes=250
+    )
+    data_repository.load("test-project", "raw", "test-id-2", "json", ContentType.DICT)
+    assert sorted(os.listdir(os.path.join(disk_cache_dir, "test-project", "raw"))) == [
+        "test-id-2.json",
+        "test-id-3.json",
+    ]
+
+
+def test_save_writes_disk_cache_only_with_write_through(tmp_path):
+    repository = CountingDataRepository(os.path.join(tmp_path, "data"))
+    disk_cache_dir = os.path.join(tmp_path, "cache")
+    content = {"a": 1}
+
+    CachedDataRepository(repository, disk_cache_dir=disk_cache_dir).save(
+        content, "test-project", "raw", "test-id-1", "json", ContentType.DICT
+    )
+    CachedDataRepository(
+        repository, disk_cache_dir=disk_cache_dir, disk_write_through=True
+    ).save(content, "test-project", "raw", "test-id-2", "json", ContentType.DICT)
+
+    assert os.listdir(os.path.join(disk_cache_dir, "test-project", "raw")) == [
+        "test-id-2.json"
+    ]
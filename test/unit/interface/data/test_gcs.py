@@ -0,0 +1,141 @@
+import pandas as pd
+import pytest
+from google.api_core.exceptions import NotFound
+
+from dcraft.domain.type.enum import ContentType
+
+gcs = pytest.importorskip("dcraft.interface.data.gcs")
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self._bucket = bucket
+        self.name = name
+
+    @property
+    def size(self):
+        return len(self._bucket.objects[self.name])
+
+    def upload_from_file(self, f, size=None):
+        self._bucket.requests.append(("upload", self.name))
+        self._bucket.objects[self.name] = f.read(size)
+
+    def upload_from_string(self, data):
+        self._bucket.requests.append(("upload", self.name))
+        self._bucket.objects[self.name] = bytes(data)
+
+    def compose(self, sources):
+        self._bucket.requests.append(("compose", self.name))
+        self._bucket.objects[self.name] = b"".join(
+            self._bucket.objects[source.name] for source in sources
+        )
+
+    def delete(self):
+        if self.name not in self._bucket.objects:
+            raise NotFound(self.name)
+        del self._bucket.objects[self.name]
+
+    def reload(self):
+        self._bucket.requests.append(("reload", self.name))
+
+    def download_as_bytes(self, start=None, end=None):
+        if self.name not in self._bucket.objects:
+            raise NotFound(self.name)
+        self._bucket.ranges.append((start, end))
+        return self._bucket.objects[self.name][start : end + 1]
+
+
+class FakeBucket:
+    def __init__(self):
+        self.objects = {}
+        self.requests = []
+        self.ranges = []
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+    def get_blob(self, name):
+        return FakeBlob(self, name) if name in self.objects else None
+
+
+class FakeClient:
+    def __init__(self, **kwargs):
+        self.bucket = FakeBucket()
+
+    def get_bucket(self, bucket_name):
+        return self.bucket
+
+
+@pytest.fixture
+def content():
+    return pd.DataFrame({"a": range(100), "b": [f"value-{i}" for i in range(100)]})
+
+
+def create_data_repository(monkeypatch, chunk_size):
+    monkeypatch.setattr(gcs, "Client", FakeClient)
+    return gcs.GcsDataRepository(
+        "test-project-id", "test-bucket", chunk_size=chunk_size, max_workers=4
+    )
+
+
+def test_small_content_is_uploaded_in_single_request(monkeypatch, content):
+    data_repository = create_data_repository(monkeypatch, gcs.TRANSFER_CHUNK_SIZE)
+
+    def temporary_file(*args, **kwargs):
+        raise AssertionError("The content should be kept in memory.")
+
+    monkeypatch.setattr(gcs.tempfile, "TemporaryFile", temporary_file)
+    data_repository.save(
+        content, "test-project", "raw", "test-id", "csv", ContentType.DF
+    )
+
+    bucket = data_repository._bucket
+    assert bucket.requests == [("upload", "test-project/raw/test-id.csv")]
+    loaded = data_repository.load(
+        "test-project", "raw", "test-id", "csv", ContentType.DF
+    )
+    pd.testing.assert_frame_equal(loaded, content)
+    # One ranged request, without asking the size first.
+    assert bucket.requests == [("upload", "test-project/raw/test-id.csv")]
+    assert bucket.ranges == [(0, gcs.TRANSFER_CHUNK_SIZE - 1)]
+
+
+def test_large_content_is_uploaded_as_composite_and_downloaded_in_slices(
+    monkeypatch, content
+):
+    data_repository = create_data_repository(monkeypatch, 256)
+    data_repository.save(
+        content, "test-project", "raw", "test-id", "csv", ContentType.DF
+    )
+
+    bucket = data_repository._bucket
+    path = "test-project/raw/test-id.csv"
+    parts = [name for action, name in bucket.requests if action == "upload"]
+    assert len(parts) > 1
+    assert all(name.startswith(gcs.COMPOSITE_PART_PREFIX + path) for name in parts)
+    assert bucket.requests[-1] == ("compose", path)
+    assert list(bucket.objects) == [path]
+
+    loaded = data_repository.load(
+        "test-project", "raw", "test-id", "csv", ContentType.DF
+    )
+    pd.testing.assert_frame_equal(loaded, content)
+    assert bucket.requests[-1] == ("reload", path)
+    size = bucket.get_blob(path).size
+    assert sorted(bucket.ranges) == [
+        (start, min(start + 256, size) - 1) for start in range(0, size, 256)
+    ]
+
+
+def test_parts_are_deleted_when_composite_upload_fails(monkeypatch, content):
+    data_repository = create_data_repository(monkeypatch, 256)
+
+    def compose(self, sources):
+        raise RuntimeError("failed")
+
+    monkeypatch.setattr(FakeBlob, "compose", compose)
+    with pytest.raises(RuntimeError, match="failed"):
+        data_repository.save(
+            content, "test-project", "raw", "test-id", "csv", ContentType.DF
+        )
+    assert data_repository._bucket.objects == {}
@@ -0,0 +1,136 @@
+import pandas as pd
+import pyarrow as pa
+
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.data import local
+from dcraft.interface.data.local import LocalDataRepository
+
+
+def test_load_parquet_with_memory_map(tmp_path):
+    content = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    LocalDataRepository(tmp_path).save(
+        content, "test-project", "refined", "test-id", "parquet", ContentType.DF
+    )
+    data_repository = LocalDataRepository(tmp_path, memory_map=True)
+
+    loaded_content = data_repository.load(
+        "test-project", "refined", "test-id", "parquet", ContentType.DF, columns=["a"]
+    )
+    loaded_table = data_repository.load_table(
+        "test-project", "refined", "test-id", "parquet"
+    )
+
+    assert isinstance(loaded_content["a"].dtype, pd.ArrowDtype)
+    assert loaded_content["a"].tolist() == [1, 2, 3]
+    assert isinstance(loaded_table, pa.Table)
+    assert loaded_table.to_pandas().equals(content)
+
+
+def test_save_and_load_feather(tmp_path):
+    content = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    data_repository = LocalDataRepository(tmp_path, memory_map=True)
+    data_repository.save(
+        content, "test-project", "trusted", "test-id", "feather", ContentType.DF
+    )
+
+    loaded_table = data_repository.load_table(
+        "test-project", "trusted", "test-id", "feather", filters=[("a", ">", 1)]
+    )
+    chunks = list(
+        data_repository.load_iter(
+            "test-project", "trusted", "test-id", "feather", ContentType.DF, 2
+        )
+    )
+
+    assert loaded_table.column("b").to_pylist() == ["y", "z"]
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert pd.concat(chunks, ignore_index=True).equals(content)
+
+
+def test_load_compressed_csv_closes_file(tmp_path, monkeypatch):
+    content = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    data_repository = LocalDataRepository(tmp_path)
+    data_repository.save(
+        content, "test-project", "raw", "test-id", "csv", ContentType.DF, "gzip"
+    )
+    sources = []
+    original_open_decompressed_reader = local.open_decompressed_reader
+
+    def open_decompressed_reader(source, compression):
+        sources.append(source)
+        return original_open_decompressed_reader(source, compression)
+
+    monkeypatch.setattr(local, "open_decompressed_reader", open_decompressed_reader)
+
+    loaded_content = data_repository.load(
+        "test-project", "raw", "test-id", "csv", ContentType.DF, compression="gzip"
+    )
+    chunks = list(
+        data_repository.load_iter(
+            "test-project",
+            "raw",
+            "test-id",
+            "csv",
+            ContentType.DF,
+            2,
+            compression="gzip",
+        )
+    )
+
+    assert loaded_content.equals(content)
+    assert pd.concat(chunks, ignore_index=True).equals(content)
+    assert len(sources) == 2
+    assert all(source.closed for source in sources)
+
+
+def test_abandoned_feather_iteration_closes_memory_map(tmp_path, monkeypatch):
+    content = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    data_repository = LocalDataRepository(tmp_path)
+    data_repository.save(
+        content, "test-project", "trusted", "test-id", "feather", ContentType.DF
+    )
+    memory_maps = []
+    original_memory_map = pa.memory_map
+
+    def memory_map(path):
+        memory_maps.append(original_memory_map(path))
+        return memory_maps[-1]
+
+    monkeypatch.setattr(pa, "memory_map", memory_map)
+
+    chunks = data_repository.load_iter(
+        "test-project", "trusted", "test-id", "feather", ContentType.DF, 1
+    )
+    next(chunks)
+    chunks.close()
+
+    assert len(memory_maps) == 1
+    assert memory_maps[0].closed
+
+
+def test_load_passes_compression_to_load_table(tmp_path, monkeypatch):
+    content = pd.DataFrame({"a": [1, 2, 3]})
+    data_repository = LocalDataRepository(tmp_path, memory_map=True)
+    data_repository.save(
+        content, "test-project", "trusted", "test-id", "parquet", ContentType.DF, "zstd"
+    )
+    compressions = []
+    original_load_table = data_repository.load_table
+
+    def load_table(*args):
+        compressions.append(args[-1])
+        return original_load_table(*args)
+
+    monkeypatch.setattr(data_repository, "load_table", load_table)
+
+    loaded_content = data_repository.load(
+        "test-project",
+        "trusted",
+        "test-id",
+        "parquet",
+        ContentType.DF,
+        compression="zstd",
+    )
+
+    assert loaded_content["a"].tolist() == [1, 2, 3]
+    assert compressions == ["zstd"]
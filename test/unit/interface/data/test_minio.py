@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+import pytest
+from minio.error import S3Error
+
+from dcraft.domain.type.enum import ContentType
+
+minio = pytest.importorskip("dcraft.interface.data.minio")
+
+PART_SIZE = minio.MIN_PART_SIZE
+
+
+class FakeResponse:
+    def __init__(self, data, start, size):
+        self._data = data
+        self.headers = {
+            "Content-Range": f"bytes {start}-{start + len(data) - 1}/{size}"
+        }
+        self.is_released = False
+
+    def read(self):
+        return self._data
+
+    def stream(self, amt):
+        for i in range(0, len(self._data), amt):
+            yield self._data[i : i + amt]
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        self.is_released = True
+
+
+class FakeMinio:
+    def __init__(self, *args, **kwargs):
+        self.objects = {}
+        self.puts = []
+        self.ranges = []
+
+    def put_object(
+        self, bucket, object_name, data, length, content_type=None, **kwargs
+    ):
+        self.puts.append((length, kwargs.get("part_size")))
+        if length == -1:
+            chunks = []
+            while True:
+                chunk = data.read(kwargs["part_size"])
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            content = b"".join(chunks)
+        else:
+            content = data.read(length)
+        self.objects[(bucket, object_name)] = content
+
+    def get_object(self, bucket, object_name, offset=0, length=0, request_headers=None):
+        data = self.objects[(bucket, object_name)]
+        if request_headers is not None:
+            # A suffix range, e.g. "bytes=-1024".
+            length = int(request_headers["Range"].split("=-")[1])
+            offset = max(len(data) - length, 0)
+        self.ranges.append((offset, length))
+        if offset >= len(data):
+            raise S3Error(None, "InvalidRange", None, None, None, None)
+        return FakeResponse(data[offset : offset + length], offset, len(data))
+
+
+@pytest.fixture
+def data_repository(monkeypatch):
+    monkeypatch.setattr(minio, "Minio", FakeMinio)
+    return minio.MinioRepository("localhost:9000", "test-bucket", part_size=PART_SIZE)
+
+
+def test_small_content_is_put_with_single_request(data_repository):
+    content = [{"a": 1}, {"a": 2}]
+    data_repository.save(
+        content, "test-project", "raw", "test-id", "jsonl", ContentType.DICT_LIST
+    )
+
+    assert data_repository._client.puts == [(len(b'{"a":1}\n{"a":2}\n'), None)]
+    data_repository._client.ranges = []
+    assert (
+        data_repository.load(
+            "test-project", "raw", "test-id", "jsonl", ContentType.DICT_LIST
+        )
+        == content
+    )
+    # A single request, without a stat_object first.
+    assert data_repository._client.ranges == [(0, PART_SIZE)]
+
+
+def test_large_content_is_put_as_multipart_and_downloaded_in_ranges(
+    data_repository,
+):
+    content = pd.DataFrame({"a": np.arange(1_000_000), "b": np.arange(1_000_000) * 2})
+    data_repository.save(
+        content, "test-project", "raw", "test-id", "csv", ContentType.DF
+    )
+
+    assert data_repository._client.puts == [(-1, PART_SIZE)]
+    size = len(
+        data_repository._client.objects[("test-bucket", "test-project/raw/test-id.csv")]
+    )
+    assert size > PART_SIZE
+    loaded = data_repository.load(
+        "test-project", "raw", "test-id", "csv", ContentType.DF
+    )
+    pd.testing.assert_frame_equal(loaded, content)
+    assert sorted(data_repository._client.ranges) == [
+        (offset, min(PART_SIZE, size - offset)) for offset in range(0, size, PART_SIZE)
+    ]
+
+
+def test_failed_multipart_write_is_not_committed(data_repository):
+    def write(f):
+        f.write(b"x" * (PART_SIZE + 1))
+        raise RuntimeError("failed")
+
+    with pytest.raises(RuntimeError, match="failed"):
+        data_repository._put_stream("test-path", write, "text/plain")
+    assert data_repository._client.objects == {}
+
+
+def test_parquet_columns_are_read_from_tail(data_repository):
+    content = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    data_repository.save(
+        content, "test-project", "raw", "test-id", "parquet", ContentType.DF
+    )
+
+    loaded = data_repository.load(
+        "test-project", "raw", "test-id", "parquet", ContentType.DF, columns=["b"]
+    )
+    pd.testing.assert_frame_equal(loaded, content[["b"]])
+    # The tail read for the footer covers the whole small object, and gives its size.
+    assert data_repository._client.ranges == [(0, minio.PARQUET_RANGE_READ_SIZE)]
+
+
+def test_part_size_below_minimum(monkeypatch):
+    monkeypatch.setattr(minio, "Minio", FakeMinio)
+    with pytest.raises(ValueError):
+        minio.MinioRepository("localhost:9000", "test-bucket", part_size=PART_SIZE - 1)
+
+
+def test_failed_multipart_upload_stops_writer(data_repository, monkeypatch):
+    def put_object(*args, **kwargs):
+        raise ConnectionError("failed")
+
+    monkeypatch.setattr(data_repository._client, "put_object", put_object)
+
+    def write(f):
+        for _ in range(4):
+            f.write(b"x" * PART_SIZE)
+
+    with pytest.raises(ConnectionError, match="failed"):
+        data_repository._put_stream("test-path", write, "text/plain")
+
+
+def test_load_empty_object(data_repository):
+    data_repository.save(
+        [], "test-project", "raw", "test-id", "jsonl", ContentType.DICT_LIST
+    )
+
+    assert (
+        data_repository.load(
+            "test-project", "raw", "test-id", "jsonl", ContentType.DICT_LIST
+        )
+        == []
+    )
@@ -0,0 +1,27 @@
+import pytest
+
+from dcraft.domain.error import NoMetadataFound
+from dcraft.interface.metadata.base import MetadataRepository
+
+
+class MinimalMetadataRepository(MetadataRepository):
+    def __init__(self):
+        self.metadata_dict = {}
+
+    def load(self, id):
+        if id not in self.metadata_dict:
+            raise NoMetadataFound(f"No metadata found for {id}")
+        return self.metadata_dict[id]
+
+    def save(self, metadata):
+        self.metadata_dict[metadata.id] = metadata
+
+
+def test_repository_without_listing():
+    metadata_repository = MinimalMetadataRepository()
+
+    assert metadata_repository.load_many(["test-id"]) == {}
+    assert metadata_repository.get_ancestors("test-id") == {}
+    pager = metadata_repository.list()
+    with pytest.raises(NotImplementedError):
+        next(pager)
@@ -0,0 +1,153 @@
+import gc
+import time
+import weakref
+from datetime import datetime
+
+import pytest
+
+from dcraft.domain.error import MetadataSaveFailed
+from dcraft.domain.metadata import Metadata
+from dcraft.domain.type.enum import ContentType
+
+bq = pytest.importorskip("dcraft.interface.metadata.bq")
+
+
+class FakeClient:
+    def __init__(self, **kwargs):
+        self.inserted_rows = []
+        self.responses = []
+
+    def create_dataset(self, dataset_id, exists_ok=False):
+        pass
+
+    def create_table(self, table, exists_ok=False):
+        return table
+
+    def insert_rows_json(self, table, json_rows, row_ids=None):
+        response = self.responses.pop(0) if self.responses else []
+        if isinstance(response, Exception):
+            raise response
+        failed_indexes = {error["index"] for error in response}
+        self.inserted_rows.extend(
+            row["id"] for i, row in enumerate(json_rows) if i not in failed_indexes
+        )
+        return response
+
+
+def compose_metadata(id):
+    return Metadata(
+        id=id,
+        project_name="test-project",
+        layer="raw",
+        content_type=ContentType.DICT,
+        author=None,
+        created_at=datetime(2023, 1, 1),
+        description=None,
+        extra_info=None,
+        source_ids=None,
+        format="json",
+    )
+
+
+@pytest.fixture
+def metadata_repository(monkeypatch):
+    monkeypatch.setattr(bq, "Client", FakeClient)
+    metadata_repository = bq.BqMetadataRepository(
+        "test-gcp-project",
+        "test_dataset",
+        "test_table",
+        write_mode="stream",
+        flush_interval=0.05,
+    )
+    yield metadata_repository
+    metadata_repository._client.responses = []
+    metadata_repository.close()
+
+
+def test_flush_keeps_rejected_and_stopped_rows(metadata_repository):
+    metadata_repository._client.responses = [
+        [
+            {"index": 0, "errors": [{"reason": "invalid"}]},
+            {"index": 1, "errors": [{"reason": "stopped"}]},
+        ]
+    ]
+    metadata_repository.save_many(
+        [compose_metadata("test-id-0"), compose_metadata("test-id-1")]
+    )
+
+    with pytest.raises(MetadataSaveFailed):
+        metadata_repository.flush()
+    assert metadata_repository.rejected_metadata == [compose_metadata("test-id-0")]
+
+    metadata_repository.flush()
+    assert metadata_repository._client.inserted_rows == ["test-id-1"]
+
+
+def test_background_flush_error_is_raised_and_retried(metadata_repository):
+    metadata_repository._client.responses = [ConnectionError("test")]
+    metadata_repository.save(compose_metadata("test-id-0"))
+
+    # The failed background flush schedules another one, which sends the row.
+    for _ in range(100):
+        if metadata_repository._client.inserted_rows:
+            break
+        time.sleep(0.01)
+    assert metadata_repository._client.inserted_rows == ["test-id-0"]
+
+    # The save doesn't fail, as the row stayed buffered and was sent. The error is raised by the flush.
+    metadata_repository.save(compose_metadata("test-id-1"))
+    with pytest.raises(MetadataSaveFailed):
+        metadata_repository.flush()
+    metadata_repository.flush()
+    assert metadata_repository._client.inserted_rows == ["test-id-0", "test-id-1"]
+
+
+def test_save_does_not_raise_when_full_buffer_flush_fails(monkeypatch):
+    monkeypatch.setattr(bq, "Client", FakeClient)
+    metadata_repository = bq.BqMetadataRepository(
+        "test-gcp-project",
+        "test_dataset",
+        "test_table",
+        write_mode="stream",
+        batch_size=1,
+        flush_interval=60,
+    )
+    metadata_repository._client.responses = [ConnectionError("test")]
+
+    metadata_repository.save(compose_metadata("test-id-0"))
+
+    assert metadata_repository._buffer == [compose_metadata("test-id-0")]
+    with pytest.raises(MetadataSaveFailed):
+        metadata_repository.close()
+    assert metadata_repository._client.inserted_rows == ["test-id-0"]
+
+
+def test_exit_handler_does_not_keep_repository_alive(monkeypatch):
+    monkeypatch.setattr(bq, "Client", FakeClient)
+    metadata_repository = bq.BqMetadataRepository(
+        "test-gcp-project", "test_dataset", "test_table", write_mode="stream"
+    )
+    repository_ref = weakref.ref(metadata_repository)
+
+    del metadata_repository
+    gc.collect()
+    assert repository_ref() is None
+
+
+def test_pending_flush_does_not_keep_repository_alive(monkeypatch):
+    monkeypatch.setattr(bq, "Client", FakeClient)
+    metadata_repository = bq.BqMetadataRepository(
+        "test-gcp-project",
+        "test_dataset",
+        "test_table",
+        write_mode="stream",
+        flush_interval=60,
+    )
+    client = metadata_repository._client
+    metadata_repository.save(compose_metadata("test-id-0"))
+    repository_ref = weakref.ref(metadata_repository)
+
+    del metadata_repository
+    gc.collect()
+    assert repository_ref() is None
+    assert client.inserted_rows == ["test-id-0"]
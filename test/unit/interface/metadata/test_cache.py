@@ -0,0 +1,99 @@
+import time
+from datetime import datetime
+
+from dcraft.domain.metadata import Metadata
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.metadata.cache import CachedMetadataRepository
+from dcraft.interface.metadata.local import LocalMetadataRepository
+
+
+class CountingMetadataRepository(LocalMetadataRepository):
+    def __init__(self, path):
+        super().__init__(path)
+        self.load_count = 0
+
+    def load(self, id):
+        self.load_count += 1
+        return super().load(id)
+
+    def load_many(self, ids):
+        self.load_count += 1
+        return super().load_many(ids)
+
+
+def compose_metadata(id):
+    return Metadata(
+        id=id,
+        project_name="test-project",
+        layer="raw",
+        content_type=ContentType.DICT,
+        author=None,
+        created_at=datetime(2023, 1, 1),
+        description=None,
+        extra_info=None,
+        source_ids=None,
+        format="json",
+    )
+
+
+def test_load_saved_metadata_from_cache(tmp_path):
+    repository = CountingMetadataRepository(tmp_path)
+    metadata_repository = CachedMetadataRepository(repository)
+    metadata_repository.save(compose_metadata("test-id-1"))
+
+    assert metadata_repository.load("test-id-1") == compose_metadata("test-id-1")
+    assert repository.load_count == 0
+
+
+def test_load_many_only_missing_ids(tmp_path):
+    repository = CountingMetadataRepository(tmp_path)
+    repository.save_many([compose_metadata(f"test-id-{i}") for i in range(3)])
+    metadata_repository = CachedMetadataRepository(repository)
+    metadata_repository.load("test-id-0")
+
+    metadata_dict = metadata_repository.load_many(
+        ["test-id-0", "test-id-1", "test-id-9"]
+    )
+    assert set(metadata_dict) == {"test-id-0", "test-id-1"}
+    assert repository.load_count == 2
+
+    metadata_repository.load_many(["test-id-0", "test-id-1"])
+    assert repository.load_count == 2
+
+
+def test_expire_and_evict(tmp_path):
+    repository = CountingMetadataRepository(tmp_path)
+    repository.save_many([compose_metadata(f"test-id-{i}") for i in range(2)])
+
+    metadata_repository = CachedMetadataRepository(repository, max_size=1)
+    metadata_repository.load("test-id-0")
+    metadata_repository.load("test-id-1")
+    metadata_repository.load("test-id-0")
+    assert repository.load_count == 3
+
+    metadata_repository = CachedMetadataRepository(repository, ttl=0.01)
+    metadata_repository.load("test-id-0")
+    time.sleep(0.02)
+    metadata_repository.load("test-id-0")
+    assert repository.load_count == 5
+
+
+def test_list_through_wrapped_repository(tmp_path):
+    repository = CountingMetadataRepository(tmp_path)
+    for i in range(5):
+        metadata = compose_metadata(f"test-id-{i}")
+        metadata.created_at = datetime(2023, 1, 1 + i)
+        repository.save(metadata)
+    metadata_repository = CachedMetadataRepository(repository)
+
+    pager = metadata_repository.list(limit=3, page_size=2)
+    first_ids = [metadata.id for metadata in pager]
+    rest_ids = [
+        metadata.id for metadata in metadata_repository.list(cursor=pager.next_cursor)
+    ]
+
+    assert first_ids == ["test-id-4", "test-id-3", "test-id-2"]
+    assert rest_ids == ["test-id-1", "test-id-0"]
+    load_count = repository.load_count
+    metadata_repository.load("test-id-3")
+    assert repository.load_count == load_count
@@ -0,0 +1,172 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from dcraft.domain.error import NoMetadataFound
+from dcraft.domain.metadata import Metadata
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.metadata.base import MetadataRepository
+from dcraft.interface.metadata.local import LocalMetadataRepository
+
+
+def compose_metadata(id, source_ids=None):
+    return Metadata(
+        id=id,
+        project_name="test-project",
+        layer="raw",
+        content_type=ContentType.DICT,
+        author="test-author",
+        created_at=datetime(2023, 1, 1),
+        description="test-description",
+        extra_info={"a": 1},
+        source_ids=source_ids,
+        format="json",
+    )
+
+
+def test_save_and_load(tmp_path):
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    for i in range(3):
+        metadata_repository.save(compose_metadata(f"test-id-{i}"))
+
+    assert metadata_repository.load("test-id-1") == compose_metadata("test-id-1")
+    assert os.path.exists(os.path.join(tmp_path, "metadata.index"))
+
+
+def test_load_not_found(tmp_path):
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    metadata_repository.save(compose_metadata("test-id-1"))
+
+    with pytest.raises(NoMetadataFound):
+        metadata_repository.load("test-id-2")
+
+
+def test_load_saved_by_other_instance(tmp_path):
+    LocalMetadataRepository(tmp_path).save(compose_metadata("test-id-1"))
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    assert metadata_repository.load("test-id-1") == compose_metadata("test-id-1")
+
+    LocalMetadataRepository(tmp_path).save(compose_metadata("test-id-2"))
+    assert metadata_repository.load("test-id-2") == compose_metadata("test-id-2")
+
+
+def test_load_with_missing_index(tmp_path):
+    LocalMetadataRepository(tmp_path).save(compose_metadata("test-id-1"))
+    os.remove(os.path.join(tmp_path, "metadata.index"))
+
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    assert metadata_repository.load("test-id-1") == compose_metadata("test-id-1")
+    assert not os.path.exists(os.path.join(tmp_path, "metadata.index"))
+
+    metadata_repository.save(compose_metadata("test-id-2"))
+    with open(os.path.join(tmp_path, "metadata.index")) as f:
+        assert [line.split("\t")[0] for line in f] == ["test-id-1", "test-id-2"]
+
+
+def test_load_with_stale_index(tmp_path):
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    metadata_repository.save(compose_metadata("test-id-1"))
+    metadata_repository.save(compose_metadata("test-id-2"))
+    os.remove(os.path.join(tmp_path, "metadata.jsonl"))
+    metadata_repository.save(compose_metadata("test-id-3"))
+
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    assert metadata_repository.load("test-id-3") == compose_metadata("test-id-3")
+    with pytest.raises(NoMetadataFound):
+        metadata_repository.load("test-id-1")
+
+
+def test_load_many(tmp_path):
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    for i in range(3):
+        metadata_repository.save(compose_metadata(f"test-id-{i}"))
+
+    metadata_dict = metadata_repository.load_many(
+        ["test-id-2", "test-id-0", "test-id-9"]
+    )
+    assert metadata_dict == {
+        "test-id-0": compose_metadata("test-id-0"),
+        "test-id-2": compose_metadata("test-id-2"),
+    }
+
+
+def test_get_ancestors_and_descendants(tmp_path):
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    # test-id-0 <- test-id-1, test-id-2 <- test-id-3 <- test-id-4
+    metadata_repository.save(compose_metadata("test-id-0"))
+    metadata_repository.save(compose_metadata("test-id-1", ["test-id-0"]))
+    metadata_repository.save(compose_metadata("test-id-2", ["test-id-0"]))
+    metadata_repository.save(compose_metadata("test-id-3", ["test-id-1", "test-id-2"]))
+
+    assert set(metadata_repository.get_ancestors("test-id-3")) == {
+        "test-id-0",
+        "test-id-1",
+        "test-id-2",
+    }
+    assert set(metadata_repository.get_descendants("test-id-0", depth=1)) == {
+        "test-id-1",
+        "test-id-2",
+    }
+
+    # Saved by another instance after the lineage was read.
+    LocalMetadataRepository(tmp_path).save(compose_metadata("test-id-4", ["test-id-3"]))
+    descendants = metadata_repository.get_descendants("test-id-1")
+    assert descendants == {
+        "test-id-3": compose_metadata("test-id-3", ["test-id-1", "test-id-2"]),
+        "test-id-4": compose_metadata("test-id-4", ["test-id-3"]),
+    }
+
+
+def test_default_get_descendants_goes_through_listing(tmp_path):
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    metadata_repository.save(compose_metadata("test-id-0"))
+    metadata_repository.save(compose_metadata("test-id-1", ["test-id-0"]))
+    metadata_repository.save(compose_metadata("test-id-2", ["test-id-1"]))
+    metadata_repository.save(compose_metadata("test-id-3"))
+
+    # The implementation of the base class, which the local repository overrides.
+    descendants = MetadataRepository.get_descendants(metadata_repository, "test-id-0")
+
+    assert descendants == metadata_repository.get_descendants("test-id-0")
+    assert set(descendants) == {"test-id-1", "test-id-2"}
+
+
+def test_list(tmp_path):
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    # Saved out of the created_at order.
+    for i in [2, 0, 4, 1, 3]:
+        metadata = compose_metadata(f"test-id-{i}")
+        metadata.created_at = datetime(2023, 1, 1 + i)
+        metadata.layer = "raw" if i % 2 == 0 else "trusted"
+        metadata_repository.save(metadata)
+
+    pager = metadata_repository.list(layer="raw", limit=2, page_size=1)
+    assert [metadata.id for metadata in pager] == ["test-id-4", "test-id-2"]
+    pager = metadata_repository.list(layer="raw", cursor=pager.next_cursor)
+    assert [metadata.id for metadata in pager] == ["test-id-0"]
+
+    pager = metadata_repository.list(
+        created_between=(datetime(2023, 1, 2), datetime(2023, 1, 4))
+    )
+    assert [metadata.id for metadata in pager] == ["test-id-2", "test-id-1"]
+
+    # Saved by another instance after the first listing.
+    metadata = compose_metadata("test-id-5")
+    metadata.created_at = datetime(2023, 1, 10)
+    LocalMetadataRepository(tmp_path).save(metadata)
+    assert next(metadata_repository.list(project_name="test-project")) == metadata
+
+
+def test_save_with_unwritable_index(tmp_path, monkeypatch):
+    def append_index_file(entries):
+        raise PermissionError("read-only")
+
+    metadata_repository = LocalMetadataRepository(tmp_path)
+    monkeypatch.setattr(metadata_repository, "_append_index_file", append_index_file)
+    metadata_repository.save(compose_metadata("test-id-1"))
+
+    assert metadata_repository.load("test-id-1") == compose_metadata("test-id-1")
+    assert LocalMetadataRepository(tmp_path).load("test-id-1") == compose_metadata(
+        "test-id-1"
+    )
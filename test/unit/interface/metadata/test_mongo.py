@@ -0,0 +1,92 @@
+from datetime import datetime
+
+import pytest
+
+from dcraft.domain.metadata import Metadata
+from dcraft.domain.type.enum import ContentType
+
+mongo = pytest.importorskip("dcraft.interface.metadata.mongo")
+
+
+class FakeCollection:
+    def __init__(self):
+        self.documents = []
+        self.indexes = {"_id_": {}, "project_name_layer_created_at": {}}
+        self.create_indexes_count = 0
+
+    def create_indexes(self, indexes):
+        self.create_indexes_count += 1
+        for index in indexes:
+            self.indexes[index.document["name"]] = {}
+
+    def index_information(self):
+        return dict(self.indexes)
+
+    def drop_index(self, name):
+        del self.indexes[name]
+
+    def find_one(self, filter, projection=None):
+        for document in self.documents:
+            if document["id"] == filter["id"]:
+                return dict(document)
+        return None
+
+    def insert_one(self, document):
+        self.documents.append(document)
+
+
+class FakeMongoClient:
+    def __init__(self, **kwargs):
+        self.collection = FakeCollection()
+
+    def __getitem__(self, name):
+        return {"test-collection": self.collection}
+
+
+def compose_metadata(id):
+    return Metadata(
+        id=id,
+        project_name="test-project",
+        layer="raw",
+        content_type=ContentType.DICT,
+        author=None,
+        created_at=datetime(2023, 1, 1),
+        description=None,
+        extra_info=None,
+        source_ids=None,
+        format="json",
+    )
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    monkeypatch.setattr(mongo, "MongoClient", FakeMongoClient)
+
+
+def test_indexes_are_ensured_by_first_save_only(fake_client):
+    metadata_repository = mongo.MongoMetadataRepository("test-db", "test-collection")
+    collection = metadata_repository._metadata_collection
+
+    with pytest.raises(mongo.NoMetadataFound):
+        metadata_repository.load("test-id-0")
+    assert collection.create_indexes_count == 0
+
+    metadata_repository.save(compose_metadata("test-id-0"))
+    metadata_repository.save(compose_metadata("test-id-1"))
+    assert collection.create_indexes_count == 1
+    assert "id_unique" in collection.indexes
+    assert "project_name_layer_created_at" not in collection.indexes
+    assert metadata_repository.load("test-id-1") == compose_metadata("test-id-1")
+
+
+def test_indexes_are_not_created_without_flag(fake_client):
+    metadata_repository = mongo.MongoMetadataRepository(
+        "test-db", "test-collection", create_indexes=False
+    )
+    collection = metadata_repository._metadata_collection
+
+    metadata_repository.save(compose_metadata("test-id-0"))
+    assert collection.create_indexes_count == 0
+
+    metadata_repository.ensure_indexes()
+    assert collection.create_indexes_count == 1
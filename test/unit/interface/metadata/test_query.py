@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from dcraft.domain.metadata import Metadata
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.metadata.query import (
+    MetadataPager,
+    MetadataQuery,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def compose_metadata(i):
+    return Metadata(
+        id=f"test-id-{i}",
+        project_name="test-project",
+        layer="raw",
+        content_type=ContentType.DICT,
+        author=None,
+        created_at=datetime(2023, 1, 1) + timedelta(hours=i),
+        description=None,
+        extra_info=None,
+        source_ids=None,
+        format="json",
+    )
+
+
+class PageLoader:
+    def __init__(self, n):
+        self.metadata_list = [compose_metadata(i) for i in reversed(range(n))]
+        self.sizes = []
+
+    def __call__(self, size, after):
+        self.sizes.append(size)
+        return [
+            metadata
+            for metadata in self.metadata_list
+            if after is None or (metadata.created_at, metadata.id) < after
+        ][:size]
+
+
+def test_cursor():
+    metadata = compose_metadata(1)
+    position = (metadata.created_at, metadata.id)
+    assert decode_cursor(encode_cursor(position)) == position
+    with pytest.raises(ValueError):
+        decode_cursor("invalid")
+
+
+def test_iterate_pages():
+    load_page = PageLoader(5)
+    pager = MetadataPager(load_page, page_size=2)
+
+    assert [metadata.id for metadata in pager] == [
+        f"test-id-{i}" for i in reversed(range(5))
+    ]
+    assert load_page.sizes == [2, 2, 2]
+    assert pager.next_cursor is None
+
+
+def test_limit_and_cursor():
+    load_page = PageLoader(5)
+    pager = MetadataPager(load_page, limit=2)
+
+    assert [metadata.id for metadata in pager] == ["test-id-4", "test-id-3"]
+    assert load_page.sizes == [3]
+    assert pager.next_cursor is not None
+
+    pager = MetadataPager(load_page, limit=3, cursor=pager.next_cursor)
+    assert [metadata.id for metadata in pager] == [
+        "test-id-2",
+        "test-id-1",
+        "test-id-0",
+    ]
+    assert pager.next_cursor is None
+
+
+def test_query_matches():
+    query = MetadataQuery(
+        project_name="test-project",
+        created_between=(datetime(2023, 1, 1), datetime(2023, 1, 2)),
+    )
+    assert query.matches("test-project", "raw", None, datetime(2023, 1, 1))
+    assert not query.matches("test-project", "raw", None, datetime(2023, 1, 2))
+    assert not query.matches("other-project", "raw", None, datetime(2023, 1, 1))
@@ -0,0 +1,207 @@
+import os
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from dcraft.domain.error import NoMetadataFound
+from dcraft.domain.metadata import Metadata
+from dcraft.domain.type.enum import ContentType
+from dcraft.interface.metadata.sqlite import SqliteMetadataRepository
+
+
+def compose_metadata(id, source_ids=None):
+    return Metadata(
+        id=id,
+        project_name="test-project",
+        layer="raw",
+        content_type=ContentType.DICT,
+        author="test-author",
+        created_at=datetime(2023, 1, 1),
+        description="test-description",
+        extra_info={"a": 1},
+        source_ids=source_ids,
+        format="json",
+    )
+
+
+def test_init(tmp_path):
+    path = os.path.join(tmp_path, "metadata.db")
+    SqliteMetadataRepository(path)
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {
+        row[1] for row in connection.execute("PRAGMA index_list(metadata)").fetchall()
+    }
+    assert "metadata_created_at" in indexes
+    assert "metadata_project_layer_created_at_id" in indexes
+    assert "metadata_project_layer_created_at" not in indexes
+
+
+def test_init_drops_obsolete_index(tmp_path):
+    path = os.path.join(tmp_path, "metadata.db")
+    SqliteMetadataRepository(path)
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE INDEX metadata_project_layer_created_at"
+            " ON metadata (project_name, layer, created_at)"
+        )
+
+    SqliteMetadataRepository(path)
+
+    connection = sqlite3.connect(path)
+    indexes = {
+        row[1] for row in connection.execute("PRAGMA index_list(metadata)").fetchall()
+    }
+    assert "metadata_project_layer_created_at" not in indexes
+
+
+def test_save_and_load(tmp_path):
+    metadata_repository = SqliteMetadataRepository(
+        os.path.join(tmp_path, "metadata.db")
+    )
+    metadata_repository.save(compose_metadata("test-id-1"))
+    metadata_repository.save(compose_metadata("test-id-2", source_ids=["test-id-1"]))
+
+    assert metadata_repository.load("test-id-1") == compose_metadata("test-id-1")
+    assert metadata_repository.load("test-id-2") == compose_metadata(
+        "test-id-2", source_ids=["test-id-1"]
+    )
+
+
+def test_load_not_found(tmp_path):
+    metadata_repository = SqliteMetadataRepository(
+        os.path.join(tmp_path, "metadata.db")
+    )
+    with pytest.raises(NoMetadataFound):
+        metadata_repository.load("test-id-1")
+
+
+def test_load_many(tmp_path):
+    metadata_repository = SqliteMetadataRepository(
+        os.path.join(tmp_path, "metadata.db")
+    )
+    for i in range(3):
+        metadata_repository.save(compose_metadata(f"test-id-{i}"))
+
+    metadata_dict = metadata_repository.load_many(
+        ["test-id-2", "test-id-0", "test-id-9"]
+    )
+    assert metadata_dict == {
+        "test-id-0": compose_metadata("test-id-0"),
+        "test-id-2": compose_metadata("test-id-2"),
+    }
+
+
+def test_save_many(tmp_path):
+    metadata_repository = SqliteMetadataRepository(
+        os.path.join(tmp_path, "metadata.db")
+    )
+    metadata_list = [compose_metadata(f"test-id-{i}") for i in range(3)]
+    metadata_repository.save_many(metadata_list)
+
+    assert metadata_repository.load_many([m.id for m in metadata_list]) == {
+        metadata.id: metadata for metadata in metadata_list
+    }
+
+
+def save_diamond(metadata_repository):
+    # test-id-0 <- test-id-1, test-id-2 <- test-id-3 <- test-id-4
+    metadata_repository.save_many(
+        [
+            compose_metadata("test-id-0"),
+            compose_metadata("test-id-1", source_ids=["test-id-0"]),
+            compose_metadata("test-id-2", source_ids=["test-id-0"]),
+            compose_metadata("test-id-3", source_ids=["test-id-1", "test-id-2"]),
+            compose_metadata("test-id-4", source_ids=["test-id-3"]),
+        ]
+    )
+
+
+def test_get_ancestors(tmp_path):
+    metadata_repository = SqliteMetadataRepository(
+        os.path.join(tmp_path, "metadata.db")
+    )
+    save_diamond(metadata_repository)
+
+    assert set(metadata_repository.get_ancestors("test-id-4")) == {
+        "test-id-0",
+        "test-id-1",
+        "test-id-2",
+        "test-id-3",
+    }
+    assert set(metadata_repository.get_ancestors("test-id-4", depth=2)) == {
+        "test-id-1",
+        "test-id-2",
+        "test-id-3",
+    }
+    assert metadata_repository.get_ancestors("test-id-0") == {}
+
+
+def test_get_descendants(tmp_path):
+    metadata_repository = SqliteMetadataRepository(
+        os.path.join(tmp_path, "metadata.db")
+    )
+    save_diamond(metadata_repository)
+
+    descendants = metadata_repository.get_descendants("test-id-0")
+    assert set(descendants) == {"test-id-1", "test-id-2", "test-id-3", "test-id-4"}
+    assert descendants["test-id-3"] == compose_metadata(
+        "test-id-3", source_ids=["test-id-1", "test-id-2"]
+    )
+    assert set(metadata_repository.get_descendants("test-id-0", depth=1)) == {
+        "test-id-1",
+        "test-id-2",
+    }
+
+
+def test_get_descendants_saved_before_lineage_table(tmp_path):
+    path = os.path.join(tmp_path, "metadata.db")
+    metadata_repository = SqliteMetadataRepository(path)
+    save_diamond(metadata_repository)
+    metadata_repository.close()
+    connection = sqlite3.connect(path)
+    connection.execute("DROP TABLE metadata_lineage")
+    connection.commit()
+    connection.close()
+
+    metadata_repository = SqliteMetadataRepository(path)
+    assert set(metadata_repository.get_descendants("test-id-2")) == {
+        "test-id-3",
+        "test-id-4",
+    }
+
+
+def test_list(tmp_path):
+    metadata_repository = SqliteMetadataRepository(
+        os.path.join(tmp_path, "metadata.db")
+    )
+    metadata_list = [compose_metadata(f"test-id-{i}") for i in range(5)]
+    for i, metadata in enumerate(metadata_list):
+        metadata.created_at = datetime(2023, 1, 1 + i // 2)
+        metadata.layer = "raw" if i % 2 == 0 else "trusted"
+    metadata_repository.save_many(metadata_list)
+
+    pager = metadata_repository.list(project_name="test-project", limit=2)
+    assert [metadata.id for metadata in pager] == ["test-id-4", "test-id-3"]
+    pager = metadata_repository.list(
+        project_name="test-project", cursor=pager.next_cursor
+    )
+    assert [metadata.id for metadata in pager] == [
+        "test-id-2",
+        "test-id-1",
+        "test-id-0",
+    ]
+    assert pager.next_cursor is None
+
+    assert [metadata.id for metadata in metadata_repository.list(layer="trusted")] == [
+        "test-id-3",
+        "test-id-1",
+    ]
+    pager = metadata_repository.list(
+        created_between=(datetime(2023, 1, 2), datetime(2023, 1, 3)),
+        author="test-author",
+    )
+    assert list(pager) == [metadata_list[3], metadata_list[2]]
+    assert list(metadata_repository.list(project_name="other-project")) == []